@@ -0,0 +1,125 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.permissions import AllowAny
+from movie_app.models import AuthToken
+
+
+# Peta token key -> (user, token) di memori proses, LRU dengan batas jumlah entri dan TTL.
+# Perubahan di proses ini (logout, ganti password, user dinonaktifkan, profil berubah)
+# langsung menghapus entri terkait lewat api/signals.py; perubahan dari proses lain baru
+# terlihat setelah ttl detik.
+class TokenCache:
+    def __init__(self, ttl = 60, max_entries = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[2] <= now:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[0], entry[1]
+
+    def set(self, key, user, token):
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        expires = time.monotonic() + self.ttl
+        with self.lock:
+            self.entries[key] = (user, token, expires)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last = False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def delete_user(self, user_id):
+        with self.lock:
+            for key in [key for key, entry in self.entries.items() if entry[0].pk == user_id]:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+token_cache = TokenCache(
+    ttl = getattr(settings, 'API_TOKEN_CACHE_TTL', 60),
+    max_entries = getattr(settings, 'API_TOKEN_CACHE_MAX_ENTRIES', 10000),
+)
+
+
+# TokenAuthentication tanpa query per request: token, user dan profil diambil sekali
+# (select_related) lalu disimpan di token_cache. Setiap request mendapat salinan user,
+# jadi perubahan atribut di satu request tidak bocor ke request lain. Masa berlaku
+# token (AuthToken.expires_at) dicek di setiap request, termasuk saat dari cache.
+class CachedTokenAuthentication(TokenAuthentication):
+    model = AuthToken
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related('user', 'user__user_profile').get(key = key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+            if not token.user.is_active:
+                raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+            token_cache.set(key, token.user, token)
+            cached = token.user, token
+        user, token = cached
+        if token.is_expired:
+            token_cache.delete(key)
+            raise exceptions.AuthenticationFailed(_('Token has expired.'))
+        return copy.copy(user), token
+
+
+# Profil autentikasi per view dan method HTTP. Default REST_FRAMEWORK hanya token;
+# Basic auth (hash PBKDF2 di setiap request) tidak dipakai lagi.
+# - public: tanpa autentikator dan tanpa cek permission (GET katalog)
+# - token: CachedTokenAuthentication, permission dari DEFAULT_PERMISSION_CLASSES
+AUTH_PROFILES = {
+    'public': (),
+    'token': (CachedTokenAuthentication, ),
+}
+
+PUBLIC_READ = {'GET': 'public', 'HEAD': 'public', 'OPTIONS': 'public'}
+
+
+# auth_profiles: method -> nama profil, method lain memakai default_auth_profile.
+# Profil None berarti authentication_classes/permission_classes view seperti biasa.
+class AuthProfileMixin:
+    auth_profiles = PUBLIC_READ
+    default_auth_profile = 'token'
+
+    def initialize_request(self, request, *args, **kwargs):
+        self.auth_profile = self.auth_profiles.get(request.method, self.default_auth_profile)
+        return super().initialize_request(request, *args, **kwargs)
+
+    def get_authenticators(self):
+        if self.auth_profile is None:
+            return super().get_authenticators()
+        return [auth() for auth in AUTH_PROFILES[self.auth_profile]]
+
+    def get_permissions(self):
+        if self.auth_profile == 'public':
+            return [AllowAny()]
+        return super().get_permissions()
@@ -0,0 +1,147 @@
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+from movie_app.models import Film
+from movie_app.names import name_resolver
+from movie_app.utils import chunked
+from api.serializers import FilmRelationField
+
+
+BATCH_SIZE = 500
+
+
+# Validasi satu item film untuk bulk write. Relasi M2M dikirim sebagai daftar id dan/atau
+# nama; id dicek sekaligus untuk semua item (bukan satu query per id) dan nama yang belum
+# ada dibuat sekaligus saat menulis.
+class FilmBulkItemSerializer(serializers.ModelSerializer):
+    sutradara = FilmRelationField('nama_sutradara')
+    aktor = FilmRelationField('nama_aktor')
+    genre = FilmRelationField('genre')
+    negara = FilmRelationField('negara')
+    bahasa = FilmRelationField('bahasa')
+
+    class Meta:
+        model = Film
+        fields = ('judul', 'status', 'tahun', 'deskripsi', 'durasi', 'sutradara', 'aktor', 'genre', 'negara', 'bahasa')
+
+
+class BulkWriteResult:
+    def __init__(self):
+        self.ids = []
+        self.created_ids = []
+        self.updated_ids = []
+        self.errors = []
+
+
+def existing_ids(model, ids):
+    found = set()
+    for chunk in chunked(list(ids)):
+        found.update(model.objects.filter(pk__in = chunk).values_list('pk', flat = True))
+    return found
+
+
+def fetch_objects(model, ids):
+    objects = {}
+    for chunk in chunked(list(ids)):
+        objects.update(model.objects.in_bulk(chunk))
+    return objects
+
+
+# Item tanpa "id" dibuat (bulk_create), item dengan "id" diperbarui (bulk_update).
+# Semua item divalidasi dulu; bila ada yang salah tidak ada yang ditulis dan error
+# dilaporkan per index item.
+def bulk_write(model, serializer_class, items, relation_fields = ()):
+    result = BulkWriteResult()
+    validated = []
+
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            result.errors.append({'index': index, 'errors': {'non_field_errors': ['Expected an object.']}})
+            continue
+        item_id = item.get('id')
+        if item_id is not None and (isinstance(item_id, bool) or not isinstance(item_id, int)):
+            result.errors.append({'index': index, 'errors': {'id': ['A valid integer is required.']}})
+            continue
+        serializer = serializer_class(data = item, partial = item_id is not None)
+        if not serializer.is_valid():
+            result.errors.append({'index': index, 'errors': serializer.errors})
+            continue
+        validated.append((index, item_id, dict(serializer.validated_data)))
+
+    # Id relasi yang tidak ada, dicek per relasi dengan satu query per chunk
+    for field in relation_fields:
+        related_model = model._meta.get_field(field).related_model
+        wanted = {pk for _, _, data in validated for pk in data.get(field, []) if isinstance(pk, int)}
+        missing = wanted - existing_ids(related_model, wanted)
+        for index, _, data in validated:
+            unknown = sorted(set(data.get(field, [])) & missing)
+            if unknown:
+                result.errors.append({'index': index, 'errors': {field: ['Invalid pk(s): %s' % unknown]}})
+
+    objects = fetch_objects(model, {item_id for _, item_id, _ in validated if item_id is not None})
+    for index, item_id, _ in validated:
+        if item_id is not None and item_id not in objects:
+            result.errors.append({'index': index, 'errors': {'id': ['Object %s does not exist.' % item_id]}})
+
+    if result.errors:
+        result.errors.sort(key = lambda error: error['index'])
+        return result
+
+    creates, updates, relations = [], [], []
+    update_fields = set()
+    for index, item_id, data in validated:
+        links = {field: data.pop(field) for field in relation_fields if field in data}
+        if item_id is None:
+            instance = model(**data)
+            creates.append(instance)
+        else:
+            instance = objects[item_id]
+            for name, value in data.items():
+                setattr(instance, name, value)
+            update_fields.update(data)
+            updates.append(instance)
+        relations.append((instance, item_id is not None, links))
+
+    with transaction.atomic():
+        model.objects.bulk_create(creates, batch_size = BATCH_SIZE)
+        if updates:
+            # bulk_update tidak menjalankan auto_now, jadi last_modified diisi manual
+            if any(field.name == 'last_modified' for field in model._meta.concrete_fields):
+                now = timezone.now()
+                for instance in updates:
+                    instance.last_modified = now
+                update_fields.add('last_modified')
+            if update_fields:
+                model.objects.bulk_update(updates, sorted(update_fields), batch_size = BATCH_SIZE)
+        for field in relation_fields:
+            resolve_relation(model, field, relations)
+            write_relation(model, field, relations)
+
+    result.ids = [instance.pk for instance, _, _ in relations]
+    result.created_ids = [instance.pk for instance in creates]
+    result.updated_ids = [instance.pk for instance in updates]
+    return result
+
+
+def resolve_relation(model, field, relations):
+    related_model = model._meta.get_field(field).related_model
+    linked = [links for _, _, links in relations if field in links]
+    resolved = name_resolver.resolve_values(related_model, [links[field] for links in linked])
+    for links, ids in zip(linked, resolved):
+        links[field] = ids
+
+
+# Isi through table M2M dengan bulk_create; relasi lama pada item update diganti
+def write_relation(model, field, relations):
+    through = getattr(model, field).through
+    source = model._meta.model_name + '_id'
+    target = field + '_id'
+    replaced = [instance.pk for instance, is_update, links in relations if is_update and field in links]
+    for chunk in chunked(replaced):
+        through.objects.filter(**{source + '__in': chunk}).delete()
+    rows = [
+        through(**{source: instance.pk, target: pk})
+        for instance, _, links in relations
+        for pk in dict.fromkeys(links.get(field, []))
+    ]
+    through.objects.bulk_create(rows, batch_size = BATCH_SIZE)
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.cache import caches
+
+
+# Cache payload hasil serialisasi untuk detail endpoint, key: model + id.
+# Backend diatur lewat CACHES[API_CACHE_ALIAS] di movie/settings.py,
+# invalidasi dilakukan oleh signal di api/signals.py.
+def get_cache():
+    return caches[getattr(settings, 'API_CACHE_ALIAS', 'default')]
+
+
+def detail_key(model, id):
+    return 'detail:%s:%s' % (model._meta.model_name, id)
+
+
+# version: last_modified baris (untuk model yang memilikinya). Cache ini per proses, jadi
+# perubahan dari worker lain atau management command tidak menghapusnya; entri yang
+# versinya tidak sama dengan last_modified di database dianggap tidak ada.
+def get_cached_detail(model, id, version = None):
+    entry = get_cache().get(detail_key(model, id))
+    if entry is None or entry[0] != version_key(version):
+        return None
+    return entry[1]
+
+
+def set_cached_detail(model, id, data, version = None):
+    get_cache().set(detail_key(model, id), (version_key(version), dict(data)))
+
+
+def version_key(version):
+    return version.isoformat() if version is not None else None
+
+
+def invalidate_details(model, ids):
+    keys = [detail_key(model, id) for id in ids]
+    if keys:
+        get_cache().delete_many(keys)
@@ -0,0 +1,58 @@
+import functools
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+# Conditional GET (ETag / Last-Modified -> 304 Not Modified).
+# Validator dihitung dari last_modified dengan satu query ringan, tanpa serialisasi.
+def make_etag(*parts):
+    return '"%s"' % hashlib.md5(':'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+# URL lengkap dan Accept ikut dihitung: ?fields=/?expand= dan format mengubah isi respons
+def detail_validators(model):
+    def validators(request, id, *args, **kwargs):
+        last_modified = model.objects.filter(pk = id).values_list('last_modified', flat = True).first()
+        if last_modified is None:
+            return None
+        etag = make_etag(model._meta.model_name, id, last_modified.isoformat(), request.get_full_path(), request.META.get('HTTP_ACCEPT', ''))
+        return etag, last_modified
+    return validators
+
+
+# Digest list: jumlah baris + last_modified terbaru dari queryset yang sudah difilter.
+# URL lengkap dan Accept ikut dihitung karena halaman/filter/format mengubah isi respons.
+# Hanya ETag: max(last_modified) tidak berubah saat baris dihapus atau keluar dari relasi,
+# jadi Last-Modified/If-Modified-Since bisa memberi 304 untuk list yang sudah basi.
+def list_validators(request, queryset):
+    stats = queryset.order_by().aggregate(total = Count('pk'), latest = Max('last_modified'))
+    latest = stats['latest'].isoformat() if stats['latest'] else ''
+    etag = make_etag(request.get_full_path(), request.META.get('HTTP_ACCEPT', ''), stats['total'], latest)
+    return etag, None
+
+
+def conditional_get(get_validators):
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            validators = get_validators(request, *args, **kwargs)
+            # last_modified yang sama dipakai view sebagai versi cache detail (api/cache.py)
+            self.last_modified = validators[1] if validators else None
+            if validators is None:
+                return method(self, request, *args, **kwargs)
+            etag, last_modified = validators
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+            not_modified = get_conditional_response(request, etag = etag, last_modified = timestamp)
+            if not_modified is not None:
+                return not_modified
+            response = method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                response.headers['ETag'] = etag
+                if timestamp is not None:
+                    response.headers['Last-Modified'] = http_date(timestamp)
+            return response
+        return wrapper
+    return decorator
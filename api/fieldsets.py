@@ -0,0 +1,82 @@
+from rest_framework import exceptions
+
+
+# Sparse fieldset: ?fields=id,judul,tahun atau ?exclude=deskripsi (dipisah koma),
+# ?view=compact|full untuk bentuk dasar.
+# Kolom yang tidak diminta tidak di-SELECT (only()) dan relasi M2M yang tidak diminta
+# tidak di-prefetch.
+
+
+# Field serializer yang bukan kolom dengan nama sama -> kolom yang dibutuhkan
+FIELD_COLUMNS = {
+    'average_rating': ('rating_count', 'rating_sum'),
+    'thumbnails': ('thumbnail',),
+}
+
+VIEWS = ('compact', 'full')
+
+# Selalu di-SELECT: pk dan field urutan keyset pagination (api/pagination.py)
+REQUIRED_COLUMNS = ('id', 'created_on', 'last_modified')
+
+
+def parse_names(params, name):
+    return [value.strip() for value in params.get(name, '').split(',') if value.strip()]
+
+
+# Daftar field yang diminta (urut sesuai serializer) atau None bila semua field.
+# default: fieldset bila fields= tidak diisi (bentuk ringkas list); ?view=full memakai
+# semua field sebagai dasar. exclude= dikurangkan dari dasar itu. Relasi di expand selalu ikut.
+def get_fieldset(request, serializer_class, expand = (), default = None):
+    fields = parse_names(request.query_params, 'fields')
+    exclude = parse_names(request.query_params, 'exclude')
+    view = request.query_params.get('view', 'full' if default is None else 'compact')
+    if view not in VIEWS:
+        raise exceptions.ValidationError({'view': 'view must be one of: %s' % ', '.join(VIEWS)})
+    if not fields and view == 'compact':
+        fields = list(default or ())
+    if not fields and not exclude:
+        return None
+    available = list(serializer_class().fields)
+    unknown = [name for name in fields + exclude if name not in available]
+    if unknown:
+        raise exceptions.ValidationError({'fields': 'Unknown field(s): %s' % ', '.join(unknown)})
+    return [name for name in available if ((not fields or name in fields) and name not in exclude) or name in expand]
+
+
+# ?expand=aktor,genre: relasi yang ditampilkan sebagai {id, name} alih-alih nama saja
+def get_expand(request, relation_fields):
+    expand = parse_names(request.query_params, 'expand')
+    unknown = [name for name in expand if name not in relation_fields]
+    if unknown:
+        raise exceptions.ValidationError({'expand': 'Cannot expand: %s' % ', '.join(unknown)})
+    return expand
+
+
+# Payload detail di-cache dengan semua relasi expanded; relasi yang tidak diminta
+# dikembalikan ke bentuk daftar nama
+def collapse_relations(data, relation_fields, expand):
+    data = dict(data)
+    for name in relation_fields:
+        if name in data and name not in expand:
+            data[name] = [item['name'] for item in data[name]]
+    return data
+
+
+def apply_fieldset(queryset, fieldset, relation_fields = ()):
+    if fieldset is None:
+        return queryset.prefetch_related(*relation_fields)
+    concrete = {field.name for field in queryset.model._meta.concrete_fields}
+    columns = set(REQUIRED_COLUMNS)
+    for name in fieldset:
+        if name in FIELD_COLUMNS:
+            columns.update(FIELD_COLUMNS[name])
+        elif name in concrete:
+            columns.add(name)
+    return queryset.only(*columns).prefetch_related(*[name for name in relation_fields if name in fieldset])
+
+
+# Saring payload yang sudah jadi (mis. dari cache detail)
+def filter_payload(data, fieldset):
+    if fieldset is None:
+        return data
+    return {name: data[name] for name in fieldset if name in data}
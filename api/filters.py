@@ -0,0 +1,67 @@
+from django.db.models import Value
+from django.db.models.functions import Concat, Lower
+from rest_framework import exceptions
+from movie_app.models import Film
+
+
+# Parameter relasi M2M -> nama field di Film (nilai berupa id, boleh dipisah koma: ?genre=1,3)
+FILM_RELATION_FILTERS = ('sutradara', 'aktor', 'genre', 'negara', 'bahasa')
+
+# Batas integer 64-bit database; nilai di luarnya membuat driver melempar OverflowError
+MAX_INTEGER = 2 ** 63 - 1
+
+# Karakter Unicode terbesar: LOWER(judul) di antara p dan p + MAX_CHAR berarti diawali p
+MAX_CHAR = '\U0010ffff'
+
+
+def parse_int(params, name):
+    try:
+        value = int(params[name])
+    except ValueError:
+        raise exceptions.ValidationError({name: 'A valid integer is required.'})
+    if abs(value) > MAX_INTEGER:
+        raise exceptions.ValidationError({name: 'A valid integer is required.'})
+    return value
+
+
+def parse_ids(params, name):
+    try:
+        ids = [int(value) for value in params[name].split(',') if value.strip()]
+    except ValueError:
+        ids = None
+    if ids is None or any(id < 1 or id > MAX_INTEGER for id in ids):
+        raise exceptions.ValidationError({name: 'A comma separated list of ids is required.'})
+    return ids
+
+
+# Filter list film di database, bukan di client
+def filter_films(queryset, params):
+    if 'tahun' in params:
+        queryset = queryset.filter(tahun = parse_int(params, 'tahun'))
+    if 'tahun_min' in params:
+        queryset = queryset.filter(tahun__gte = parse_int(params, 'tahun_min'))
+    if 'tahun_max' in params:
+        queryset = queryset.filter(tahun__lte = parse_int(params, 'tahun_max'))
+    if 'status' in params:
+        queryset = queryset.filter(status = params['status'])
+    if params.get('judul'):
+        queryset = queryset.filter(judul__icontains = params['judul'])
+    if params.get('judul_prefix'):
+        # Range pada LOWER(judul) memakai index film_judul_lower_idx; istartswith (LIKE)
+        # tidak bisa memakai index b-tree biasa
+        prefix = Lower(Value(params['judul_prefix']))
+        queryset = queryset.alias(judul_lower = Lower('judul')).filter(
+            judul_lower__gte = prefix,
+            judul_lower__lt = Concat(prefix, Value(MAX_CHAR)),
+        )
+
+    # film_id IN (SELECT film_id FROM through WHERE relasi_id IN ...): dibaca dari index
+    # (relasi_id, film_id) pada through table, tanpa baris duplikat dan tanpa DISTINCT
+    for name in FILM_RELATION_FILTERS:
+        if name not in params:
+            continue
+        through = getattr(Film, name).through
+        queryset = queryset.filter(pk__in = through.objects.filter(**{
+            name + '_id__in': parse_ids(params, name),
+        }).values('film_id'))
+    return queryset
@@ -0,0 +1,126 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework import exceptions
+
+
+# Keyset (cursor) pagination untuk semua list endpoint.
+# Cursor berisi nilai kolom urutan + id dari baris terakhir/pertama di halaman,
+# sehingga halaman ke-1000 sama murahnya dengan halaman pertama (tanpa OFFSET).
+class KeysetPagination:
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    ordering_query_param = 'order_by'
+
+    def __init__(self, ordering_fields = ('id',)):
+        self.ordering_fields = ordering_fields
+        self.page_size = getattr(settings, 'API_PAGE_SIZE', 50)
+        self.max_page_size = getattr(settings, 'API_MAX_PAGE_SIZE', 500)
+        self.next_cursor = None
+        self.previous_cursor = None
+
+    def paginate_queryset(self, queryset, request):
+        self.page_size = self.get_page_size(request)
+        ordering, position, reverse = self.decode_cursor(request, queryset.model)
+        if ordering is None:
+            ordering = self.get_ordering(request)
+
+        if reverse:
+            ordering = [self.invert(field) for field in ordering]
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.after(ordering, position))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            ordering = [self.invert(field) for field in ordering]
+            results.reverse()
+
+        if results:
+            has_next = position is not None if reverse else has_more
+            has_previous = has_more if reverse else position is not None
+            if has_next:
+                self.next_cursor = self.encode_cursor(ordering, results[-1], False)
+            if has_previous:
+                self.previous_cursor = self.encode_cursor(ordering, results[0], True)
+        return results
+
+    def get_next_cursor(self):
+        return self.next_cursor
+
+    def get_previous_cursor(self):
+        return self.previous_cursor
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size < 1:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request):
+        field = request.query_params.get(self.ordering_query_param, 'id')
+        if field.lstrip('-') not in self.ordering_fields:
+            raise exceptions.ValidationError({
+                self.ordering_query_param: 'Ordering must be one of: ' + ', '.join(self.ordering_fields)
+            })
+        # id selalu jadi pemutus seri agar urutan stabil dan unik
+        if field.lstrip('-') == 'id':
+            return [field]
+        return [field, '-id' if field.startswith('-') else 'id']
+
+    def invert(self, field):
+        return field[1:] if field.startswith('-') else '-' + field
+
+    # WHERE (a > x) OR (a = x AND id > y) sesuai arah urutan tiap kolom
+    def after(self, ordering, position):
+        query = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = name + ('__lt' if field.startswith('-') else '__gt')
+            query |= Q(**equal, **{lookup: value})
+            equal[name] = value
+        return query
+
+    def encode_cursor(self, ordering, instance, reverse):
+        position = []
+        for field in ordering:
+            value = getattr(instance, field.lstrip('-'))
+            position.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        payload = json.dumps({'o': ordering, 'p': position, 'r': reverse})
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    # Urutan ikut disimpan di cursor, jadi client cukup mengirim ?cursor=...
+    # Nilai posisi dikonversi dan divalidasi dengan field model, jadi cursor yang diubah
+    # client menghasilkan 404, bukan error di query.
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            ordering, position = payload['o'], payload['p']
+            if len(ordering) != len(position) or ordering[-1].lstrip('-') != 'id':
+                raise ValueError
+            if any(field.lstrip('-') not in self.ordering_fields for field in ordering):
+                raise ValueError
+            position = [self.to_python(model, field, value) for field, value in zip(ordering, position)]
+            return ordering, position, bool(payload['r'])
+        except (TypeError, ValueError, KeyError, IndexError, AttributeError, UnicodeError, ValidationError, FieldDoesNotExist, OverflowError):
+            raise exceptions.NotFound('Invalid cursor.')
+
+    def to_python(self, model, field, value):
+        if value is None:
+            raise ValueError(field)
+        model_field = model._meta.get_field(field.lstrip('-'))
+        value = model_field.to_python(value)
+        model_field.run_validators(value)
+        return value
@@ -3,7 +3,10 @@ from movie_app.models import User, Profile, Aktor, Sutradara, Genre, Negara, Bah
 from django.contrib.auth import authenticate
 from rest_framework.validators import UniqueValidator
 from django.contrib.auth.password_validation import validate_password
-from django.db.models import Avg
+from django.db import transaction
+from movie_app.names import name_resolver
+from movie_app.images import THUMBNAIL_SIZES, DERIVATIVE_FORMATS, derivative_name, validate_image
+from django.core.exceptions import ValidationError as DjangoValidationError
 
 
 class LoginSerializer(serializers.Serializer):
@@ -68,8 +71,9 @@ class RegisterAuthorsSerializer(serializers.ModelSerializer):
             })
         return attrs
 
+    # Satu transaksi, satu INSERT per tabel: password di-hash sebelum user disimpan
     def create(self, validated_data):
-        user = User.objects.create(
+        user = User(
             username=validated_data['username'],
             email=validated_data['email'],
             is_active=validated_data['is_active'],
@@ -79,9 +83,9 @@ class RegisterAuthorsSerializer(serializers.ModelSerializer):
             last_name=validated_data['last_name']
         )
         user.set_password(validated_data['password1'])
-        user.save()
-        profile = Profile.objects.create(user=user, user_create=user)
-        profile.save()
+        with transaction.atomic():
+            user.save()
+            Profile.objects.create(user=user, user_create=user)
         return user
 
 class AktorSerializer(serializers.ModelSerializer):
@@ -109,50 +113,145 @@ class BahasaSerializer(serializers.ModelSerializer):
         model = Bahasa
         fields = ('id', 'bahasa')
 
-# Nested Serializers untuk FilmSerializer
-class FilmSerializer(serializers.ModelSerializer):
-    sutradara = serializers.SerializerMethodField()
-    aktor = serializers.SerializerMethodField()
-    genre = serializers.SerializerMethodField()
-    negara = serializers.SerializerMethodField()
-    bahasa = serializers.SerializerMethodField()
+# Relasi M2M film: dibaca sebagai daftar nama (atau {id, name} bila expanded),
+# ditulis sebagai daftar id dan/atau nama.
+# String berisi angka dianggap id (untuk form-data), selain itu dianggap nama.
+class FilmRelationField(serializers.Field):
+    default_error_messages = {
+        'invalid': 'Expected a list of ids or names.',
+    }
 
-    average_rating = serializers.SerializerMethodField()
+    def __init__(self, name_field, **kwargs):
+        self.name_field = name_field
+        self.expanded = False
+        kwargs.setdefault('required', False)
+        super().__init__(**kwargs)
 
-    class Meta:
-        model = Film
-        fields = '__all__'
+    # Pakai .all() agar hasil prefetch_related dipakai, bukan query baru per film
+    def to_representation(self, value):
+        if self.expanded:
+            return [{'id': item.pk, 'name': getattr(item, self.name_field)} for item in value.all()]
+        return [getattr(item, self.name_field) for item in value.all()]
+
+    def to_internal_value(self, data):
+        if isinstance(data, (str, int)):
+            data = [data]
+        if not isinstance(data, list):
+            self.fail('invalid')
+        values = []
+        for item in data:
+            if isinstance(item, str) and item.strip():
+                item = item.strip()
+                values.append(int(item) if item.isdigit() else item)
+            elif isinstance(item, int) and not isinstance(item, bool):
+                values.append(item)
+            else:
+                self.fail('invalid')
+        return values
+
+
+# Pengganti ImageField DRF: ukuran dan header dicek dulu (movie_app.images.validate_image).
+# ImageField bawaan menyalin upload ke BytesIO lalu menjalankan verify() pada seluruh file.
+class CheckedImageField(serializers.ImageField):
+    def to_internal_value(self, data):
+        file = serializers.FileField.to_internal_value(self, data)
+        try:
+            validate_image(file)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.messages)
+        return file
+
+
+# URL turunan thumbnail per ukuran: {'small': {'jpg': ..., 'webp': ...}, ...}.
+# Nama file turunan deterministik, jadi tidak ada akses ke storage per film.
+class ThumbnailsField(serializers.ReadOnlyField):
+    def to_representation(self, value):
+        if not value:
+            return None
+        request = self.context.get('request')
+        urls = {}
+        for size, _ in THUMBNAIL_SIZES:
+            urls[size] = {}
+            for extension, _ in DERIVATIVE_FORMATS:
+                url = value.storage.url(derivative_name(value.name, size, extension))
+                urls[size][extension] = request.build_absolute_uri(url) if request else url
+        return urls
+
+
+FILM_RELATION_FIELDS = ('sutradara', 'aktor', 'genre', 'negara', 'bahasa')
 
-    def get_sutradara(self, obj):
-        sutradara_names = obj.sutradara.all().values_list('nama_sutradara', flat=True)
-        return list(sutradara_names)
+# Bentuk ringkas default untuk list film (tanpa deskripsi dan relasi M2M);
+# ?view=full mengembalikan semua field
+FILM_LIST_FIELDS = ('id', 'judul', 'tahun', 'status', 'thumbnail', 'thumbnails', 'average_rating')
 
-    def get_aktor(self, obj):
-        aktor_names = obj.aktor.all().values_list('nama_aktor', flat=True)
-        return list(aktor_names)
 
-    def get_genre(self, obj):
-        genre_names = obj.genre.all().values_list('genre', flat=True)
-        return list(genre_names)
+# Id relasi harus sudah ada; dicek dengan satu query per relasi
+def validate_relation_ids(model, attrs):
+    errors = {}
+    for field in FILM_RELATION_FIELDS:
+        ids = {value for value in attrs.get(field, []) if isinstance(value, int)}
+        if not ids:
+            continue
+        related_model = model._meta.get_field(field).related_model
+        missing = ids - set(related_model.objects.filter(pk__in = ids).values_list('pk', flat = True))
+        if missing:
+            errors[field] = 'Invalid pk(s): %s' % sorted(missing)
+    if errors:
+        raise serializers.ValidationError(errors)
+    return attrs
 
-    def get_negara(self, obj):
-        negara_names = obj.negara.all().values_list('negara', flat=True)
-        return list(negara_names)
 
-    def get_bahasa(self, obj):
-        bahasa_names = obj.bahasa.all().values_list('bahasa', flat=True)
-        return list(bahasa_names)
+# Nama yang belum ada dibuat sekaligus, lalu diganti id-nya sebelum film disimpan
+def resolve_relation_names(model, validated_data):
+    for field in FILM_RELATION_FIELDS:
+        if field in validated_data:
+            related_model = model._meta.get_field(field).related_model
+            validated_data[field] = name_resolver.resolve_values(related_model, [validated_data[field]])[0]
+    return validated_data
 
 
+# Serializer yang hanya membawa field tertentu: FilmSerializer(films, many = True, fields = [...]).
+# Field yang tidak diminta dibuang sebelum serialisasi, jadi tidak dihitung sama sekali.
+class SparseFieldsMixin:
+    def __init__(self, *args, fields = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
 
-    # Perlu memanggil --> from django.db.models import Avg
-    def get_average_rating(self, obj):
-        ratings = Rating.objects.filter(film=obj)
-        if ratings.exists():
-            average = ratings.aggregate(Avg('rating'))['rating__avg']
-            return round(average, 1)
-        return None
+class FilmSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    sutradara = FilmRelationField('nama_sutradara')
+    aktor = FilmRelationField('nama_aktor')
+    genre = FilmRelationField('genre')
+    negara = FilmRelationField('negara')
+    bahasa = FilmRelationField('bahasa')
+
+    thumbnail = CheckedImageField(required = False, allow_null = True)
+    average_rating = serializers.ReadOnlyField()
+    thumbnails = ThumbnailsField(source = 'thumbnail')
+
+    class Meta:
+        model = Film
+        exclude = ('rating_sum',)
+
+    # expand: relasi yang ditampilkan sebagai {id, name}, dari prefetch yang sama
+    def __init__(self, *args, expand = (), **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in expand:
+            if name in self.fields:
+                self.fields[name].expanded = True
+
+    def validate(self, attrs):
+        return validate_relation_ids(Film, attrs)
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            return super().create(resolve_relation_names(Film, validated_data))
+
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            return super().update(instance, resolve_relation_names(Film, validated_data))
 
 class RatingSerializer(serializers.ModelSerializer):
     film = serializers.PrimaryKeyRelatedField(queryset=Film.objects.all())
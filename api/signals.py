@@ -0,0 +1,112 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from movie_app.models import User, Profile, AuthToken, Aktor, Sutradara, Genre, Negara, Bahasa, Film, Rating
+from movie_app.signals import FILM_RELATIONS, related_film_ids
+from api.authentication import token_cache
+from api.cache import invalidate_details
+
+
+# INVALIDASI CACHE DETAIL (api/cache.py)
+
+
+@receiver(post_save, sender = Aktor)
+@receiver(post_save, sender = Sutradara)
+@receiver(post_save, sender = Genre)
+@receiver(post_save, sender = Negara)
+@receiver(post_save, sender = Bahasa)
+@receiver(post_save, sender = Film)
+@receiver(post_save, sender = Rating)
+@receiver(post_delete, sender = Aktor)
+@receiver(post_delete, sender = Sutradara)
+@receiver(post_delete, sender = Genre)
+@receiver(post_delete, sender = Negara)
+@receiver(post_delete, sender = Bahasa)
+@receiver(post_delete, sender = Film)
+@receiver(post_delete, sender = Rating)
+def object_changed(sender, instance, **kwargs):
+    invalidate_details(sender, [instance.pk])
+
+
+# Nama relasi berubah -> film yang menampilkan nama itu ikut basi
+@receiver(post_save, sender = Aktor)
+@receiver(post_save, sender = Sutradara)
+@receiver(post_save, sender = Genre)
+@receiver(post_save, sender = Negara)
+@receiver(post_save, sender = Bahasa)
+def relation_saved(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_details(Film, related_film_ids(FILM_RELATIONS[sender], [instance.pk]))
+
+
+@receiver(pre_delete, sender = Aktor)
+@receiver(pre_delete, sender = Sutradara)
+@receiver(pre_delete, sender = Genre)
+@receiver(pre_delete, sender = Negara)
+@receiver(pre_delete, sender = Bahasa)
+def relation_deleting(sender, instance, **kwargs):
+    instance._cache_film_ids = related_film_ids(FILM_RELATIONS[sender], [instance.pk])
+
+
+@receiver(post_delete, sender = Aktor)
+@receiver(post_delete, sender = Sutradara)
+@receiver(post_delete, sender = Genre)
+@receiver(post_delete, sender = Negara)
+@receiver(post_delete, sender = Bahasa)
+def relation_deleted(sender, instance, **kwargs):
+    invalidate_details(Film, getattr(instance, '_cache_film_ids', []))
+
+
+def film_relation_changed(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_details(Film, [instance.pk])
+    elif action == 'pre_clear':
+        instance._cache_film_ids = related_film_ids(FILM_RELATIONS[type(instance)], [instance.pk])
+    elif action == 'post_clear':
+        invalidate_details(Film, getattr(instance, '_cache_film_ids', []))
+    elif action in ('post_add', 'post_remove'):
+        invalidate_details(Film, pk_set)
+
+
+for field in FILM_RELATIONS.values():
+    m2m_changed.connect(film_relation_changed, sender = getattr(Film, field).through)
+
+
+# Rating mengubah agregat film (lewat queryset.update, tanpa signal Film),
+# termasuk film lama bila rating dipindah ke film lain.
+@receiver(pre_save, sender = Rating)
+def rating_saving(sender, instance, **kwargs):
+    if instance.pk:
+        previous = Rating.objects.filter(pk = instance.pk).values_list('film_id', flat = True).first()
+        if previous and previous != instance.film_id:
+            invalidate_details(Film, [previous])
+
+
+@receiver(post_save, sender = Rating)
+@receiver(post_delete, sender = Rating)
+def rating_changed(sender, instance, **kwargs):
+    invalidate_details(Film, [instance.film_id])
+
+
+# INVALIDASI CACHE TOKEN (api/authentication.py)
+
+
+# Ganti password, user dinonaktifkan/dihapus atau profil berubah: semua token user itu
+# harus dimuat ulang. Update last_login saat login tidak mengubah hasil autentikasi.
+@receiver(post_save, sender = User)
+@receiver(post_delete, sender = User)
+def user_changed(sender, instance, update_fields = None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    token_cache.delete_user(instance.pk)
+
+
+@receiver(post_save, sender = Profile)
+@receiver(post_delete, sender = Profile)
+def profile_changed(sender, instance, **kwargs):
+    token_cache.delete_user(instance.user_id)
+
+
+@receiver(post_delete, sender = AuthToken)
+def token_deleted(sender, instance, **kwargs):
+    token_cache.delete(instance.key)
@@ -0,0 +1,49 @@
+import json
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+
+STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+}
+
+
+# Serialisasi baris demi baris dari .iterator(), jadi memori tetap datar berapapun isi tabelnya.
+# prefetch_related tetap jalan per chunk (Django >= 4.1).
+def iter_serialized(queryset, serializer_class, chunk_size):
+    for instance in queryset.iterator(chunk_size = chunk_size):
+        yield json.dumps(serializer_class(instance).data, cls = JSONEncoder, ensure_ascii = False)
+
+
+def iter_ndjson(rows):
+    for row in rows:
+        yield row + '\n'
+
+
+def iter_json_array(rows):
+    yield '['
+    separator = ''
+    for row in rows:
+        yield separator + row
+        separator = ','
+    yield ']'
+
+
+def get_stream_format(request):
+    stream_format = request.query_params.get('stream_format', 'ndjson')
+    if stream_format not in STREAM_FORMATS:
+        return None
+    return stream_format
+
+
+def streaming_response(queryset, serializer_class, stream_format = 'ndjson'):
+    chunk_size = getattr(settings, 'API_STREAM_CHUNK_SIZE', 500)
+    rows = iter_serialized(queryset, serializer_class, chunk_size)
+    if stream_format == 'json':
+        content = iter_json_array(rows)
+    else:
+        content = iter_ndjson(rows)
+    return StreamingHttpResponse(content, content_type = STREAM_FORMATS[stream_format])
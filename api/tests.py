@@ -0,0 +1,864 @@
+import base64
+import json
+import os
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher as DjangoPBKDF2PasswordHasher, get_hasher
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from api.cache import get_cache
+from api.filters import filter_films
+from api.serializers import FILM_LIST_FIELDS
+from api.throttling import LoginThrottle
+from movie_app import search
+from movie_app.names import name_resolver
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from api.authentication import CachedTokenAuthentication, token_cache
+from movie_app.models import User, Profile, AuthToken, Aktor, Sutradara, Genre, Negara, Bahasa, Film, Rating
+
+
+def create_film(judul, **kwargs):
+    data = {
+        'judul': judul,
+        'tahun': 2020,
+        'deskripsi': 'Deskripsi ' + judul,
+        'durasi': 120,
+    }
+    data.update(kwargs)
+    return Film.objects.create(**data)
+
+
+class FilmListQueryCountTest(TestCase):
+    # ?view=full: 1 query validator ETag, 1 query film dan 5 query prefetch M2M, berapapun jumlah filmnya
+    LIST_QUERIES = 7
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username = 'pengulas', password = 'rahasia123')
+        cls.aktor = Aktor.objects.create(nama_aktor = 'Aktor A')
+        cls.sutradara = Sutradara.objects.create(nama_sutradara = 'Sutradara A')
+        cls.genre = Genre.objects.create(genre = 'Drama')
+        cls.negara = Negara.objects.create(negara = 'Indonesia')
+        cls.bahasa = Bahasa.objects.create(bahasa = 'Indonesia')
+
+    def add_films(self, jumlah):
+        for i in range(jumlah):
+            film = create_film('Film %d' % Film.objects.count())
+            film.aktor.add(self.aktor)
+            film.sutradara.add(self.sutradara)
+            film.genre.add(self.genre)
+            film.negara.add(self.negara)
+            film.bahasa.add(self.bahasa)
+            Rating.objects.create(user = self.user, film = film, rating = 8)
+
+    def test_list_query_count_is_constant(self):
+        self.add_films(2)
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.client.get('/api/film?view=full')
+        self.assertEqual(len(response.json()['data']), 2)
+
+        self.add_films(10)
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.client.get('/api/film?view=full')
+        self.assertEqual(len(response.json()['data']), 12)
+
+    def test_list_payload(self):
+        self.add_films(1)
+        film = self.client.get('/api/film?view=full').json()['data'][0]
+        self.assertEqual(film['aktor'], ['Aktor A'])
+        self.assertEqual(film['sutradara'], ['Sutradara A'])
+        self.assertEqual(film['genre'], ['Drama'])
+        self.assertEqual(film['negara'], ['Indonesia'])
+        self.assertEqual(film['bahasa'], ['Indonesia'])
+        self.assertEqual(film['average_rating'], 8.0)
+
+    # Default list: bentuk ringkas, tanpa deskripsi dan tanpa prefetch M2M
+    def test_compact_default(self):
+        self.add_films(3)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/film')
+        film = response.json()['data'][0]
+        self.assertEqual(set(film), set(FILM_LIST_FIELDS))
+        self.assertEqual(film['average_rating'], 8.0)
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('deskripsi', queries[1]['sql'])
+        self.assertEqual(self.client.get('/api/film?view=semua').status_code, 400)
+
+    def test_film_without_rating(self):
+        create_film('Tanpa Rating')
+        film = self.client.get('/api/film').json()['data'][0]
+        self.assertIsNone(film['average_rating'])
+
+
+class KeysetPaginationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(7):
+            Aktor.objects.create(nama_aktor = 'Aktor %d' % i)
+            create_film('Film %d' % i)
+
+    def test_default_page_is_bounded(self):
+        with self.settings(API_PAGE_SIZE = 5):
+            body = self.client.get('/api/aktor').json()
+        self.assertEqual(len(body['data']), 5)
+        self.assertIsNotNone(body['next'])
+        self.assertIsNone(body['previous'])
+
+    def test_next_and_previous_cursor(self):
+        first = self.client.get('/api/film', {'page_size': 3, 'order_by': '-created_on'}).json()
+        second = self.client.get('/api/film', {'page_size': 3, 'cursor': first['next']}).json()
+        third = self.client.get('/api/film', {'page_size': 3, 'cursor': second['next']}).json()
+        judul = [film['judul'] for page in (first, second, third) for film in page['data']]
+        self.assertEqual(judul, ['Film %d' % i for i in reversed(range(7))])
+        self.assertIsNone(third['next'])
+
+        back = self.client.get('/api/film', {'page_size': 3, 'cursor': third['previous']}).json()
+        self.assertEqual(back['data'], second['data'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/aktor', {'cursor': 'bukan-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_tampered_cursor_values(self):
+        def cursor(payload):
+            return base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii')
+
+        for url, payload in (
+            ('/api/aktor', {'o': ['id'], 'p': ['abc'], 'r': False}),
+            ('/api/aktor', {'o': ['id'], 'p': [None], 'r': False}),
+            ('/api/aktor', {'o': ['id'], 'p': [10 ** 20], 'r': False}),
+            ('/api/film', {'o': ['created_on', 'id'], 'p': ['bukan-tanggal', 1], 'r': False}),
+        ):
+            response = self.client.get(url, {'cursor': cursor(payload)})
+            self.assertEqual(response.status_code, 404, payload)
+
+
+class RatingAggregateTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username = 'pengulas', password = 'rahasia123')
+        cls.user_lain = User.objects.create_user(username = 'pengulas2', password = 'rahasia123')
+        cls.film = create_film('Film A')
+        cls.film_lain = create_film('Film B')
+
+    def assertAggregate(self, film, count, total):
+        film.refresh_from_db()
+        self.assertEqual(film.rating_count, count)
+        self.assertEqual(film.rating_sum, total)
+
+    def test_aggregate_follows_rating_writes(self):
+        response = self.client.post('/api/rating', {'user': self.user.id, 'film': self.film.id, 'rating': '8.0'})
+        rating_id = response.json()['data']['id']
+        self.client.post('/api/rating', {'user': self.user_lain.id, 'film': self.film.id, 'rating': '6.0'})
+        self.assertAggregate(self.film, 2, 14)
+        self.assertEqual(self.client.get('/api/film/%d' % self.film.id).json()['data']['average_rating'], 7.0)
+
+        data = {'user': self.user.id, 'film': self.film.id, 'rating': '9.0'}
+        self.client.put('/api/rating/%d' % rating_id, data, content_type = 'application/json')
+        self.assertAggregate(self.film, 2, 15)
+
+        data['film'] = self.film_lain.id
+        self.client.put('/api/rating/%d' % rating_id, data, content_type = 'application/json')
+        self.assertAggregate(self.film, 1, 6)
+        self.assertAggregate(self.film_lain, 1, 9)
+
+        self.client.delete('/api/rating/%d' % rating_id)
+        self.assertAggregate(self.film_lain, 0, 0)
+        self.assertIsNone(self.film_lain.average_rating)
+
+    def test_rebuild_command(self):
+        Rating.objects.create(user = self.user, film = self.film, rating = 5)
+        Film.objects.update(rating_count = 0, rating_sum = 0)
+        self.client.get('/api/film/%d' % self.film.id)
+        before = {film.pk: film.last_modified for film in Film.objects.all()}
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute = True):
+            call_command('rebuild_rating_aggregates', stdout = out)
+        self.assertIn('corrected for 1 film(s)', out.getvalue())
+        self.assertAggregate(self.film, 1, 5)
+        self.assertAggregate(self.film_lain, 0, 0)
+        # hanya film yang berubah yang mendapat last_modified baru dan cache detailnya dihapus
+        self.assertGreater(Film.objects.get(pk = self.film.pk).last_modified, before[self.film.pk])
+        self.assertEqual(Film.objects.get(pk = self.film_lain.pk).last_modified, before[self.film_lain.pk])
+        self.assertEqual(self.client.get('/api/film/%d' % self.film.id).json()['data']['average_rating'], 5.0)
+
+
+class StreamingExportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(3):
+            create_film('Film %d' % i)
+
+    def test_film_export_ndjson(self):
+        response = self.client.get('/api/film/export')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['judul'] for line in lines], ['Film 0', 'Film 1', 'Film 2'])
+
+    def test_film_export_json_array(self):
+        response = self.client.get('/api/film/export', {'stream_format': 'json'})
+        films = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(len(films), 3)
+
+    def test_unknown_stream_format(self):
+        response = self.client.get('/api/rating/export', {'stream_format': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+
+class FilmFilterTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.drama = Genre.objects.create(genre = 'Drama')
+        cls.aksi = Genre.objects.create(genre = 'Aksi')
+        cls.lama = create_film('Ada Apa Dengan Cinta', tahun = 2002)
+        cls.baru = create_film('Cinta Pertama', tahun = 2020, status = 'Upcoming')
+        cls.lain = create_film('Laskar Pelangi', tahun = 2008)
+        cls.lama.genre.add(cls.drama)
+        cls.baru.genre.add(cls.drama, cls.aksi)
+        cls.lain.genre.add(cls.aksi)
+
+    def judul(self, **params):
+        return [film['judul'] for film in self.client.get('/api/film', params).json()['data']]
+
+    def test_filters(self):
+        self.assertEqual(self.judul(tahun = 2008), ['Laskar Pelangi'])
+        self.assertEqual(self.judul(tahun_min = 2005), ['Cinta Pertama', 'Laskar Pelangi'])
+        self.assertEqual(self.judul(status = 'Upcoming'), ['Cinta Pertama'])
+        self.assertEqual(self.judul(judul = 'cinta'), ['Ada Apa Dengan Cinta', 'Cinta Pertama'])
+        self.assertEqual(self.judul(judul_prefix = 'cin'), ['Cinta Pertama'])
+        self.assertEqual(self.judul(genre = self.drama.id), ['Ada Apa Dengan Cinta', 'Cinta Pertama'])
+        self.assertEqual(self.judul(genre = '%d,%d' % (self.drama.id, self.aksi.id)), ['Ada Apa Dengan Cinta', 'Cinta Pertama', 'Laskar Pelangi'])
+        self.assertEqual(self.judul(genre = self.aksi.id, tahun_max = 2010), ['Laskar Pelangi'])
+
+        self.assertEqual(self.judul(judul_prefix = 'LASKAR p'), ['Laskar Pelangi'])
+        self.assertEqual(self.judul(judul_prefix = 'Pelangi'), [])
+
+    def test_invalid_filter_value(self):
+        self.assertEqual(self.client.get('/api/film', {'tahun': 'dua ribu'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/film', {'genre': 'drama'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/film', {'aktor': '99999999999999999999'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/film', {'tahun': '99999999999999999999'}).status_code, 400)
+
+    def test_filters_use_indexes(self):
+        def plan(params):
+            sql, values = filter_films(Film.objects.all(), QueryDict(params)).query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql, values)
+                return ' '.join(row[-1] for row in cursor.fetchall())
+
+        self.assertIn('USING INDEX film_judul_lower_idx', plan('judul_prefix=cin'))
+        self.assertIn('USING COVERING INDEX movie_app_film_genre_lookup_idx', plan('genre=1'))
+        self.assertNotIn('SCAN movie_app_film', plan('genre=1'))
+
+
+class FilmSearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.film = create_film('Laskar Pelangi', deskripsi = 'Kisah sepuluh anak di Belitung')
+        cls.lain = create_film('Pengabdi Setan', deskripsi = 'Film horor keluarga')
+        cls.aktor = Aktor.objects.create(nama_aktor = 'Cut Mini')
+        cls.film.aktor.add(cls.aktor)
+
+    def search(self, q):
+        return self.client.get('/api/film/search', {'q': q}).json()['data']
+
+    def test_search_ranks_and_highlights(self):
+        hasil = self.search('belitung')
+        self.assertEqual([film['judul'] for film in hasil], ['Laskar Pelangi'])
+        self.assertIn('<b>Belitung</b>', hasil[0]['search']['snippet'])
+        self.assertEqual(self.search('lask')[0]['search']['judul'], '<b>Laskar</b> Pelangi')
+
+    def test_index_follows_relation_changes(self):
+        self.assertEqual([film['judul'] for film in self.search('mini')], ['Laskar Pelangi'])
+        self.aktor.nama_aktor = 'Ikranagara'
+        self.aktor.save()
+        self.assertEqual(self.search('mini'), [])
+        self.lain.aktor.add(self.aktor)
+        self.assertEqual(len(self.search('ikranagara')), 2)
+        self.aktor.delete()
+        self.assertEqual(self.search('ikranagara'), [])
+        self.film.delete()
+        self.assertEqual(self.search('laskar'), [])
+
+    def test_query_is_required(self):
+        self.assertEqual(self.client.get('/api/film/search').status_code, 400)
+
+
+class DetailCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username = 'pengulas', password = 'rahasia123')
+        cls.aktor = Aktor.objects.create(nama_aktor = 'Reza Rahadian')
+        cls.film = create_film('Habibie & Ainun')
+        cls.film.aktor.add(cls.aktor)
+
+    def setUp(self):
+        get_cache().clear()
+
+    def get_film(self):
+        return self.client.get('/api/film/%d' % self.film.id).json()['data']
+
+    def test_detail_is_served_from_cache(self):
+        self.get_film()
+        # hanya query validator ETag, payload diambil dari cache
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_film()['judul'], 'Habibie & Ainun')
+
+    def test_related_changes_invalidate_film(self):
+        self.assertEqual(self.get_film()['aktor'], ['Reza Rahadian'])
+        self.aktor.nama_aktor = 'Reza R.'
+        self.aktor.save()
+        self.assertEqual(self.get_film()['aktor'], ['Reza R.'])
+
+        Rating.objects.create(user = self.user, film = self.film, rating = 9)
+        self.assertEqual(self.get_film()['average_rating'], 9.0)
+
+        self.client.delete('/api/film/%d' % self.film.id)
+        self.assertEqual(self.client.get('/api/film/%d' % self.film.id).status_code, 404)
+
+    def test_write_without_signal_is_not_served_stale(self):
+        # queryset.update (proses lain / management command) tidak menghapus cache proses ini
+        url = '/api/film/%d' % self.film.id
+        self.client.get(url)
+        Film.objects.filter(pk = self.film.pk).update(judul = 'Baru', last_modified = timezone.now())
+        response = self.client.get(url)
+        self.assertEqual(response.json()['data']['judul'], 'Baru')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH = response['ETag']).status_code, 304)
+
+    def test_relation_write_without_signal_is_not_served_stale(self):
+        for model, field, url in ((Aktor, 'nama_aktor', '/api/aktor/%d'), (Genre, 'genre', '/api/genre/%d')):
+            instance = model.objects.create(**{field: 'Lama'})
+            self.client.get(url % instance.pk)
+            model.objects.filter(pk = instance.pk).update(**{field: 'Baru', 'last_modified': timezone.now()})
+            response = self.client.get(url % instance.pk)
+            self.assertEqual(response.json()['data'][field], 'Baru')
+            self.assertEqual(self.client.get(url % instance.pk, HTTP_IF_NONE_MATCH = response['ETag']).status_code, 304)
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username = 'pengulas', password = 'rahasia123')
+        cls.film = create_film('Gundala')
+        cls.aktor = Aktor.objects.create(nama_aktor = 'Abimana Aryasatya')
+
+    def test_detail_not_modified(self):
+        url = '/api/film/%d' % self.film.id
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH = etag).status_code, 304)
+
+        # relasi dan rating mengubah representasi film, jadi ETag ikut berubah
+        self.film.aktor.add(self.aktor)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH = etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        Rating.objects.create(user = self.user, film = self.film, rating = 7)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH = etag).status_code, 200)
+
+    def test_detail_etag_depends_on_variant(self):
+        url = '/api/film/%d' % self.film.id
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, {'fields': 'id,judul'}, HTTP_IF_NONE_MATCH = etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertNotEqual(self.client.get(url, {'expand': 'aktor'})['ETag'], etag)
+
+    def test_list_not_modified(self):
+        etag = self.client.get('/api/film', {'tahun': 2020})['ETag']
+        self.assertEqual(self.client.get('/api/film', {'tahun': 2020}, HTTP_IF_NONE_MATCH = etag).status_code, 304)
+        self.assertEqual(self.client.get('/api/film', {'tahun': 2021}, HTTP_IF_NONE_MATCH = etag).status_code, 200)
+        create_film('Gundala 2')
+        self.assertEqual(self.client.get('/api/film', {'tahun': 2020}, HTTP_IF_NONE_MATCH = etag).status_code, 200)
+
+    # Film dihapus: max(last_modified) tetap, jadi list tidak boleh divalidasi lewat tanggal
+    def test_list_revalidates_after_delete(self):
+        create_film('Gundala 2')
+        response = self.client.get('/api/film')
+        self.assertNotIn('Last-Modified', response)
+        etag = response['ETag']
+        since = http_date(time.time() + 60)
+        self.film.delete()
+        self.assertEqual(self.client.get('/api/film', HTTP_IF_MODIFIED_SINCE = since).status_code, 200)
+        self.assertEqual(self.client.get('/api/film', HTTP_IF_NONE_MATCH = etag).status_code, 200)
+        response = self.client.get('/api/genre/%d/films' % Genre.objects.create(genre = 'Aksi').id)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response)
+
+
+class BulkWriteTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.aktor = Aktor.objects.create(nama_aktor = 'Dian Sastrowardoyo')
+        cls.genre = Genre.objects.create(genre = 'Drama')
+
+    def post(self, url, items):
+        return self.client.post(url, items, content_type = 'application/json')
+
+    def test_bulk_create_and_update_films(self):
+        items = [
+            {'judul': 'Film %d' % i, 'tahun': 2000 + i, 'deskripsi': '-', 'durasi': 90,
+             'aktor': [self.aktor.id], 'genre': [self.genre.id]}
+            for i in range(20)
+        ]
+        search.fts_enabled()
+        # cek relasi (2), transaksi insert film + through table (5), index pencarian (2)
+        with self.assertNumQueries(9):
+            response = self.post('/api/film/bulk', items)
+        self.assertEqual(response.status_code, 201)
+        ids = response.json()['data']
+        self.assertEqual(Film.objects.filter(aktor = self.aktor).count(), 20)
+        self.assertEqual([film['judul'] for film in self.client.get('/api/film/search', {'q': 'dian'}).json()['data']][:1], ['Film 0'])
+
+        response = self.post('/api/film/bulk', [{'id': ids[0], 'judul': 'Film Baru', 'aktor': []}])
+        self.assertEqual(response.status_code, 200)
+        film = Film.objects.get(id = ids[0])
+        self.assertEqual(film.judul, 'Film Baru')
+        self.assertEqual(film.aktor.count(), 0)
+        self.assertEqual(film.genre.count(), 1)
+
+    def test_errors_are_reported_per_item(self):
+        response = self.post('/api/film/bulk', [
+            {'judul': 'Valid', 'tahun': 2001, 'deskripsi': '-', 'durasi': 90},
+            {'judul': 'Tanpa tahun', 'deskripsi': '-', 'durasi': 90},
+            {'judul': 'Aktor salah', 'tahun': 2001, 'deskripsi': '-', 'durasi': 90, 'aktor': [999]},
+            {'id': 999, 'judul': 'Tidak ada'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['index'] for error in response.json()['data']], [1, 2, 3])
+        self.assertFalse(Film.objects.exists())
+
+    def test_bulk_rename_aktor_updates_films(self):
+        film = create_film('Ada Apa Dengan Cinta')
+        film.aktor.add(self.aktor)
+        response = self.post('/api/aktor/bulk', [{'id': self.aktor.id, 'nama_aktor': 'Dian S.'}, {'nama_aktor': 'Nicholas Saputra'}])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Aktor.objects.count(), 2)
+        self.assertEqual(self.client.get('/api/film/%d' % film.id).json()['data']['aktor'], ['Dian S.'])
+
+
+class FilmRelationNameTest(TestCase):
+    def setUp(self):
+        name_resolver.clear()
+
+    def post_film(self, **relations):
+        data = {'judul': 'Film', 'status': 'Released', 'tahun': 2019, 'deskripsi': '-', 'durasi': 100}
+        data.update(relations)
+        return self.client.post('/api/film', data, content_type = 'application/json')
+
+    def test_names_are_resolved_and_created(self):
+        genre = Genre.objects.create(genre = 'Horor')
+        response = self.post_film(aktor = ['Tara Basro', 'Bront Palarae'], genre = [genre.id, 'Misteri'])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(sorted(response.json()['data']['aktor']), ['Bront Palarae', 'Tara Basro'])
+        self.assertEqual(sorted(response.json()['data']['genre']), ['Horor', 'Misteri'])
+
+        # nama yang sudah ada dipakai ulang, tidak dibuat lagi
+        self.post_film(aktor = ['Tara Basro'])
+        self.assertEqual(Aktor.objects.filter(nama_aktor = 'Tara Basro').count(), 1)
+
+    def test_query_count_does_not_grow_with_cast(self):
+        self.post_film(aktor = ['Aktor %d' % i for i in range(3)])
+        with CaptureQueriesContext(connection) as sedikit:
+            self.post_film(aktor = ['Pemeran %d' % i for i in range(3)])
+        with CaptureQueriesContext(connection) as banyak:
+            self.post_film(aktor = ['Bintang %d' % i for i in range(30)])
+        self.assertEqual(len(sedikit), len(banyak))
+
+    def test_unknown_id_is_rejected(self):
+        response = self.post_film(aktor = [999])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Film.objects.exists())
+
+    def test_bulk_accepts_names(self):
+        items = [
+            {'judul': 'Film %d' % i, 'tahun': 2019, 'deskripsi': '-', 'durasi': 100, 'genre': ['Drama', 'Keluarga']}
+            for i in range(5)
+        ]
+        response = self.client.post('/api/film/bulk', items, content_type = 'application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Genre.objects.count(), 2)
+        self.assertEqual(Film.objects.filter(genre__genre = 'Keluarga').count(), 5)
+
+
+class SparseFieldsetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.genre = Genre.objects.create(genre = 'Drama')
+        for i in range(3):
+            film = create_film('Film %d' % i, deskripsi = 'Panjang ' * 100)
+            film.genre.add(cls.genre)
+
+    def setUp(self):
+        get_cache().clear()
+
+    def test_fields_limits_payload_columns_and_prefetches(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/film?fields=id,judul,tahun,thumbnails')
+        self.assertEqual(response.status_code, 200)
+        film = response.json()['data'][0]
+        self.assertEqual(list(film), ['id', 'thumbnails', 'judul', 'tahun'])
+        # validator ETag + satu SELECT tanpa deskripsi, tanpa prefetch M2M
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('deskripsi', queries[1]['sql'])
+
+    def test_requested_relation_is_prefetched_once(self):
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/film?fields=id,genre')
+        self.assertEqual(response.json()['data'][0], {'id': Film.objects.order_by('id').first().id, 'genre': ['Drama']})
+
+    def test_exclude(self):
+        film = self.client.get('/api/film?view=full&exclude=deskripsi,aktor').json()['data'][0]
+        self.assertNotIn('deskripsi', film)
+        self.assertNotIn('aktor', film)
+        self.assertIn('genre', film)
+        self.assertIn('average_rating', film)
+        # tanpa view=full, exclude dikurangkan dari bentuk ringkas
+        film = self.client.get('/api/film?exclude=average_rating').json()['data'][0]
+        self.assertEqual(set(film), set(FILM_LIST_FIELDS) - {'average_rating'})
+
+    def test_detail_and_export_use_fieldset(self):
+        film = Film.objects.order_by('id').first()
+        response = self.client.get('/api/film/%d?fields=judul' % film.id)
+        self.assertEqual(response.json()['data'], {'judul': 'Film 0'})
+        # payload cache tetap lengkap
+        self.assertIn('deskripsi', self.client.get('/api/film/%d' % film.id).json()['data'])
+        rows = b''.join(self.client.get('/api/film/export?fields=id,tahun').streaming_content).decode().splitlines()
+        self.assertEqual(json.loads(rows[0]), {'id': film.id, 'tahun': 2020})
+
+    def test_unknown_field(self):
+        response = self.client.get('/api/film?fields=id,rahasia')
+        self.assertEqual(response.status_code, 400)
+
+
+class ExpandRelationsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.aktor = Aktor.objects.create(nama_aktor = 'Reza Rahadian')
+        cls.genre = Genre.objects.create(genre = 'Drama')
+        for i in range(4):
+            film = create_film('Film %d' % i)
+            film.aktor.add(cls.aktor)
+            film.genre.add(cls.genre)
+        cls.film = film
+
+    def setUp(self):
+        get_cache().clear()
+
+    def test_list_expand_without_extra_queries(self):
+        with self.assertNumQueries(FilmListQueryCountTest.LIST_QUERIES):
+            response = self.client.get('/api/film?view=full&expand=aktor,genre')
+        film = response.json()['data'][0]
+        self.assertEqual(film['aktor'], [{'id': self.aktor.id, 'name': 'Reza Rahadian'}])
+        self.assertEqual(film['genre'], [{'id': self.genre.id, 'name': 'Drama'}])
+        self.assertEqual(film['negara'], [])
+
+        # bentuk ringkas: hanya relasi yang di-expand yang ikut (dan di-prefetch)
+        with self.assertNumQueries(4):
+            film = self.client.get('/api/film?expand=aktor,genre').json()['data'][0]
+        self.assertEqual(film['aktor'], [{'id': self.aktor.id, 'name': 'Reza Rahadian'}])
+        self.assertNotIn('negara', film)
+
+    def test_expand_with_fields(self):
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/film?fields=id&expand=aktor')
+        self.assertEqual(response.json()['data'][0]['aktor'], [{'id': self.aktor.id, 'name': 'Reza Rahadian'}])
+        self.assertEqual(set(response.json()['data'][0]), {'id', 'aktor'})
+
+    def test_detail_expand_shares_cache(self):
+        url = '/api/film/%d' % self.film.id
+        self.assertEqual(self.client.get(url).json()['data']['aktor'], ['Reza Rahadian'])
+        with self.assertNumQueries(1):
+            data = self.client.get(url + '?expand=aktor').json()['data']
+        self.assertEqual(data['aktor'], [{'id': self.aktor.id, 'name': 'Reza Rahadian'}])
+        self.assertEqual(data['genre'], ['Drama'])
+
+    def test_unknown_expand(self):
+        self.assertEqual(self.client.get('/api/film?expand=judul').status_code, 400)
+
+
+class RelationFilmListTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.aktor = Aktor.objects.create(nama_aktor = 'Reza Rahadian')
+        cls.lain = Aktor.objects.create(nama_aktor = 'Aktor Lain')
+        cls.genre = Genre.objects.create(genre = 'Drama')
+        for i in range(5):
+            film = create_film('Film %d' % i, tahun = 2015 + i)
+            film.aktor.add(cls.aktor if i % 2 == 0 else cls.lain)
+            film.genre.add(cls.genre)
+
+    def test_films_by_aktor(self):
+        # validator ETag, cek aktor, film (bentuk ringkas, tanpa prefetch)
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/aktor/%d/films' % self.aktor.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([film['judul'] for film in response.json()['data']], ['Film 0', 'Film 2', 'Film 4'])
+
+    def test_pagination_filters_and_expand(self):
+        url = '/api/aktor/%d/films?page_size=2&tahun_min=2016&expand=genre' % self.aktor.id
+        response = self.client.get(url).json()
+        self.assertEqual([film['judul'] for film in response['data']], ['Film 2', 'Film 4'])
+        self.assertEqual(response['data'][0]['genre'], [{'id': self.genre.id, 'name': 'Drama'}])
+
+        response = self.client.get('/api/genre/%d/films?page_size=2' % self.genre.id).json()
+        self.assertEqual(len(response['data']), 2)
+        second = self.client.get('/api/genre/%d/films?page_size=2&cursor=%s' % (self.genre.id, response['next'])).json()
+        self.assertEqual([film['judul'] for film in second['data']], ['Film 2', 'Film 3'])
+
+    def test_other_relations_and_missing(self):
+        self.assertEqual(self.client.get('/api/negara/%d/films' % Negara.objects.create(negara = 'Indonesia').id).json()['data'], [])
+        self.assertEqual(self.client.get('/api/sutradara/999/films').status_code, 404)
+
+    def test_conditional_get(self):
+        url = '/api/aktor/%d/films' % self.aktor.id
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH = etag).status_code, 304)
+        Film.objects.get(judul = 'Film 1').aktor.add(self.aktor)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH = etag).status_code, 200)
+
+
+class CachedTokenAuthenticationTest(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        caches['throttle'].clear()
+        self.user = User.objects.create_user('penulis', password = 'rahasia123', is_authors = True)
+        self.profile = Profile.objects.create(user = self.user, bio = 'Penulis')
+        self.token = AuthToken.objects.create(user = self.user)
+        self.auth = CachedTokenAuthentication()
+
+    def test_cached_after_first_request(self):
+        with self.assertNumQueries(1):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual(user.user_profile.bio, 'Penulis')
+        with self.assertNumQueries(0):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+            self.assertEqual(user.user_profile.bio, 'Penulis')
+        self.assertEqual(token.key, self.token.key)
+
+        # tiap request mendapat salinan user sendiri
+        user.first_name = 'Diubah'
+        self.assertEqual(self.auth.authenticate_credentials(self.token.key)[0].first_name, '')
+
+    def test_login_primes_cache(self):
+        response = self.client.post('/api/v1/login', {'username': 'penulis', 'password': 'rahasia123'})
+        self.assertEqual(response.json()['data']['token'], self.token.key)
+        with self.assertNumQueries(0):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_password_change_and_deactivation_invalidate(self):
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.set_password('baru12345')
+        self.user.save()
+        with self.assertNumQueries(1):
+            self.auth.authenticate_credentials(self.token.key)
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_logout_revokes_token(self):
+        self.auth.authenticate_credentials(self.token.key)
+        response = self.client.post('/api/v1/logout', HTTP_AUTHORIZATION = 'Token ' + self.token.key)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(AuthToken.objects.filter(pk = self.token.pk).exists())
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_expired_token_rejected(self):
+        self.auth.authenticate_credentials(self.token.key)
+        AuthToken.objects.filter(pk = self.token.pk).update(expires_at = timezone.now() - timedelta(seconds = 1))
+        token_cache.clear()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+        # login berikutnya membuat token baru
+        key = self.client.post('/api/v1/login', {'username': 'penulis', 'password': 'rahasia123'}).json()['data']['token']
+        self.assertNotEqual(key, self.token.key)
+
+    def test_rotate_token(self):
+        response = self.client.post('/api/v1/token/rotate', HTTP_AUTHORIZATION = 'Token ' + self.token.key)
+        self.assertEqual(response.status_code, 200)
+        key = response.json()['data']['token']
+        self.assertNotEqual(key, self.token.key)
+        self.assertEqual(list(AuthToken.objects.values_list('key', flat = True)), [key])
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual(self.auth.authenticate_credentials(key)[0].pk, self.user.pk)
+
+        self.assertEqual(self.client.post('/api/v1/token/rotate').status_code, 401)
+
+    def test_purge_expired_tokens(self):
+        past = timezone.now() - timedelta(days = 1)
+        AuthToken.objects.bulk_create([AuthToken(key = AuthToken.generate_key(), user = self.user, expires_at = past) for _ in range(5)])
+        out = StringIO()
+        call_command('purge_tokens', batch_size = 2, stdout = out)
+        self.assertIn('5 expired token(s) deleted.', out.getvalue())
+        self.assertEqual(list(AuthToken.objects.values_list('key', flat = True)), [self.token.key])
+
+    def test_bounded_and_expiring(self):
+        cache = type(token_cache)(ttl = 60, max_entries = 2)
+        for key in 'abc':
+            cache.set(key, self.user, None)
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
+
+        cache = type(token_cache)(ttl = -1)
+        cache.set('a', self.user, None)
+        self.assertIsNone(cache.get('a'))
+
+
+class AuthProfileTest(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user('penulis', password = 'rahasia123', is_authors = True)
+        self.token = AuthToken.objects.create(user = self.user)
+
+    def test_catalog_get_skips_authentication(self):
+        # token salah tidak diperiksa sama sekali pada GET katalog
+        response = self.client.get('/api/genre', HTTP_AUTHORIZATION = 'Token salah')
+        self.assertEqual(response.status_code, 200)
+        with mock.patch.object(APIView, 'permission_classes', [IsAuthenticated]):
+            self.assertEqual(self.client.get('/api/genre').status_code, 200)
+
+    def test_rating_get_requires_token(self):
+        with mock.patch.object(APIView, 'permission_classes', [IsAuthenticated]):
+            for url in ('/api/rating', '/api/rating/1', '/api/rating/export?stream_format=ndjson'):
+                self.assertIn(self.client.get(url).status_code, (401, 403), url)
+            self.assertEqual(self.client.get('/api/rating', HTTP_AUTHORIZATION = 'Token salah').status_code, 401)
+            self.assertEqual(self.client.get('/api/rating', HTTP_AUTHORIZATION = 'Token ' + self.token.key).status_code, 200)
+
+    def test_writes_use_token_only(self):
+        response = self.client.post('/api/genre', {'genre': 'Drama'}, HTTP_AUTHORIZATION = 'Token salah')
+        self.assertEqual(response.status_code, 401)
+        basic = 'Basic ' + base64.b64encode(b'penulis:rahasia123').decode()
+        with mock.patch.object(APIView, 'permission_classes', [IsAuthenticated]):
+            self.assertIn(self.client.post('/api/genre', {'genre': 'Drama'}, HTTP_AUTHORIZATION = basic).status_code, (401, 403))
+            response = self.client.post('/api/genre', {'genre': 'Drama'}, HTTP_AUTHORIZATION = 'Token ' + self.token.key)
+        self.assertEqual(response.status_code, 201)
+
+    def test_bulk_rejects_session(self):
+        self.client.force_login(self.user)
+        with mock.patch.object(APIView, 'permission_classes', [IsAuthenticated]):
+            response = self.client.post('/api/genre/bulk', [{'genre': 'Drama'}], content_type = 'application/json')
+            self.assertIn(response.status_code, (401, 403))
+            response = self.client.post('/api/genre/bulk', [{'genre': 'Drama'}], content_type = 'application/json', HTTP_AUTHORIZATION = 'Token ' + self.token.key)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Genre.objects.filter(genre = 'Drama').count(), 1)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_auth', requests = 2, stdout = out)
+        self.assertIn('public GET', out.getvalue())
+        self.assertFalse(User.objects.filter(username__startswith = 'benchmark-').exists())
+
+
+class LoginThrottleTest(TestCase):
+    def setUp(self):
+        caches['throttle'].clear()
+        self.addCleanup(caches['throttle'].clear)
+        self.user = User.objects.create_user('penulis', password = 'rahasia123', is_authors = True)
+        Profile.objects.create(user = self.user)
+
+    def login(self, username, password = 'salah', **extra):
+        return self.client.post('/api/v1/login', {'username': username, 'password': password}, **extra)
+
+    @mock.patch.object(LoginThrottle, 'THROTTLE_RATES', {'login_ip': '100/min', 'login_username': '3/min'})
+    def test_username_limit_rejects_before_hashing(self):
+        for _ in range(3):
+            self.assertEqual(self.login('Penulis').status_code, 400)
+        with mock.patch('api.serializers.authenticate') as authenticate:
+            response = self.login('penulis', 'rahasia123')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        authenticate.assert_not_called()
+        # username lain tetap bisa login
+        self.assertEqual(self.login('lain').status_code, 400)
+
+    @mock.patch.object(LoginThrottle, 'THROTTLE_RATES', {'login_ip': '2/min', 'login_username': '100/min'})
+    def test_ip_limit(self):
+        self.login('a')
+        self.login('b')
+        self.assertEqual(self.login('c').status_code, 429)
+        self.assertEqual(self.login('d', REMOTE_ADDR = '10.0.0.2').status_code, 400)
+
+    # X-Forwarded-For dari klien tidak mengubah IP yang dihitung
+    @mock.patch.object(LoginThrottle, 'THROTTLE_RATES', {'login_ip': '2/min', 'login_username': '100/min'})
+    def test_ip_limit_ignores_forwarded_for(self):
+        with mock.patch('api.serializers.authenticate', return_value = None) as authenticate:
+            codes = [self.login('user%d' % i, HTTP_X_FORWARDED_FOR = '203.0.113.%d' % i).status_code for i in range(6)]
+        self.assertEqual(codes, [400, 400] + [429] * 4)
+        self.assertEqual(authenticate.call_count, 2)
+
+    def test_default_iterations_not_lowered(self):
+        self.assertGreaterEqual(get_hasher('default').iterations, DjangoPBKDF2PasswordHasher.iterations)
+
+    def test_rehash_on_login(self):
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS = 1000):
+            self.user.set_password('rahasia123')
+            self.user.save()
+        self.assertEqual(self.user.password.split('$')[1], '1000')
+
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS = 2000):
+            self.assertEqual(self.login('penulis', 'rahasia123').status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password.split('$')[1], '2000')
+        self.assertTrue(self.user.check_password('rahasia123'))
+
+
+class RegistrationTest(TestCase):
+    def test_one_insert_per_table(self):
+        data = {
+            'username': 'baru', 'email': 'baru@example.com', 'password1': 'Rahasia!2345', 'password2': 'Rahasia!2345',
+            'is_active': True, 'is_authors': True, 'first_name': 'Baru', 'last_name': 'Sekali',
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/v1/register', data)
+        self.assertEqual(response.status_code, 201)
+        writes = [query['sql'].split()[0] for query in queries.captured_queries if query['sql'].split()[0] in ('INSERT', 'UPDATE')]
+        self.assertEqual(writes, ['INSERT', 'INSERT'])
+
+        user = User.objects.get(username = 'baru')
+        self.assertTrue(user.check_password('Rahasia!2345'))
+        self.assertEqual(Profile.objects.get(user = user).user_create, user)
+
+    def test_provision_users(self):
+        User.objects.create_user('lama', email = 'lama@example.com', password = 'x')
+        with tempfile.NamedTemporaryFile('w', suffix = '.csv', delete = False) as file:
+            file.write(
+                'username,email,password,first_name,last_name,is_authors,is_visitors,is_active\n'
+                'satu,satu@example.com,pass-satu,Satu,A,1,0,\n'
+                'dua,dua@example.com,pass-dua,Dua,B,0,yes,false\n'
+                'satu,lain@example.com,pass,X,Y,,,\n'
+                'lama,baru@example.com,pass,X,Y,,,\n'
+                ',kosong@example.com,pass,X,Y,,,\n'
+            )
+        self.addCleanup(os.remove, file.name)
+
+        out = StringIO()
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS = 1000):
+            call_command('provision_users', file.name, workers = 2, batch_size = 1, stdout = out)
+        self.assertIn('2 users created, 2 skipped (existing or duplicate), 1 invalid rows.', out.getvalue())
+
+        satu = User.objects.get(username = 'satu')
+        self.assertTrue(satu.check_password('pass-satu'))
+        self.assertTrue(satu.is_authors and satu.is_active)
+        dua = User.objects.get(username = 'dua')
+        self.assertTrue(dua.is_visitors)
+        self.assertFalse(dua.is_active)
+        self.assertEqual(Profile.objects.filter(user__username__in = ['satu', 'dua']).count(), 2)
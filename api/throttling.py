@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle
+
+
+# Batas percobaan login per IP dan per username (sliding window: daftar waktu percobaan
+# di cache lokal proses). Dicek sebelum LoginSerializer memanggil authenticate(), jadi
+# percobaan yang ditolak tidak menghitung hash password sama sekali.
+# Rate diatur lewat REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] ('login_ip', 'login_username').
+class LoginThrottle(SimpleRateThrottle):
+    def __init__(self):
+        self.cache = caches[getattr(settings, 'API_THROTTLE_CACHE_ALIAS', 'default')]
+        super().__init__()
+
+
+class LoginIPThrottle(LoginThrottle):
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginUsernameThrottle(LoginThrottle):
+    scope = 'login_username'
+
+    def get_cache_key(self, request, view):
+        username = request.data.get('username') if hasattr(request.data, 'get') else None
+        if not isinstance(username, str) or not username.strip():
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': username.strip().lower()}
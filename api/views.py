@@ -4,27 +4,44 @@ from rest_framework import status
 from rest_framework import permissions
 from rest_framework import generics
 from rest_framework.generics import GenericAPIView
-from movie_app.models import User, Profile, Aktor, Sutradara, Genre, Negara, Bahasa, Film, Rating
-from api.serializers import RegisterAuthorsSerializer, LoginSerializer, AktorSerializer, SutradaraSerializer, GenreSerializer, NegaraSerializer, BahasaSerializer, FilmSerializer, RatingSerializer, ProfileSerializer
-from rest_framework.authentication import TokenAuthentication
+from movie_app.models import User, Profile, AuthToken, Aktor, Sutradara, Genre, Negara, Bahasa, Film, Rating
+from api.serializers import RegisterAuthorsSerializer, LoginSerializer, AktorSerializer, SutradaraSerializer, GenreSerializer, NegaraSerializer, BahasaSerializer, FilmSerializer, RatingSerializer, ProfileSerializer, FILM_RELATION_FIELDS, FILM_LIST_FIELDS
+from api.authentication import AuthProfileMixin, CachedTokenAuthentication, token_cache
+from api.throttling import LoginIPThrottle, LoginUsernameThrottle
 from django.contrib.auth import authenticate, login as django_login, logout as django_logout
-from rest_framework.authtoken.models import Token
 from django.http import JsonResponse
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 from rest_framework.decorators import authentication_classes, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from api.pagination import KeysetPagination
+from api.filters import filter_films
+from api.cache import get_cached_detail, set_cached_detail, invalidate_details
+from api.bulk import FilmBulkItemSerializer, bulk_write
+from movie_app.signals import FILM_RELATIONS, films_changed, related_film_ids
+from movie_app.names import name_resolver
+from django.conf import settings
+from api.conditional import conditional_get, detail_validators, list_validators
+from movie_app import search
+from django.db.models import Q
+from api.streaming import STREAM_FORMATS, get_stream_format, streaming_response
+from api.fieldsets import get_fieldset, get_expand, apply_fieldset, filter_payload, collapse_relations
+from functools import partial
 
 
 # AKTOR VIEW
-class AktorListAPiView(APIView):
+class AktorListAPiView(AuthProfileMixin, APIView):
     # 1. List all
     def get(self, request, *args, **kwargs):
-        aktors = Aktor.objects.all()
+        paginator = KeysetPagination()
+        aktors = paginator.paginate_queryset(Aktor.objects.all(), request)
         serializer = AktorSerializer(aktors, many= True)
         response = {
             'status' : status.HTTP_200_OK,
             'message' : 'Retrive all data success...',
-            'data' : serializer.data
+            'data' : serializer.data,
+            'next' : paginator.get_next_cursor(),
+            'previous' : paginator.get_previous_cursor(),
         }
         return Response(response, status = status.HTTP_200_OK)
     
@@ -46,7 +63,7 @@ class AktorListAPiView(APIView):
         return Response(serializer.errors, status = status.HTTP_400_BAD_REQUEST)
 
 # AKTOR DETAIL VIEW
-class AktorDetailApiview(APIView):
+class AktorDetailApiview(AuthProfileMixin, APIView):
     # 1. Get Object by Id
     def get_object(self, id):
         try:
@@ -54,22 +71,26 @@ class AktorDetailApiview(APIView):
         except Aktor.DoesNotExist:
             return None
 
+    @conditional_get(detail_validators(Aktor))
     def get(self, request, id, *args, **kwargs):
-        aktor_instance = self.get_object(id)
-        if not aktor_instance:
-            return Response(
-                {
-                    'status': status.HTTP_404_NOT_FOUND,
-                    'message': 'Data aktor does not exist',
-                    'data': {}
-                },
-                status=status.HTTP_404_NOT_FOUND
-            )
-        serializer = AktorSerializer(aktor_instance)
+        data = get_cached_detail(Aktor, id, self.last_modified)
+        if data is None:
+            aktor_instance = self.get_object(id)
+            if not aktor_instance:
+                return Response(
+                    {
+                        'status': status.HTTP_404_NOT_FOUND,
+                        'message': 'Data aktor does not exist',
+                        'data': {}
+                    },
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            data = AktorSerializer(aktor_instance).data
+            set_cached_detail(Aktor, id, data, aktor_instance.last_modified)
         response = {
             'status': status.HTTP_200_OK,
             'message': 'Data aktor retrieved successfully',
-            'data': serializer.data
+            'data': data
         }
 
         return Response(response, status=status.HTTP_200_OK)
@@ -121,15 +142,18 @@ class AktorDetailApiview(APIView):
 
 
 # SUTRADARA VIEW
-class SutradaraListAPiView(APIView):
+class SutradaraListAPiView(AuthProfileMixin, APIView):
     # 1. List all
     def get(self, request, *args, **kwargs):
-        sutradaras = Sutradara.objects.all()
+        paginator = KeysetPagination()
+        sutradaras = paginator.paginate_queryset(Sutradara.objects.all(), request)
         serializer = SutradaraSerializer(sutradaras, many= True)
         response = {
             'status' : status.HTTP_200_OK,
             'message' : 'Retrive all data success...',
-            'data' : serializer.data
+            'data' : serializer.data,
+            'next' : paginator.get_next_cursor(),
+            'previous' : paginator.get_previous_cursor(),
         }
         return Response(response, status = status.HTTP_200_OK)
     
@@ -151,29 +175,33 @@ class SutradaraListAPiView(APIView):
         return Response(serializer.errors, status = status.HTTP_400_BAD_REQUEST)
     
 # SUTRADARA DETAIL VIEW
-class SutradaraDetailApiview(APIView):
+class SutradaraDetailApiview(AuthProfileMixin, APIView):
     #1. Get Object by Id
     def get_object(self, id):
         try:
             return Sutradara.objects.get( id = id)
         except Sutradara.DoesNotExist:
             return None
+    @conditional_get(detail_validators(Sutradara))
     def get(self, request, id, *args, **kwargs):
-        sutradara_instance = self.get_object(id)
-        if not sutradara_instance:
-            return Response(
-                {
-                    'status' : status.HTTP_404_NOT_FOUND,
-                    'message' : 'Data sutradara does not exists',
-                    'data' : {}
-                },
-                status=status.HTTP_404_NOT_FOUND
-            )
-        serializer = SutradaraSerializer(sutradara_instance)
+        data = get_cached_detail(Sutradara, id, self.last_modified)
+        if data is None:
+            sutradara_instance = self.get_object(id)
+            if not sutradara_instance:
+                return Response(
+                    {
+                        'status' : status.HTTP_404_NOT_FOUND,
+                        'message' : 'Data sutradara does not exists',
+                        'data' : {}
+                    },
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            data = SutradaraSerializer(sutradara_instance).data
+            set_cached_detail(Sutradara, id, data, sutradara_instance.last_modified)
         response = {
             'status' : status.HTTP_200_OK,
             'message' : 'Data sutradara retrieve succesfully',
-            'data' : serializer.data
+            'data' : data
         }
 
         return Response(response, status = status.HTTP_200_OK)
@@ -224,15 +252,18 @@ class SutradaraDetailApiview(APIView):
         return Response(response, status = status.HTTP_200_OK)
     
 # GENRE VIEW
-class GenreListAPiView(APIView):
+class GenreListAPiView(AuthProfileMixin, APIView):
     # 1. List all
     def get(self, request, *args, **kwargs):
-        genres = Genre.objects.all()
+        paginator = KeysetPagination()
+        genres = paginator.paginate_queryset(Genre.objects.all(), request)
         serializer = GenreSerializer(genres, many= True)
         response = {
             'status' : status.HTTP_200_OK,
             'message' : 'Retrive all data success...',
-            'data' : serializer.data
+            'data' : serializer.data,
+            'next' : paginator.get_next_cursor(),
+            'previous' : paginator.get_previous_cursor(),
         }
         return Response(response, status = status.HTTP_200_OK)
     
@@ -254,29 +285,33 @@ class GenreListAPiView(APIView):
         return Response(serializer.errors, status = status.HTTP_400_BAD_REQUEST)
 
 # GENRE DETAIL VIEW
-class GenreDetailApiview(APIView):
+class GenreDetailApiview(AuthProfileMixin, APIView):
     #1. Get Object by Id
     def get_object(self, id):
         try:
             return Genre.objects.get( id = id)
         except Genre.DoesNotExist:
             return None
+    @conditional_get(detail_validators(Genre))
     def get(self, request, id, *args, **kwargs):
-        genre_instance = self.get_object(id)
-        if not genre_instance:
-            return Response(
-                {
-                    'status' : status.HTTP_404_NOT_FOUND,
-                    'message' : 'Data genre does not exists',
-                    'data' : {}
-                },
-                status=status.HTTP_404_NOT_FOUND
-            )
-        serializer = GenreSerializer(genre_instance)
+        data = get_cached_detail(Genre, id, self.last_modified)
+        if data is None:
+            genre_instance = self.get_object(id)
+            if not genre_instance:
+                return Response(
+                    {
+                        'status' : status.HTTP_404_NOT_FOUND,
+                        'message' : 'Data genre does not exists',
+                        'data' : {}
+                    },
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            data = GenreSerializer(genre_instance).data
+            set_cached_detail(Genre, id, data, genre_instance.last_modified)
         response = {
             'status' : status.HTTP_200_OK,
             'message' : 'Data genre retrieve succesfully',
-            'data' : serializer.data
+            'data' : data
         }
 
         return Response(response, status = status.HTTP_200_OK)
@@ -327,15 +362,18 @@ class GenreDetailApiview(APIView):
         return Response(response, status = status.HTTP_200_OK)
 
 # Negara View
-class NegaraListAPiView(APIView):
+class NegaraListAPiView(AuthProfileMixin, APIView):
     # 1. List all
     def get(self, request, *args, **kwargs):
-        negaras = Negara.objects.all()
+        paginator = KeysetPagination()
+        negaras = paginator.paginate_queryset(Negara.objects.all(), request)
         serializer = NegaraSerializer(negaras, many= True)
         response = {
             'status' : status.HTTP_200_OK,
             'message' : 'Retrive all data success...',
-            'data' : serializer.data
+            'data' : serializer.data,
+            'next' : paginator.get_next_cursor(),
+            'previous' : paginator.get_previous_cursor(),
         }
         return Response(response, status = status.HTTP_200_OK)
     
@@ -358,29 +396,33 @@ class NegaraListAPiView(APIView):
 
 
 # Negara Detail View
-class NegaraDetailApiview(APIView):
+class NegaraDetailApiview(AuthProfileMixin, APIView):
     #1. Get Object by Id
     def get_object(self, id):
         try:
             return Negara.objects.get( id = id)
         except Negara.DoesNotExist:
             return None
+    @conditional_get(detail_validators(Negara))
     def get(self, request, id, *args, **kwargs):
-        negara_instance = self.get_object(id)
-        if not negara_instance:
-            return Response(
-                {
-                    'status' : status.HTTP_404_NOT_FOUND,
-                    'message' : 'Data negara does not exists',
-                    'data' : {}
-                },
-                status=status.HTTP_404_NOT_FOUND
-            )
-        serializer = NegaraSerializer(negara_instance)
+        data = get_cached_detail(Negara, id, self.last_modified)
+        if data is None:
+            negara_instance = self.get_object(id)
+            if not negara_instance:
+                return Response(
+                    {
+                        'status' : status.HTTP_404_NOT_FOUND,
+                        'message' : 'Data negara does not exists',
+                        'data' : {}
+                    },
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            data = NegaraSerializer(negara_instance).data
+            set_cached_detail(Negara, id, data, negara_instance.last_modified)
         response = {
             'status' : status.HTTP_200_OK,
             'message' : 'Data negara retrieve succesfully',
-            'data' : serializer.data
+            'data' : data
         }
 
         return Response(response, status = status.HTTP_200_OK)
@@ -432,15 +474,18 @@ class NegaraDetailApiview(APIView):
     
 
 # View Bahasa
-class BahasaListAPiView(APIView):
+class BahasaListAPiView(AuthProfileMixin, APIView):
     # 1. List all
     def get(self, request, *args, **kwargs):
-        bahasas = Bahasa.objects.all()
+        paginator = KeysetPagination()
+        bahasas = paginator.paginate_queryset(Bahasa.objects.all(), request)
         serializer = BahasaSerializer(bahasas, many= True)
         response = {
             'status' : status.HTTP_200_OK,
             'message' : 'Retrive all data success...',
-            'data' : serializer.data
+            'data' : serializer.data,
+            'next' : paginator.get_next_cursor(),
+            'previous' : paginator.get_previous_cursor(),
         }
         return Response(response, status = status.HTTP_200_OK)
     
@@ -462,29 +507,33 @@ class BahasaListAPiView(APIView):
         return Response(serializer.errors, status = status.HTTP_400_BAD_REQUEST)
 
 # View Detail Bahasa
-class BahasaDetailApiview(APIView):
+class BahasaDetailApiview(AuthProfileMixin, APIView):
     #1. Get Object by Id
     def get_object(self, id):
         try:
             return Bahasa.objects.get( id = id)
         except Bahasa.DoesNotExist:
             return None
+    @conditional_get(detail_validators(Bahasa))
     def get(self, request, id, *args, **kwargs):
-        bahasa_instance = self.get_object(id)
-        if not bahasa_instance:
-            return Response(
-                {
-                    'status' : status.HTTP_404_NOT_FOUND,
-                    'message' : 'Data bahasa does not exists',
-                    'data' : {}
-                },
-                status=status.HTTP_404_NOT_FOUND
-            )
-        serializer = BahasaSerializer(bahasa_instance)
+        data = get_cached_detail(Bahasa, id, self.last_modified)
+        if data is None:
+            bahasa_instance = self.get_object(id)
+            if not bahasa_instance:
+                return Response(
+                    {
+                        'status' : status.HTTP_404_NOT_FOUND,
+                        'message' : 'Data bahasa does not exists',
+                        'data' : {}
+                    },
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            data = BahasaSerializer(bahasa_instance).data
+            set_cached_detail(Bahasa, id, data, bahasa_instance.last_modified)
         response = {
             'status' : status.HTTP_200_OK,
             'message' : 'Data bahasa retrieve succesfully',
-            'data' : serializer.data
+            'data' : data
         }
 
         return Response(response, status = status.HTTP_200_OK)
@@ -534,16 +583,40 @@ class BahasaDetailApiview(APIView):
 
         return Response(response, status = status.HTTP_200_OK)
 
+# Ambil daftar relasi dari JSON (list) atau form-data (key berulang: aktor=1&aktor=Nama)
+def get_relation_values(data, field):
+    if hasattr(data, 'getlist'):
+        return data.getlist(field) or None
+    return data.get(field)
+
+# Validator conditional GET untuk list film/rating (filter sama dengan yang dipakai get)
+def film_list_validators(request, *args, **kwargs):
+    return list_validators(request, filter_films(Film.objects.all(), request.query_params))
+
+def rating_list_validators(request, *args, **kwargs):
+    return list_validators(request, Rating.objects.all())
+
 # View Film
-class FilmListApiView(APIView):
+class FilmListApiView(AuthProfileMixin, APIView):
     #1. List All
+    @conditional_get(film_list_validators)
     def get(self, request, *args, **kwargs):
-        films = Film.objects.all()
-        serializer = FilmSerializer(films, many= True)
+        paginator = KeysetPagination(('id', 'created_on', 'last_modified'))
+        # Default bentuk ringkas (FILM_LIST_FIELDS), ?view=full untuk semua field;
+        # ?fields= / ?exclude=: hanya kolom dan relasi yang diminta yang diambil
+        # ?expand=: relasi sebagai {id, name}
+        expand = get_expand(request, FILM_RELATION_FIELDS)
+        fieldset = get_fieldset(request, FilmSerializer, expand, FILM_LIST_FIELDS)
+        films = apply_fieldset(Film.objects.all(), fieldset, FILM_RELATION_FIELDS)
+        films = filter_films(films, request.query_params)
+        films = paginator.paginate_queryset(films, request)
+        serializer = FilmSerializer(films, many= True, fields = fieldset, expand = expand)
         response = {
             'status' : status.HTTP_200_OK,
             'message' : 'Retrive all data success...',
-            'data' : serializer.data
+            'data' : serializer.data,
+            'next' : paginator.get_next_cursor(),
+            'previous' : paginator.get_previous_cursor(),
         }
         return Response(response, status = status.HTTP_200_OK)
     
@@ -556,13 +629,14 @@ class FilmListApiView(APIView):
             'tahun': request.data.get('tahun'),
             'deskripsi': request.data.get('deskripsi'),
             'durasi': request.data.get('durasi'),
-            'sutradara': request.data.get('sutradara'),
-            'aktor': request.data.get('aktor'),
-            'genre': request.data.get('genre'),
-            'negara': request.data.get('negara'),
-            'bahasa': request.data.get('bahasa')
         }
 
+        # Relasi boleh berisi id dan/atau nama; nama baru dibuat otomatis
+        for field in FILM_RELATION_FIELDS:
+            values = get_relation_values(request.data, field)
+            if values is not None:
+                data[field] = values
+
         serializer = FilmSerializer(data=data)
         if serializer.is_valid():
             serializer.save()
@@ -575,29 +649,35 @@ class FilmListApiView(APIView):
         return Response(serializer.errors, status = status.HTTP_400_BAD_REQUEST)
 
 # View Detail Film
-class FilmDetailApiview(APIView):
+class FilmDetailApiview(AuthProfileMixin, APIView):
     #1. Get Object by Id
     def get_object(self, id):
         try:
-            return Film.objects.get(id=id)
+            return Film.objects.with_relations().get(id=id)
         except Film.DoesNotExist:
             return None
+    @conditional_get(detail_validators(Film))
     def get(self, request, id, *args, **kwargs):
-        film_instance = self.get_object(id)
-        if not film_instance:
-            return Response(
-                {
-                    'status' : status.HTTP_404_NOT_FOUND,
-                    'message' : 'Data film does not exists',
-                    'data' : {}
-                    },
-                    status=status.HTTP_404_NOT_FOUND
-            )
-        serializer = FilmSerializer(film_instance)
+        expand = get_expand(request, FILM_RELATION_FIELDS)
+        fieldset = get_fieldset(request, FilmSerializer, expand)
+        data = get_cached_detail(Film, id, self.last_modified)
+        if data is None:
+            film_instance = self.get_object(id)
+            if not film_instance:
+                return Response(
+                    {
+                        'status' : status.HTTP_404_NOT_FOUND,
+                        'message' : 'Data film does not exists',
+                        'data' : {}
+                        },
+                        status=status.HTTP_404_NOT_FOUND
+                )
+            data = FilmSerializer(film_instance, expand = FILM_RELATION_FIELDS).data
+            set_cached_detail(Film, id, data, film_instance.last_modified)
         response = {
             'status' : status.HTTP_200_OK,
             'message' : 'Data film retrieve succesfully',
-            'data' : serializer.data
+            'data' : filter_payload(collapse_relations(data, FILM_RELATION_FIELDS, expand), fieldset)
             }
         
         return Response(response, status = status.HTTP_200_OK)
@@ -621,12 +701,13 @@ class FilmDetailApiview(APIView):
             'tahun': request.data.get('tahun'),
             'deskripsi': request.data.get('deskripsi'),
             'durasi': request.data.get('durasi'),
-            'sutradara': request.data.get('sutradara'),
-            'aktor': request.data.get('aktor'),
-            'genre': request.data.get('genre'),
-            'negara': request.data.get('negara'),
-            'bahasa': request.data.get('bahasa')
         }
+
+        # Relasi boleh berisi id dan/atau nama; nama baru dibuat otomatis
+        for field in FILM_RELATION_FIELDS:
+            values = get_relation_values(request.data, field)
+            if values is not None:
+                data[field] = values
         serializer = FilmSerializer(instance = film_instance, data = data, partial = True)
         if serializer.is_valid():
             serializer.save()
@@ -657,16 +738,222 @@ class FilmDetailApiview(APIView):
 
         return Response(response, status = status.HTTP_200_OK)
     
+# Pencarian Film (full-text, FTS5)
+class FilmSearchApiView(AuthProfileMixin, APIView):
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {
+                    'status': status.HTTP_400_BAD_REQUEST,
+                    'message': 'Query parameter q is required',
+                    'data': {}
+                }, status = status.HTTP_400_BAD_REQUEST
+            )
+        paginator = KeysetPagination()
+        limit = paginator.get_page_size(request)
+        expand = get_expand(request, FILM_RELATION_FIELDS)
+        fieldset = get_fieldset(request, FilmSerializer, expand, FILM_LIST_FIELDS)
+        queryset = apply_fieldset(Film.objects.all(), fieldset, FILM_RELATION_FIELDS)
+
+        if search.fts_enabled():
+            hits = search.search_films(query, limit)
+            films = queryset.in_bulk([hit[0] for hit in hits])
+            data = []
+            for film_id, rank, judul, snippet in hits:
+                if film_id not in films:
+                    continue
+                item = FilmSerializer(films[film_id], fields = fieldset, expand = expand).data
+                item['search'] = {'rank': rank, 'judul': judul, 'snippet': snippet}
+                data.append(item)
+        else:
+            films = queryset.filter(
+                Q(judul__icontains = query) | Q(deskripsi__icontains = query)
+            ).order_by('judul')[:limit]
+            data = FilmSerializer(films, many = True, fields = fieldset, expand = expand).data
+
+        response = {
+            'status' : status.HTTP_200_OK,
+            'message' : 'Search film success...',
+            'data' : data
+        }
+        return Response(response, status = status.HTTP_200_OK)
+
+# Export Film (streaming, untuk sinkronisasi penuh)
+class FilmExportApiView(AuthProfileMixin, APIView):
+    def get(self, request, *args, **kwargs):
+        stream_format = get_stream_format(request)
+        if not stream_format:
+            return Response(
+                {
+                    'status': status.HTTP_400_BAD_REQUEST,
+                    'message': 'stream_format must be one of: ' + ', '.join(STREAM_FORMATS),
+                    'data': {}
+                }, status = status.HTTP_400_BAD_REQUEST
+            )
+        expand = get_expand(request, FILM_RELATION_FIELDS)
+        fieldset = get_fieldset(request, FilmSerializer, expand)
+        films = apply_fieldset(Film.objects.all(), fieldset, FILM_RELATION_FIELDS).order_by('id')
+        return streaming_response(films, partial(FilmSerializer, fields = fieldset, expand = expand), stream_format)
+
+# FILM PER RELASI (filmografi): /api/aktor/<id>/films, /api/genre/<id>/films, dst.
+# Join ke through table memakai index (<relasi>_id, film_id) dari migrasi 0015;
+# filter, fields/expand dan keyset pagination sama dengan /api/film.
+def relation_films(model, id):
+    return Film.objects.filter(**{FILM_RELATIONS[model]: id})
+
+def relation_film_validators(model):
+    def validators(request, id, *args, **kwargs):
+        return list_validators(request, filter_films(relation_films(model, id), request.query_params))
+    return validators
+
+class RelationFilmListApiView(AuthProfileMixin, APIView):
+    model = None
+
+    def get(self, request, id, *args, **kwargs):
+        if not self.model.objects.filter(pk = id).exists():
+            return Response(
+                {
+                    'status' : status.HTTP_404_NOT_FOUND,
+                    'message' : 'Data %s does not exists' % self.model._meta.model_name,
+                    'data' : []
+                }, status = status.HTTP_404_NOT_FOUND
+            )
+        paginator = KeysetPagination(('id', 'created_on', 'last_modified'))
+        expand = get_expand(request, FILM_RELATION_FIELDS)
+        fieldset = get_fieldset(request, FilmSerializer, expand, FILM_LIST_FIELDS)
+        films = apply_fieldset(relation_films(self.model, id), fieldset, FILM_RELATION_FIELDS)
+        films = filter_films(films, request.query_params)
+        films = paginator.paginate_queryset(films, request)
+        serializer = FilmSerializer(films, many = True, fields = fieldset, expand = expand)
+        response = {
+            'status' : status.HTTP_200_OK,
+            'message' : 'Retrive film %s success...' % self.model._meta.model_name,
+            'data' : serializer.data,
+            'next' : paginator.get_next_cursor(),
+            'previous' : paginator.get_previous_cursor(),
+        }
+        return Response(response, status = status.HTTP_200_OK)
+
+class AktorFilmListApiView(RelationFilmListApiView):
+    model = Aktor
+    get = conditional_get(relation_film_validators(Aktor))(RelationFilmListApiView.get)
+
+class SutradaraFilmListApiView(RelationFilmListApiView):
+    model = Sutradara
+    get = conditional_get(relation_film_validators(Sutradara))(RelationFilmListApiView.get)
+
+class GenreFilmListApiView(RelationFilmListApiView):
+    model = Genre
+    get = conditional_get(relation_film_validators(Genre))(RelationFilmListApiView.get)
+
+class NegaraFilmListApiView(RelationFilmListApiView):
+    model = Negara
+    get = conditional_get(relation_film_validators(Negara))(RelationFilmListApiView.get)
+
+class BahasaFilmListApiView(RelationFilmListApiView):
+    model = Bahasa
+    get = conditional_get(relation_film_validators(Bahasa))(RelationFilmListApiView.get)
+
+# BULK CREATE/UPDATE
+# Body berupa array objek; item dengan "id" diperbarui, tanpa "id" dibuat baru
+class BulkApiView(AuthProfileMixin, APIView):
+    auth_profiles = {}
+    model = None
+    serializer_class = None
+    relation_fields = ()
+
+    def post(self, request, *args, **kwargs):
+        max_items = getattr(settings, 'API_BULK_MAX_ITEMS', 50000)
+        items = request.data
+        if not isinstance(items, list) or not items or len(items) > max_items:
+            return Response(
+                {
+                    'status': status.HTTP_400_BAD_REQUEST,
+                    'message': 'Expected a list of 1 to %d objects' % max_items,
+                    'data': {}
+                }, status = status.HTTP_400_BAD_REQUEST
+            )
+
+        result = bulk_write(self.model, self.serializer_class, items, self.relation_fields)
+        if result.errors:
+            response = {
+                'status': status.HTTP_400_BAD_REQUEST,
+                'message': 'Invalid data',
+                'data': result.errors
+            }
+            return Response(response, status = status.HTTP_400_BAD_REQUEST)
+
+        # bulk_create/bulk_update tidak mengirim signal, jadi index & cache diurus di sini
+        self.after_write(result)
+        code = status.HTTP_201_CREATED if result.created_ids else status.HTTP_200_OK
+        response = {
+            'status': code,
+            'message': 'Data %s written successfully...' % self.model._meta.model_name,
+            'data': result.ids
+        }
+        return Response(response, status = code)
+
+    def after_write(self, result):
+        invalidate_details(self.model, result.updated_ids)
+
+# Bulk relasi film: nama yang berubah ikut mengubah film yang memakainya
+class RelationBulkApiView(BulkApiView):
+    def after_write(self, result):
+        super().after_write(result)
+        name_resolver.clear(self.model)
+        field = FILM_RELATIONS[self.model]
+        film_ids = related_film_ids(field, result.updated_ids)
+        films_changed(field, film_ids)
+        invalidate_details(Film, film_ids)
+
+class AktorBulkApiView(RelationBulkApiView):
+    model = Aktor
+    serializer_class = AktorSerializer
+
+class SutradaraBulkApiView(RelationBulkApiView):
+    model = Sutradara
+    serializer_class = SutradaraSerializer
+
+class GenreBulkApiView(RelationBulkApiView):
+    model = Genre
+    serializer_class = GenreSerializer
+
+class NegaraBulkApiView(RelationBulkApiView):
+    model = Negara
+    serializer_class = NegaraSerializer
+
+class BahasaBulkApiView(RelationBulkApiView):
+    model = Bahasa
+    serializer_class = BahasaSerializer
+
+class FilmBulkApiView(BulkApiView):
+    model = Film
+    serializer_class = FilmBulkItemSerializer
+    relation_fields = ('sutradara', 'aktor', 'genre', 'negara', 'bahasa')
+
+    def after_write(self, result):
+        super().after_write(result)
+        search.index_films(result.ids)
+
 # View Rating
-class RatingListAPiView(APIView):
+# Rating adalah data user (bukan katalog): semua method lewat profil token dan
+# DEFAULT_PERMISSION_CLASSES, termasuk GET
+class RatingListAPiView(AuthProfileMixin, APIView):
+    auth_profiles = {}
+
     # 1. List all
+    @conditional_get(rating_list_validators)
     def get(self, request, *args, **kwargs):
-        ratings = Rating.objects.all()
+        paginator = KeysetPagination(('id', 'created_on', 'last_modified'))
+        ratings = paginator.paginate_queryset(Rating.objects.all(), request)
         serializer = RatingSerializer(ratings, many= True)
         response = {
             'status' : status.HTTP_200_OK,
             'message' : 'Retrive all data success...',
-            'data' : serializer.data
+            'data' : serializer.data,
+            'next' : paginator.get_next_cursor(),
+            'previous' : paginator.get_previous_cursor(),
         }
         return Response(response, status = status.HTTP_200_OK)
     
@@ -704,29 +991,35 @@ class RatingListAPiView(APIView):
             return Response(response, status=status.HTTP_400_BAD_REQUEST)
     
 # View Detail Rating
-class RatingDetailApiview(APIView):
+class RatingDetailApiview(AuthProfileMixin, APIView):
+    auth_profiles = {}
+
     #1. Get Object by Id
     def get_object(self, id):
         try:
             return Rating.objects.get(id=id)
         except Rating.DoesNotExist:
             return None
+    @conditional_get(detail_validators(Rating))
     def get(self, request, id, *args, **kwargs):
-        rating_instance = self.get_object(id)
-        if not rating_instance:
-            return Response(
-                {
-                    'status' : status.HTTP_404_NOT_FOUND,
-                    'message' : 'Data rating does not exists',
-                    'data' : {}
-                    },
-                    status=status.HTTP_404_NOT_FOUND
-            )
-        serializer = RatingSerializer(rating_instance)
+        data = get_cached_detail(Rating, id, self.last_modified)
+        if data is None:
+            rating_instance = self.get_object(id)
+            if not rating_instance:
+                return Response(
+                    {
+                        'status' : status.HTTP_404_NOT_FOUND,
+                        'message' : 'Data rating does not exists',
+                        'data' : {}
+                        },
+                        status=status.HTTP_404_NOT_FOUND
+                )
+            data = RatingSerializer(rating_instance).data
+            set_cached_detail(Rating, id, data, rating_instance.last_modified)
         response = {
             'status' : status.HTTP_200_OK,
             'message' : 'Data rating retrieve succesfully',
-            'data' : serializer.data
+            'data' : data
             }
         
         return Response(response, status = status.HTTP_200_OK)
@@ -778,18 +1071,40 @@ class RatingDetailApiview(APIView):
 
         return Response(response, status = status.HTTP_200_OK)
 
+# Export Rating (streaming, untuk sinkronisasi penuh)
+class RatingExportApiView(AuthProfileMixin, APIView):
+    auth_profiles = {}
+
+    def get(self, request, *args, **kwargs):
+        stream_format = get_stream_format(request)
+        if not stream_format:
+            return Response(
+                {
+                    'status': status.HTTP_400_BAD_REQUEST,
+                    'message': 'stream_format must be one of: ' + ', '.join(STREAM_FORMATS),
+                    'data': {}
+                }, status = status.HTTP_400_BAD_REQUEST
+            )
+        ratings = Rating.objects.order_by('id')
+        return streaming_response(ratings, RatingSerializer, stream_format)
+
 # USER LOGIN
 @authentication_classes([])
 @permission_classes([AllowAny])
 class LoginView(GenericAPIView):
     serializer_class = LoginSerializer
+    # dicek sebelum post(), jadi percobaan yang ditolak tidak menghitung hash password
+    throttle_classes = (LoginIPThrottle, LoginUsernameThrottle)
 
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data['user']
         django_login(request, user)
-        token, created = Token.objects.get_or_create(user=user)
+        # Pakai token yang masih berlaku, atau buat token baru
+        token = AuthToken.objects.filter(user=user, expires_at__gt=timezone.now()).order_by('-expires_at').first()
+        if token is None:
+            token = AuthToken.objects.create(user=user)
 
         if user.is_authors:
             message = 'You are logged in as author'
@@ -798,10 +1113,14 @@ class LoginView(GenericAPIView):
 
         profile = Profile.objects.get(user=user)
         profile_serializer = ProfileSerializer(profile)
+        # request berikutnya dengan token ini tidak perlu query autentikasi
+        user.user_profile = profile
+        token_cache.set(token.key, user, token)
 
         return JsonResponse({
             'data': {
                 'token': token.key,
+                'expires_at': token.expires_at,
                 'id': user.id,
                 'username': user.username,
                 'first_name': user.first_name,
@@ -818,15 +1137,35 @@ class LoginView(GenericAPIView):
         })
 
 # USER LOGOUT
-@authentication_classes([])
 @permission_classes([AllowAny])
 class LogoutView(APIView):
-    authentication_classes = (TokenAuthentication, )
+    authentication_classes = (CachedTokenAuthentication, )
 
     def post(self, request):
+        # Token dihapus (bukan hanya logout session), cache token ikut dihapus lewat signal
+        if request.auth is not None:
+            request.auth.delete()
         django_logout(request)
         return JsonResponse({'message' : 'You have beenn logout...'})
 
+# ROTASI TOKEN: token lama langsung tidak berlaku, token baru dengan masa berlaku penuh
+class RotateTokenView(APIView):
+    authentication_classes = (CachedTokenAuthentication, )
+    permission_classes = (IsAuthenticated, )
+
+    def post(self, request):
+        with transaction.atomic():
+            request.auth.delete()
+            token = AuthToken.objects.create(user_id=request.user.pk)
+        return JsonResponse({
+            'data': {
+                'token': token.key,
+                'expires_at': token.expires_at,
+            },
+            'status': 200,
+            'message': 'Token has been rotated...'
+        })
+
 # USER REGISTRATION
 @authentication_classes([])
 @permission_classes([AllowAny])
@@ -41,7 +41,6 @@ INSTALLED_APPS = [
     "movie_app",
     "api",
     "rest_framework",
-    "rest_framework.authtoken",
     # "django_extensions"
 ]
 
@@ -108,19 +107,75 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Hasher pertama dipakai untuk password baru; hash lama (hasher lain atau iterasi lain)
+# diganti otomatis saat login berhasil. PASSWORD_PBKDF2_ITERATIONS (biaya CPU per login)
+# tidak diisi: dipakai default Django. Menurunkannya berarti semua hash diturunkan saat login.
+PASSWORD_HASHERS = [
+    "movie_app.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+# PASSWORD_PBKDF2_ITERATIONS = 1000000
+
 REST_FRAMEWORK = {
+    # Hanya token; GET katalog tanpa autentikasi lewat profil per view
+    # (api/authentication.py)
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
-        'rest_framework.authentication.BasicAuthentication',
-        'rest_framework.authentication.SessionAuthentication',
+        'api.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
-    ]
+    ],
+    # IP klien = REMOTE_ADDR; X-Forwarded-For dari klien diabaikan. Di belakang reverse
+    # proxy isi dengan jumlah proxy di depan aplikasi.
+    'NUM_PROXIES': 0,
+    # Percobaan login per IP / per username (api/throttling.py)
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '30/min',
+        'login_username': '10/min',
+    },
+}
+
+# Ukuran halaman default list endpoint (keyset pagination di api/pagination.py)
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 500
+# Jumlah baris per fetch saat streaming export (/api/film/export, /api/rating/export)
+API_STREAM_CHUNK_SIZE = 500
+# Jumlah item maksimum per request bulk (/api/<resource>/bulk)
+API_BULK_MAX_ITEMS = 50000
+
+# Cache payload detail endpoint (api/cache.py). Ganti BACKEND ke
+# "django.core.cache.backends.filebased.FileBasedCache" dengan LOCATION berupa folder
+# bila cache perlu dipakai bersama oleh beberapa worker.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "api": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "api-detail",
+        "TIMEOUT": 60 * 60,
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+    "throttle": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "api-throttle",
+        "OPTIONS": {"MAX_ENTRIES": 100000},
+    },
 }
+API_CACHE_ALIAS = "api"
+API_THROTTLE_CACHE_ALIAS = "throttle"
+# Cache token -> user/profil di memori proses (api/authentication.py); perubahan dari
+# proses lain baru terlihat setelah TTL (detik)
+API_TOKEN_CACHE_TTL = 60
+API_TOKEN_CACHE_MAX_ENTRIES = 10000
+# Masa berlaku token API (detik); token kedaluwarsa dihapus dengan `manage.py purge_tokens`
+API_TOKEN_TTL = 60 * 60 * 24 * 7
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -144,6 +199,21 @@ STATIC_ROOT = '/home/cvpagias/tim6.cv4pagia.site/static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = '/home/cvpagias/tim6_metadatafilm/media/'
 # MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Cache-Control max-age untuk media yang namanya bukan hash isi (nama hash: immutable, 1 tahun)
+MEDIA_CACHE_MAX_AGE = 3600
+# Bila diisi (mis. '/protected-media/'), file media dikirim nginx lewat X-Accel-Redirect
+MEDIA_ACCEL_REDIRECT = None
+# Thread pool untuk membuat turunan thumbnail (small/medium/large + WebP) di luar request
+IMAGE_WORKERS = 2
+IMAGE_DERIVATIVES_ASYNC = True
+# File media yang baru dipakai ulang (upload dengan isi sama) tidak dihapus release()
+# selama sekian detik; dicatat di PendingMediaRelease dan dicek lagi setelahnya
+# (command release_pending_media menyapu sisa yang tertunda). File kunci per media
+# (flock) ada di MEDIA_LOCK_DIR (default: <tempdir>/movie-media-locks).
+MEDIA_RELEASE_GRACE = 300
+# Upload selalu ditulis ke file sementara (bukan ditampung di memori), jadi memori tetap
+# kecil walau banyak film dibuat bersamaan
+FILE_UPLOAD_HANDLERS = ["django.core.files.uploadhandler.TemporaryFileUploadHandler"]
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -15,7 +15,9 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+import re
+
+from django.urls import path, include, re_path
 from movie_app import views
 from django.conf import settings
 from django.conf.urls.static import static
@@ -23,8 +25,9 @@ from django.conf.urls.static import static
 urlpatterns = [
     path("super-admin/", admin.site.urls),
     path('', include('api.urls', namespace = 'api')),
+    # Media (poster, avatar) dilayani views.serve_media: Range, ETag, Cache-Control
+    re_path(r'^%s(?P<path>.*)$' % re.escape(settings.MEDIA_URL.lstrip('/')), views.serve_media),
 ]
 
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file
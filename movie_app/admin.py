@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.admin.views.main import ChangeList
-from movie_app.models import User, Profile, Aktor, Sutradara, Genre, Negara, Bahasa, Film, Rating
+from movie_app.models import User, Profile, AuthToken, Aktor, Sutradara, Genre, Negara, Bahasa, Film, Rating
 
 # Register your models here.
 class CustomChangeList(ChangeList):
@@ -13,6 +13,12 @@ admin.site.register(Profile)
 admin.site.register(Genre)
 admin.site.register(Rating)
 
+@admin.register(AuthToken)
+class AuthTokenAdmin(admin.ModelAdmin):
+    list_display = ('key', 'user', 'created', 'expires_at',)
+    search_fields = ('user__username',)
+    raw_id_fields = ('user',)
+
 @admin.register(Film)
 class FilmAdmin(admin.ModelAdmin):
     list_display = ('judul', 'tahun', 'durasi', 'thumbnail',)
@@ -0,0 +1,12 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+# PBKDF2 dengan jumlah iterasi dari settings.PASSWORD_PBKDF2_ITERATIONS (biaya CPU per
+# login). Nama algoritma tetap pbkdf2_sha256, jadi hash lama tetap bisa dicek; hash dengan
+# iterasi berbeda (atau dari hasher lain di PASSWORD_HASHERS) diganti otomatis saat login
+# berhasil lewat must_update().
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_PBKDF2_ITERATIONS', hashers.PBKDF2PasswordHasher.iterations)
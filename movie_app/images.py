@@ -0,0 +1,173 @@
+import hashlib
+import logging
+import posixpath
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from PIL import Image, UnidentifiedImageError
+
+
+logger = logging.getLogger(__name__)
+
+# Batas upload gambar: ukuran file 1 MB, jumlah piksel (anti decompression bomb), format
+MAX_IMAGE_BYTES = 1048576
+MAX_IMAGE_PIXELS = 40000000
+ALLOWED_IMAGE_FORMATS = ('JPEG', 'PNG', 'WEBP', 'GIF')
+
+
+# Validasi murah: ukuran dicek dari atribut size (tanpa membaca file), lalu Pillow hanya
+# membaca header (format + dimensi) tanpa mendekode piksel
+def validate_image(file):
+    if file.size is not None and file.size > MAX_IMAGE_BYTES:
+        raise ValidationError(_('File gambar terlalu besar. Ukuran maksimal adalah 1 MB'))
+    try:
+        file.seek(0)
+        with Image.open(file) as image:
+            image_format, (width, height) = image.format, image.size
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError):
+        raise ValidationError(_('File bukan gambar yang valid.'))
+    finally:
+        file.seek(0)
+    if image_format not in ALLOWED_IMAGE_FORMATS:
+        raise ValidationError(_('Format gambar %s tidak didukung.') % image_format)
+    if width * height > MAX_IMAGE_PIXELS:
+        raise ValidationError(_('Dimensi gambar terlalu besar.'))
+    return image_format, (width, height)
+
+
+# Ukuran kotak maksimum per turunan (rasio poster dipertahankan oleh Image.thumbnail)
+THUMBNAIL_SIZES = (('small', (160, 240)), ('medium', (320, 480)), ('large', (640, 960)))
+DERIVATIVE_FORMATS = (('jpg', 'JPEG'), ('webp', 'WEBP'))
+DERIVATIVE_DIR = 'derivatives'
+
+
+# film_images/0001.jpg -> film_images/derivatives/0001-small.webp
+def derivative_name(name, size, extension):
+    directory, filename = posixpath.split(name)
+    return posixpath.join(directory, DERIVATIVE_DIR, '%s-%s.%s' % (posixpath.splitext(filename)[0], size, extension))
+
+
+def derivative_names(name):
+    return [derivative_name(name, size, extension) for size, _ in THUMBNAIL_SIZES for extension, _ in DERIVATIVE_FORMATS]
+
+
+# Buat semua turunan untuk satu gambar; dilewati bila semuanya sudah ada (kecuali force)
+def generate_derivatives(name, storage = None, force = False):
+    storage = storage or default_storage
+    if not force and all(storage.exists(derivative) for derivative in derivative_names(name)):
+        return False
+
+    with storage.open(name, 'rb') as file:
+        image = Image.open(file)
+        # JPEG langsung didekode pada skala yang cukup untuk ukuran terbesar (DCT scaling)
+        image.draft('RGB', THUMBNAIL_SIZES[-1][1])
+        image = image.convert('RGB')
+
+    # Dari besar ke kecil: tiap ukuran diperkecil dari hasil sebelumnya, bukan dari original
+    for size, box in reversed(THUMBNAIL_SIZES):
+        image.thumbnail(box, Image.LANCZOS)
+        for extension, image_format in DERIVATIVE_FORMATS:
+            buffer = BytesIO()
+            image.save(buffer, image_format, quality = 80)
+            save_exact(storage, derivative_name(name, size, extension), ContentFile(buffer.getvalue()))
+    return True
+
+
+# Simpan dengan nama persis (menimpa file lama); ContentAddressedStorage.save akan mengganti
+# nama file menjadi hash isinya, jadi dipakai save_exact bila tersedia
+def save_exact(storage, name, content):
+    if storage.exists(name):
+        storage.delete(name)
+    return getattr(storage, 'save_exact', storage.save)(name, content)
+
+
+AVATAR_SIZE = (200, 200)
+DEFAULT_AVATAR = 'profile_images/person.png'
+
+
+# Perkecil avatar profil ke maksimal 200x200. Hash file disimpan di Profile.avatar_hash,
+# jadi avatar yang isinya tidak berubah tidak didekode ulang.
+def process_avatar(profile_id):
+    Profile = apps.get_model('movie_app', 'Profile')
+    profile = Profile.objects.filter(pk = profile_id).only('avatar', 'avatar_hash').first()
+    if not profile or not profile.avatar or profile.avatar.name == DEFAULT_AVATAR:
+        return False
+    storage = profile.avatar.storage
+    original = name = profile.avatar.name
+    with storage.open(name, 'rb') as file:
+        content = file.read()
+    digest = hashlib.sha256(content).hexdigest()
+    if digest == profile.avatar_hash:
+        return False
+
+    image = Image.open(BytesIO(content))
+    image_format = image.format or 'PNG'
+    if image.width > AVATAR_SIZE[0] or image.height > AVATAR_SIZE[1]:
+        # JPEG didekode langsung pada skala mendekati 200x200
+        image.draft('RGB', AVATAR_SIZE)
+        image.thumbnail(AVATAR_SIZE, Image.LANCZOS)
+        if image_format == 'JPEG' and image.mode != 'RGB':
+            image = image.convert('RGB')
+        buffer = BytesIO()
+        image.save(buffer, image_format, quality = 85)
+        content = buffer.getvalue()
+        digest = hashlib.sha256(content).hexdigest()
+        # file asli bisa dipakai profil lain, jadi tidak ditimpa; hasil resize disimpan sebagai file baru
+        name = storage.save(name, ContentFile(content))
+
+    # Filter avatar lama: kalau avatar sudah diganti lagi selama proses, baris tidak ditimpa
+    Profile.objects.filter(pk = profile_id, avatar = original).update(avatar = name, avatar_hash = digest)
+    if name != original:
+        from movie_app.storage import release
+        release([original], storage)
+    return True
+
+
+def run_safely(func, *args):
+    try:
+        return func(*args)
+    except Exception:
+        logger.exception('Background image task %s%r failed', func.__name__, args)
+        return None
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers = getattr(settings, 'IMAGE_WORKERS', 2), thread_name_prefix = 'images')
+        return _executor
+
+
+# Dijalankan setelah commit, di thread pool (atau langsung bila IMAGE_DERIVATIVES_ASYNC = False),
+# jadi upload/import/update profil tidak menunggu proses resize
+def run_after_commit(func, *args):
+    def submit():
+        if getattr(settings, 'IMAGE_DERIVATIVES_ASYNC', True):
+            get_executor().submit(run_safely, func, *args)
+        else:
+            run_safely(func, *args)
+
+    transaction.on_commit(submit)
+
+
+def schedule_derivatives(names, storage = None):
+    for name in dict.fromkeys(names):
+        if name:
+            run_after_commit(generate_derivatives, name, storage)
+
+
+def schedule_avatar(profile_id):
+    run_after_commit(process_avatar, profile_id)
@@ -0,0 +1,60 @@
+import base64
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.authentication import BasicAuthentication, SessionAuthentication, TokenAuthentication
+from rest_framework.test import APIRequestFactory
+from api.authentication import CachedTokenAuthentication, token_cache
+from api.views import GenreListAPiView
+from movie_app.models import AuthToken, User
+
+
+class UncachedTokenAuthentication(TokenAuthentication):
+    model = AuthToken
+
+
+# Autentikator default sebelum profil per view
+LEGACY_AUTHENTICATION = [UncachedTokenAuthentication, BasicAuthentication, SessionAuthentication]
+
+
+class Command(BaseCommand):
+    help = 'Ukur waktu CPU per request GET /api/genre untuk tiap cara autentikasi (data benchmark di-rollback).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type = int, default = 100)
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        count = options['requests']
+        with transaction.atomic():
+            username = 'benchmark-%s' % uuid.uuid4().hex[:12]
+            password = uuid.uuid4().hex
+            user = User.objects.create_user(username, password = password)
+            token = AuthToken.objects.create(user = user)
+            basic = 'Basic ' + base64.b64encode(('%s:%s' % (username, password)).encode()).decode()
+
+            scenarios = [
+                ('basic, default lama', GenreListAPiView.as_view(auth_profiles = {}, default_auth_profile = None, authentication_classes = LEGACY_AUTHENTICATION), basic),
+                ('token, tanpa cache', GenreListAPiView.as_view(auth_profiles = {}, default_auth_profile = None, authentication_classes = [UncachedTokenAuthentication]), 'Token ' + token.key),
+                ('token, cached', GenreListAPiView.as_view(auth_profiles = {}, default_auth_profile = None, authentication_classes = [CachedTokenAuthentication]), 'Token ' + token.key),
+                ('public GET', GenreListAPiView.as_view(), None),
+            ]
+            results = []
+            for name, view, header in scenarios:
+                token_cache.clear()
+                headers = {'HTTP_AUTHORIZATION': header} if header else {}
+                # request pertama (cache token, koneksi) tidak dihitung
+                view(factory.get('/api/genre', **headers))
+                cpu, wall = time.process_time(), time.perf_counter()
+                for _ in range(count):
+                    response = view(factory.get('/api/genre', **headers))
+                    if response.status_code != 200:
+                        raise RuntimeError('%s: HTTP %d' % (name, response.status_code))
+                results.append((name, (time.process_time() - cpu) * 1000 / count, (time.perf_counter() - wall) * 1000 / count))
+            transaction.set_rollback(True)
+
+        baseline = results[0][1]
+        for name, cpu, wall in results:
+            self.stdout.write('%-22s %8.2f ms CPU  %8.2f ms wall  (%.2f ms CPU saved)' % (name, cpu, wall, baseline - cpu))
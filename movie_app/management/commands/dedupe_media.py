@@ -0,0 +1,44 @@
+from django.core.files import File
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from movie_app.images import schedule_derivatives
+from movie_app.models import Film
+from movie_app.storage import media_fields, media_storage, release
+from movie_app.utils import chunked
+from api.cache import invalidate_details
+
+
+class Command(BaseCommand):
+    help = 'Pindahkan thumbnail film dan avatar lama ke nama berbasis hash isi, lalu hapus file duplikat.'
+
+    def handle(self, *args, **options):
+        moved = missing = deleted = 0
+        for model, field in media_fields():
+            names = (
+                model.objects.exclude(**{field.name: ''}).exclude(**{field.name + '__isnull': True})
+                .exclude(**{field.name: field.default}).order_by().values_list(field.name, flat = True).distinct()
+            )
+            for name in list(names):
+                if not media_storage.exists(name):
+                    missing += 1
+                    continue
+                # save() memberi nama hash; bila file dengan isi sama sudah ada, file itu yang dipakai
+                with media_storage.open(name, 'rb') as file:
+                    target = media_storage.save(name, File(file, name = name))
+                if target == name:
+                    continue
+
+                with transaction.atomic():
+                    ids = list(model.objects.filter(**{field.name: name}).values_list('pk', flat = True))
+                    for chunk in chunked(ids):
+                        model.objects.filter(pk__in = chunk).update(**{field.name: target, 'last_modified': timezone.now()})
+                if model is Film:
+                    invalidate_details(Film, ids)
+                    schedule_derivatives([target], media_storage)
+                deleted += len(release([name]))
+                moved += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            '%d files renamed to content hashes, %d old files deleted, %d missing files.' % (moved, deleted, missing)
+        ))
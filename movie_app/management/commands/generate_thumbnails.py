@@ -0,0 +1,28 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from movie_app.images import generate_derivatives, run_safely
+from movie_app.models import Film
+
+
+class Command(BaseCommand):
+    help = 'Buat turunan thumbnail (small/medium/large + WebP) untuk gambar film yang sudah ada.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type = int, default = 4)
+        parser.add_argument('--force', action = 'store_true', help = 'buat ulang walaupun turunan sudah ada')
+
+    def handle(self, *args, **options):
+        storage = Film._meta.get_field('thumbnail').storage
+        names = list(Film.objects.exclude(thumbnail = '').exclude(thumbnail = None).order_by().values_list('thumbnail', flat = True).distinct())
+        existing = [name for name in names if storage.exists(name)]
+        missing = len(names) - len(existing)
+
+        with ThreadPoolExecutor(max_workers = options['workers']) as executor:
+            results = list(executor.map(lambda name: run_safely(generate_derivatives, name, storage, options['force']), existing))
+
+        self.stdout.write(self.style.SUCCESS(
+            '%d images processed, %d already up to date, %d failed, %d missing files.' % (
+                results.count(True), results.count(False), results.count(None), missing,
+            )
+        ))
@@ -0,0 +1,166 @@
+import csv
+import os
+
+from django.core.files import File
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+from movie_app import search
+from movie_app.images import schedule_derivatives
+from movie_app.models import Film
+from movie_app.scraper import Scraper, read_lines
+from movie_app.storage import media_storage, release_after_commit
+from movie_app.utils import chunked
+from api.cache import invalidate_details
+
+
+DEFAULT_THUMBNAIL = Film._meta.get_field('thumbnail').default
+POSTER_DIR = 'film_images'
+
+
+class Command(BaseCommand):
+    help = 'Unduh poster dari file_urls.txt dan pasang ke Film.thumbnail berdasarkan judul di file_titles.txt.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', default = os.path.join('other', 'tools', 'file_titles.txt'))
+        parser.add_argument('--urls', default = os.path.join('other', 'tools', 'file_urls.txt'))
+        parser.add_argument('--download-dir', help = 'folder unduhan sementara + checkpoint (default: <folder urls>/downloads)')
+        parser.add_argument('--workers', type = int, default = 8)
+        parser.add_argument('--per-host', type = int, default = 4)
+        parser.add_argument('--batch-size', type = int, default = 500)
+        parser.add_argument(
+            '--create-missing', metavar = 'METADATA',
+            help = 'CSV judul,tahun,durasi,deskripsi[,status]: buat Film baru untuk judul yang belum ada dan punya metadata lengkap',
+        )
+        parser.add_argument('--overwrite', action = 'store_true', help = 'ganti juga thumbnail yang bukan gambar default')
+
+    def handle(self, *args, **options):
+        titles = read_lines(options['titles'])
+        urls = read_lines(options['urls'])
+        if len(titles) != len(urls):
+            raise CommandError('%s has %d lines but %s has %d.' % (options['titles'], len(titles), options['urls'], len(urls)))
+        self.titles = dict(zip(urls, titles))
+        self.options = options
+        self.metadata = self.read_metadata(options['create_missing']) if options['create_missing'] else {}
+        self.posters = {}
+        self.matched = self.created = self.updated = 0
+
+        download_dir = options['download_dir'] or os.path.join(os.path.dirname(os.path.abspath(options['urls'])), 'downloads')
+        scraper = Scraper(
+            download_dir,
+            checkpoint = os.path.join(download_dir, 'import.checkpoint'),
+            workers = options['workers'],
+            per_host = options['per_host'],
+            known_dirs = [media_storage.path(POSTER_DIR)],
+        )
+
+        # Hasil unduhan diproses per batch: satu transaksi per batch, bukan satu save() per film
+        batch = []
+        try:
+            for result in scraper.run(urls):
+                if result.status in ('downloaded', 'duplicate') and result.path:
+                    batch.append(result)
+                elif result.status == 'failed':
+                    self.stderr.write('%s: %s' % (result.url, result.error))
+                if len(batch) >= options['batch_size']:
+                    self.import_batch(batch)
+                    batch = []
+            if batch:
+                self.import_batch(batch)
+        finally:
+            scraper.close()
+
+        self.stdout.write(scraper.stats.summary())
+        self.stdout.write(self.style.SUCCESS(
+            '%d titles matched, %d films updated, %d films created.' % (self.matched, self.updated, self.created)
+        ))
+
+    # Film baru hanya dibuat dari metadata asli yang lolos validasi model (tanpa film
+    # placeholder tahun 0/durasi 0 di katalog publik); baris yang tidak valid dilewati.
+    def read_metadata(self, path):
+        try:
+            with open(path, newline = '', encoding = 'utf-8') as file:
+                rows = list(csv.DictReader(file))
+        except OSError as e:
+            raise CommandError(str(e))
+        metadata = {}
+        for number, row in enumerate(rows, 2):
+            film = Film(
+                judul = (row.get('judul') or '').strip(),
+                tahun = (row.get('tahun') or '').strip() or None,
+                durasi = (row.get('durasi') or '').strip() or None,
+                deskripsi = (row.get('deskripsi') or '').strip(),
+                status = (row.get('status') or '').strip() or 'Released',
+            )
+            try:
+                film.full_clean(exclude = ['thumbnail'])
+            except ValidationError as e:
+                self.stderr.write('%s line %d skipped: %s' % (path, number, '; '.join(
+                    '%s: %s' % (field, ' '.join(errors)) for field, errors in e.message_dict.items()
+                )))
+                continue
+            metadata[film.judul.lower()] = film
+        return metadata
+
+    # Simpan gambar ke media/film_images (nama = hash isi); gambar yang sudah ada di sana dipakai ulang
+    def store_poster(self, result):
+        if result.sha256 in self.posters:
+            return self.posters[result.sha256]
+        media_root = os.path.abspath(media_storage.location)
+        path = os.path.abspath(result.path)
+        if path.startswith(media_root + os.sep):
+            name = os.path.relpath(path, media_root).replace(os.sep, '/')
+        else:
+            with open(path, 'rb') as file:
+                name = media_storage.save('%s/%s' % (POSTER_DIR, os.path.basename(path)), File(file))
+        self.posters[result.sha256] = name
+        return name
+
+    def import_batch(self, results):
+        posters = {}
+        for result in results:
+            posters[self.titles[result.url].lower()] = self.store_poster(result)
+
+        films = {}
+        for chunk in chunked(list(posters)):
+            for film in Film.objects.annotate(judul_lower = Lower('judul')).filter(judul_lower__in = chunk).only('id', 'judul', 'thumbnail'):
+                films.setdefault(film.judul_lower, []).append(film)
+        self.matched += len(films)
+
+        now = timezone.now()
+        updates, replaced = [], []
+        for key, matches in films.items():
+            for film in matches:
+                if film.thumbnail.name == posters[key]:
+                    continue
+                if not self.options['overwrite'] and film.thumbnail.name not in ('', None, DEFAULT_THUMBNAIL):
+                    continue
+                replaced.append(film.thumbnail.name)
+                film.thumbnail = posters[key]
+                film.last_modified = now
+                updates.append(film)
+
+        creates = []
+        for key, name in posters.items():
+            if key in films:
+                continue
+            if key not in self.metadata:
+                if self.options['create_missing']:
+                    self.stderr.write('%s: no metadata, film not created' % key)
+                continue
+            film = self.metadata.pop(key)
+            film.thumbnail = name
+            creates.append(film)
+
+        with transaction.atomic():
+            Film.objects.bulk_update(updates, ['thumbnail', 'last_modified'], batch_size = 500)
+            Film.objects.bulk_create(creates, batch_size = 500)
+            # bulk_create/bulk_update tidak mengirim signal post_save
+            search.index_films([film.pk for film in creates if film.pk])
+            transaction.on_commit(lambda: invalidate_details(Film, [film.pk for film in updates]))
+            schedule_derivatives(posters.values(), media_storage)
+            release_after_commit(replaced)
+        self.updated += len(updates)
+        self.created += len(creates)
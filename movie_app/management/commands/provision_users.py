@@ -0,0 +1,105 @@
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from movie_app.models import User, Profile
+from movie_app.utils import chunked
+
+
+TRUE_VALUES = ('1', 'true', 'yes', 'y', 'ya')
+
+
+def parse_bool(value, default = False):
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in TRUE_VALUES
+
+
+def existing_values(field, values):
+    found = set()
+    for chunk in chunked(list(values)):
+        found.update(User.objects.filter(**{field + '__in': chunk}).values_list(field, flat = True))
+    return found
+
+
+# Impor akun dari sistem lama (CSV: username,email,password,first_name,last_name,
+# is_authors,is_visitors,is_active). Hash password (PBKDF2, mahal) dihitung paralel di
+# process pool; user dan profil dibuat per batch dengan bulk_create dalam satu transaksi.
+class Command(BaseCommand):
+    help = 'Buat user dan profil secara massal dari file CSV (migrasi akun dari sistem lama).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', help = 'file CSV dengan header')
+        parser.add_argument('--batch-size', type = int, default = 1000)
+        parser.add_argument('--workers', type = int, default = os.cpu_count() or 1, help = 'jumlah proses untuk hash password')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['file'], newline = '', encoding = 'utf-8') as file:
+                rows = list(csv.DictReader(file))
+        except OSError as error:
+            raise CommandError(str(error))
+
+        invalid = skipped = created = 0
+        accounts = {}
+        emails = set()
+        for row in rows:
+            username = (row.get('username') or '').strip()
+            email = (row.get('email') or '').strip()
+            if not username or not row.get('password'):
+                invalid += 1
+                continue
+            # username/email kembar di dalam file: baris pertama yang dipakai
+            if username in accounts or (email and email in emails):
+                skipped += 1
+                continue
+            accounts[username] = row
+            if email:
+                emails.add(email)
+
+        # sama seperti registrasi: username dan email harus belum dipakai
+        taken_usernames = existing_values('username', accounts)
+        taken_emails = existing_values('email', {(row.get('email') or '').strip() for row in accounts.values()} - {''})
+        for username in list(accounts):
+            email = (accounts[username].get('email') or '').strip()
+            if username in taken_usernames or (email and email in taken_emails):
+                del accounts[username]
+                skipped += 1
+
+        rows = list(accounts.values())
+        with ProcessPoolExecutor(max_workers = max(options['workers'], 1), initializer = django.setup) as executor:
+            for batch in chunked(rows, options['batch_size']):
+                passwords = executor.map(make_password, [row['password'] for row in batch], chunksize = 16)
+                users = [
+                    User(
+                        username = row['username'].strip(),
+                        email = (row.get('email') or '').strip(),
+                        password = password,
+                        first_name = (row.get('first_name') or '').strip(),
+                        last_name = (row.get('last_name') or '').strip(),
+                        is_authors = parse_bool(row.get('is_authors')),
+                        is_visitors = parse_bool(row.get('is_visitors')),
+                        is_active = parse_bool(row.get('is_active'), default = True),
+                    )
+                    for row, password in zip(batch, passwords)
+                ]
+                with transaction.atomic():
+                    User.objects.bulk_create(users, batch_size = 500)
+                    if any(user.pk is None for user in users):
+                        # backend tanpa RETURNING pada bulk insert
+                        ids = {}
+                        for chunk in chunked([user.username for user in users]):
+                            ids.update(User.objects.filter(username__in = chunk).values_list('username', 'pk'))
+                        for user in users:
+                            user.pk = ids[user.username]
+                    Profile.objects.bulk_create([Profile(user = user, user_create = user) for user in users], batch_size = 500)
+                created += len(users)
+                self.stdout.write('%d/%d users created' % (created, len(rows)))
+
+        self.stdout.write(self.style.SUCCESS(
+            '%d users created, %d skipped (existing or duplicate), %d invalid rows.' % (created, skipped, invalid)
+        ))
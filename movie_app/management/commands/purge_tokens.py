@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from movie_app.models import AuthToken
+
+
+class Command(BaseCommand):
+    help = 'Hapus token API yang sudah kedaluwarsa, per batch supaya tidak mengunci tabel lama.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type = int, default = 500)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        deleted = 0
+        while True:
+            keys = list(AuthToken.objects.filter(expires_at__lte = now).values_list('pk', flat = True)[:options['batch_size']])
+            if not keys:
+                break
+            deleted += AuthToken.objects.filter(pk__in = keys).delete()[0]
+        self.stdout.write(self.style.SUCCESS('%d expired token(s) deleted.' % deleted))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from movie_app import search
+
+
+class Command(BaseCommand):
+    help = 'Bangun ulang index pencarian full-text (FTS5) untuk semua film.'
+
+    def handle(self, *args, **options):
+        if not search.fts_enabled():
+            raise CommandError('Full-text search table %s is not available on this database.' % search.FTS_TABLE)
+        with transaction.atomic():
+            search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS('Film search index rebuilt.'))
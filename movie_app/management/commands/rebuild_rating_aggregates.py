@@ -0,0 +1,44 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from movie_app.models import Film, Rating
+from movie_app.utils import chunked
+from api.cache import invalidate_details
+
+
+# Hanya film yang agregatnya berbeda yang di-update (dan last_modified-nya dinaikkan,
+# seperti Film.update_rating_aggregate), supaya ETag dan cache detail film itu ikut berganti.
+# Mengembalikan id film yang diperbaiki.
+def rebuild_rating_aggregates(films = None):
+    films = Film.objects.all() if films is None else films
+    ratings = Rating.objects.filter(film = OuterRef('pk')).order_by().values('film')
+    rating_count = Coalesce(Subquery(ratings.annotate(total = Count('id')).values('total')), Value(0))
+    rating_sum = Coalesce(
+        Subquery(ratings.annotate(total = Sum('rating')).values('total')),
+        Value(Decimal('0')),
+        output_field = models.DecimalField(max_digits = 12, decimal_places = 1),
+    )
+    changed = list(
+        films.annotate(new_count = rating_count, new_sum = rating_sum)
+        .exclude(rating_count = F('new_count'), rating_sum = F('new_sum'))
+        .values_list('pk', flat = True)
+    )
+    for chunk in chunked(changed):
+        Film.objects.filter(pk__in = chunk).update(
+            rating_count = rating_count, rating_sum = rating_sum, last_modified = timezone.now(),
+        )
+    return changed
+
+
+class Command(BaseCommand):
+    help = 'Hitung ulang Film.rating_count dan Film.rating_sum dari tabel Rating.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            changed = rebuild_rating_aggregates()
+            transaction.on_commit(lambda: invalidate_details(Film, changed))
+        self.stdout.write(self.style.SUCCESS('Rating aggregates corrected for %d film(s).' % len(changed)))
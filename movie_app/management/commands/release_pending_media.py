@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from movie_app.models import PendingMediaRelease
+from movie_app.storage import release
+from movie_app.utils import chunked
+
+
+# Penghapusan yang ditunda release() (MEDIA_RELEASE_GRACE) dan belum sempat dijalankan
+# timer-nya, mis. karena proses di-restart. Jalankan berkala (cron) atau saat deploy.
+class Command(BaseCommand):
+    help = 'Hapus file media yang penghapusannya tertunda dan sudah tidak dirujuk.'
+
+    def handle(self, *args, **options):
+        names = list(PendingMediaRelease.objects.values_list('name', flat = True))
+        deleted = 0
+        for chunk in chunked(names):
+            deleted += len(release(chunk))
+        self.stdout.write(self.style.SUCCESS(
+            '%d file(s) deleted, %d still pending.' % (deleted, PendingMediaRelease.objects.count())
+        ))
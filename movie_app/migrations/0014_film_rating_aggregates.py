@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-18 15:31
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def isi_rating_aggregates(apps, schema_editor):
+    Film = apps.get_model('movie_app', 'Film')
+    Rating = apps.get_model('movie_app', 'Rating')
+    ratings = Rating.objects.filter(film = OuterRef('pk')).order_by().values('film')
+    Film.objects.update(
+        rating_count = Coalesce(Subquery(ratings.annotate(total = Count('id')).values('total')), Value(0)),
+        rating_sum = Coalesce(
+            Subquery(ratings.annotate(total = Sum('rating')).values('total')),
+            Value(Decimal('0')),
+            output_field = models.DecimalField(max_digits = 12, decimal_places = 1),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movie_app', '0013_alter_film_thumbnail_alter_profile_bio'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='film',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='film',
+            name='rating_sum',
+            field=models.DecimalField(decimal_places=1, default=0, editable=False, max_digits=12),
+        ),
+        migrations.RunPython(isi_rating_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-18 15:32
+
+from django.db import migrations, models
+
+
+# Index komposit (relasi_id, film_id) pada through table M2M, untuk filter/lookup film per relasi.
+# Through table dibuat otomatis oleh Django, jadi indexnya ditambahkan lewat RunSQL.
+THROUGH_INDEXES = [
+    ('movie_app_film_sutradara', 'sutradara_id'),
+    ('movie_app_film_aktor', 'aktor_id'),
+    ('movie_app_film_genre', 'genre_id'),
+    ('movie_app_film_negara', 'negara_id'),
+    ('movie_app_film_bahasa', 'bahasa_id'),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movie_app', '0014_film_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='film',
+            index=models.Index(fields=['tahun'], name='film_tahun_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='film',
+            index=models.Index(fields=['status'], name='film_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='film',
+            index=models.Index(fields=['judul'], name='film_judul_idx'),
+        ),
+    ] + [
+        migrations.RunSQL(
+            'CREATE INDEX %s_lookup_idx ON %s (%s, film_id)' % (table, table, column),
+            'DROP INDEX %s_lookup_idx' % table,
+        )
+        for table, column in THROUGH_INDEXES
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations
+
+
+# FTS5 hanya ada di SQLite; di database lain migration ini dilewati.
+# SQL disalin dari movie_app/search.py agar migration tidak berubah bila modul itu berubah.
+CREATE_FTS_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS movie_app_film_fts USING fts5("
+    "judul, deskripsi, aktor, sutradara, genre, tokenize = 'unicode61 remove_diacritics 2')"
+)
+
+INDEX_FILMS_SQL = """
+    INSERT INTO movie_app_film_fts (rowid, judul, deskripsi, aktor, sutradara, genre)
+    SELECT f.id, f.judul, f.deskripsi,
+        (SELECT group_concat(a.nama_aktor, ' ') FROM movie_app_film_aktor fa
+            JOIN movie_app_aktor a ON a.id = fa.aktor_id WHERE fa.film_id = f.id),
+        (SELECT group_concat(s.nama_sutradara, ' ') FROM movie_app_film_sutradara fs
+            JOIN movie_app_sutradara s ON s.id = fs.sutradara_id WHERE fs.film_id = f.id),
+        (SELECT group_concat(g.genre, ' ') FROM movie_app_film_genre fg
+            JOIN movie_app_genre g ON g.id = fg.genre_id WHERE fg.film_id = f.id)
+    FROM movie_app_film f
+"""
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(CREATE_FTS_SQL)
+    schema_editor.execute(INDEX_FILMS_SQL)
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute('DROP TABLE IF EXISTS movie_app_film_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movie_app', '0015_film_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 15:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movie_app', '0016_film_search_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='avatar_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-18 15:49
+
+import movie_app.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movie_app', '0017_profile_avatar_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='film',
+            name='thumbnail',
+            field=models.ImageField(blank=True, default='film_images/film-default.png', null=True, storage=movie_app.storage.ContentAddressedStorage(), upload_to='film_images/'),
+        ),
+        migrations.AlterField(
+            model_name='profile',
+            name='avatar',
+            field=models.ImageField(blank=True, default='profile_images/person.png', null=True, storage=movie_app.storage.ContentAddressedStorage(), upload_to='profile_images'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2 on 2026-10-18 15:56
+
+import django.db.models.deletion
+from datetime import timedelta
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+# Token lama (rest_framework.authtoken) tetap berlaku sampai API_TOKEN_TTL dari sekarang.
+# Tabelnya dibaca langsung karena app authtoken sudah tidak terpasang (tabel dihapus di 0021).
+def copy_tokens(apps, schema_editor):
+    connection = schema_editor.connection
+    if 'authtoken_token' not in connection.introspection.table_names():
+        return
+    AuthToken = apps.get_model('movie_app', 'AuthToken')
+    expires_at = timezone.now() + timedelta(seconds = getattr(settings, 'API_TOKEN_TTL', 60 * 60 * 24 * 7))
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT %s, %s FROM %s' % tuple(map(connection.ops.quote_name, ('key', 'user_id', 'authtoken_token'))))
+        rows = cursor.fetchall()
+    AuthToken.objects.bulk_create(
+        [AuthToken(key = key, user_id = user_id, expires_at = expires_at) for key, user_id in rows],
+        batch_size = 500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movie_app', '0018_content_addressed_media'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthToken',
+            fields=[
+                ('key', models.CharField(max_length=40, primary_key=True, serialize=False)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='auth_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(copy_tokens, migrations.RunPython.noop),
+    ]
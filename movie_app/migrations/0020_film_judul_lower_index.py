@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-18 16:13
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movie_app', '0019_auth_token'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='film',
+            name='film_judul_idx',
+        ),
+        migrations.AddIndex(
+            model_name='film',
+            index=models.Index(django.db.models.functions.text.Lower('judul'), name='film_judul_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+# Semua token lama sudah disalin ke AuthToken (0019) dan app rest_framework.authtoken
+# dilepas dari INSTALLED_APPS, jadi tabelnya tidak dipakai lagi
+def drop_legacy_tokens(apps, schema_editor):
+    if 'authtoken_token' in schema_editor.connection.introspection.table_names():
+        schema_editor.execute('DROP TABLE %s' % schema_editor.quote_name('authtoken_token'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movie_app', '0020_film_judul_lower_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_legacy_tokens, migrations.RunPython.noop),
+    ]
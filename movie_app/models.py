@@ -1,9 +1,18 @@
-from django.db import models
+import binascii
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
-from django.utils.translation import gettext_lazy as _
-from PIL import Image
+from django.utils import timezone
+from decimal import Decimal
+from movie_app.images import DEFAULT_AVATAR, schedule_avatar, validate_image
+from movie_app.storage import media_storage, release_after_commit
 
 # Create your models here.
 class User(AbstractUser):
@@ -20,8 +29,10 @@ class Profile(models.Model):
     )
     user = models.OneToOneField(User, related_name = 'user_profile', on_delete= models.PROTECT)
     birth = models.DateField(blank = True, null=True, default=None)
-    avatar = models.ImageField(default= 'profile_images/person.png', upload_to= 'profile_images', blank = True, null= True)
+    avatar = models.ImageField(default= 'profile_images/person.png', upload_to= 'profile_images', storage = media_storage, blank = True, null= True)
     bio = models.TextField(blank = True, null=True, default=None)
+    # sha256 avatar yang sudah diproses (lihat movie_app/images.py)
+    avatar_hash = models.CharField(max_length = 64, blank = True, default = '', editable = False)
     status = models.CharField(max_length = 15, choices= status_choices, default = 'Aktif')
     user_create = models.ForeignKey(User, related_name= 'user_create_profile', blank = True, null = True, on_delete = models.SET_NULL)
     user_update = models.ForeignKey(User, related_name= 'user_update_profile', blank = True, null = True, on_delete = models.SET_NULL)
@@ -31,54 +42,119 @@ class Profile(models.Model):
     def __str__(self):
         return str(self.user.first_name + ' ' + str(self.user.last_name))
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_avatar = instance.__dict__.get('avatar')
+        return instance
+
+    # Resize avatar dijalankan di background setelah commit, hanya bila file avatar berganti;
+    # file lama dilepas (dihapus bila tidak dipakai profil lain)
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        previous = getattr(self, '_loaded_avatar', None)
+        if self.avatar.name != previous:
+            # avatar default tidak perlu diproses (mis. profil baru saat registrasi)
+            if self.avatar and self.avatar.name != DEFAULT_AVATAR:
+                schedule_avatar(self.pk)
+            release_after_commit([previous])
+            self._loaded_avatar = self.avatar.name
+
+# Token API yang kedaluwarsa (pengganti rest_framework.authtoken Token). Satu user bisa
+# punya beberapa token (tiap perangkat); logout menghapus token, rotate mengganti token,
+# dan token kedaluwarsa dibersihkan oleh command purge_tokens.
+class AuthToken(models.Model):
+    key = models.CharField(max_length = 40, primary_key = True)
+    user = models.ForeignKey(User, related_name = 'auth_tokens', on_delete = models.CASCADE)
+    created = models.DateTimeField(auto_now_add = True)
+    expires_at = models.DateTimeField(db_index = True)
+
+    def __str__(self):
+        return self.key
+
+    @staticmethod
+    def generate_key():
+        return binascii.hexlify(os.urandom(20)).decode()
+
+    @staticmethod
+    def default_expiry():
+        return timezone.now() + timedelta(seconds = getattr(settings, 'API_TOKEN_TTL', 60 * 60 * 24 * 7))
+
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
     def save(self, *args, **kwargs):
-        super().save()
-        try:
-            img = Image.open(self.avatar_path)
-            if img.height > 200 or img.width > 200:
-                new_img = (200, 200)
-                img.thumbnail(new_img)
-                img.save(self.avatar.path)
-        except:
-            pass
+        if not self.key:
+            self.key = self.generate_key()
+        if not self.expires_at:
+            self.expires_at = self.default_expiry()
+        super().save(*args, **kwargs)
+
+# File media yang penghapusannya ditunda oleh release() (baru dipakai ulang, lihat
+# movie_app/storage.py). Dicatat di database supaya tidak hilang saat proses berhenti;
+# disapu oleh command release_pending_media.
+class PendingMediaRelease(models.Model):
+    name = models.CharField(max_length = 255, unique = True)
+    created_on = models.DateTimeField(auto_now_add = True)
+
+    def __str__(self):
+        return self.name
 
 class Aktor(models.Model):
     nama_aktor = models.CharField(max_length = 255)
+    # versi entri cache detail dan validator ETag (api/cache.py, api/conditional.py)
+    last_modified = models.DateTimeField(auto_now = True)
 
     def __str__(self):
         return self.nama_aktor
 
 class Sutradara(models.Model):
     nama_sutradara = models.CharField(max_length = 255)
+    last_modified = models.DateTimeField(auto_now = True)
 
     def __str__(self):
         return self.nama_sutradara
     
 class Genre(models.Model):
     genre = models.CharField(max_length = 255)
+    last_modified = models.DateTimeField(auto_now = True)
 
     def __str__(self):
         return self.genre
 
 class Negara(models.Model):
     negara = models.CharField(max_length = 255)
+    last_modified = models.DateTimeField(auto_now = True)
 
     def __str__(self):
         return self.negara
 
 class Bahasa(models.Model):
     bahasa = models.CharField(max_length = 100)
+    last_modified = models.DateTimeField(auto_now = True)
 
     def __str__(self):
         return self.bahasa
     
+class FilmQuerySet(models.QuerySet):
+    # Prefetch kelima relasi M2M dalam satu batch,
+    # supaya list film tidak menjalankan query per baris (N+1).
+    def with_relations(self):
+        return self.prefetch_related('sutradara', 'aktor', 'genre', 'negara', 'bahasa')
+
+    # Tandai film berubah tanpa save() (mis. relasi atau rating berubah),
+    # agar last_modified tetap bisa dipakai sebagai validator ETag/Last-Modified.
+    def touch(self):
+        return self.update(last_modified = timezone.now())
+
 class Film(models.Model):
     status_film = (
         ('Released', 'Released'),
         ('Upcoming', 'Upcoming'),
     )
     judul = models.CharField(max_length= 255)
-    thumbnail = models.ImageField(default= 'film_images/film-default.png', upload_to= 'film_images/', blank = True, null= True)
+    thumbnail = models.ImageField(default= 'film_images/film-default.png', upload_to= 'film_images/', storage = media_storage, blank = True, null= True)
     status = models.CharField(max_length = 15, choices = status_film, default = 'Released')
     tahun = models.PositiveIntegerField(validators =[MaxValueValidator(9999)])
     deskripsi = models.TextField()
@@ -88,23 +164,59 @@ class Film(models.Model):
     genre = models.ManyToManyField(Genre, related_name = 'genre_film')
     negara = models.ManyToManyField(Negara, related_name = 'negara_film')
     bahasa = models.ManyToManyField(Bahasa, related_name = 'bahasa_film')
+    # Agregat rating yang didenormalisasi, diperbarui oleh Rating.save() dan signal post_delete
+    rating_count = models.PositiveIntegerField(default = 0, editable = False)
+    rating_sum = models.DecimalField(max_digits = 12, decimal_places = 1, default = 0, editable = False)
     user_create = models.ForeignKey(User, related_name = 'user_create_film', blank = True, null = True, on_delete = models.SET_NULL)
     user_update = models.ForeignKey(User, related_name = 'user_update_film', blank = True, null = True, on_delete = models.SET_NULL)
     created_on = models.DateTimeField(auto_now_add = True)
     last_modified = models.DateTimeField(auto_now = True)
+
+    objects = FilmQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_thumbnail = instance.__dict__.get('thumbnail')
+        return instance
+
+    class Meta:
+        indexes = [
+            models.Index(fields = ['tahun'], name = 'film_tahun_idx'),
+            models.Index(fields = ['status'], name = 'film_status_idx'),
+            # filter judul_prefix (api/filters.py) dan pencocokan judul tanpa beda huruf besar/kecil
+            models.Index(Lower('judul'), name = 'film_judul_lower_idx'),
+        ]
     
     def clean(self):
         super().clean()
 
-        # aturan ukuran gambar maksimum adalah 1 MB (1048576 bytes)
-        if self.thumbnail:
-            img = Image.open(self.thumbnail)
-            if self.thumbnail.size > 1048576:
-                raise ValidationError(_('File gambar terlalu besar. Ukuran maksimal adalah 1 MB'))
+        # aturan ukuran gambar maksimum adalah 1 MB (1048576 bytes); hanya upload baru yang
+        # dicek, file yang sudah tersimpan tidak dibuka ulang
+        if self.thumbnail and not getattr(self.thumbnail, '_committed', True):
+            try:
+                validate_image(self.thumbnail.file)
+            except ValidationError as e:
+                raise ValidationError({'thumbnail': e.messages})
+
+    @property
+    def average_rating(self):
+        if not self.rating_count:
+            return None
+        return round(self.rating_sum / self.rating_count, 1)
 
     def __str__(self):
         return str(self.judul) + ' ' + str(self.status) + ' in ' + str(self.tahun)
 
+    # Ubah agregat rating memakai F() supaya penulis paralel tidak saling menimpa
+    @classmethod
+    def update_rating_aggregate(cls, film_id, count_delta, sum_delta):
+        cls.objects.filter(pk = film_id).update(
+            rating_count = F('rating_count') + count_delta,
+            rating_sum = F('rating_sum') + Decimal(str(sum_delta)),
+            last_modified = timezone.now(),
+        )
+
 class Rating(models.Model):
     user = models.ForeignKey(User, related_name = 'user_reviewed_made_by', on_delete = models.CASCADE)
     film = models.ForeignKey(Film, related_name = 'user_reviewed_film', on_delete = models.CASCADE)
@@ -119,5 +231,20 @@ class Rating(models.Model):
         constraints = [
             models.UniqueConstraint(fields=['user', 'film'], name='nama_pengulas_film_unique')
         ]
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = None
+            if self.pk:
+                previous = Rating.objects.select_for_update().filter(pk = self.pk).values('film_id', 'rating').first()
+            super().save(*args, **kwargs)
+            rating = Decimal(str(self.rating))
+            if previous and previous['film_id'] == self.film_id:
+                Film.update_rating_aggregate(self.film_id, 0, rating - previous['rating'])
+            else:
+                if previous:
+                    Film.update_rating_aggregate(previous['film_id'], -1, -previous['rating'])
+                Film.update_rating_aggregate(self.film_id, 1, rating)
+
     def __str__(self):
         return str(self.user) + ' memberikan rating ' + str(self.rating) + ' untuk film ' + str(self.film)
@@ -0,0 +1,88 @@
+import threading
+import time
+
+from django.db import transaction
+from movie_app.models import Aktor, Sutradara, Genre, Negara, Bahasa
+from movie_app.utils import chunked
+
+
+# Kolom nama untuk tiap model relasi film
+NAME_FIELDS = {Sutradara: 'nama_sutradara', Aktor: 'nama_aktor', Genre: 'genre', Negara: 'negara', Bahasa: 'bahasa'}
+
+
+# Peta nama -> id di memori proses untuk aktor/sutradara/genre/negara/bahasa.
+# Nama yang belum ada di database dibuat sekaligus dengan bulk_create, jadi menulis film
+# dengan 30 pemeran tetap butuh jumlah query yang konstan. Entri kedaluwarsa setelah ttl
+# detik supaya perubahan dari proses lain tetap terlihat; perubahan di proses ini
+# langsung menghapus peta model terkait (lihat movie_app/signals.py).
+class NameResolver:
+    def __init__(self, ttl = 300, max_entries = 100000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    def resolve(self, model, names):
+        field = NAME_FIELDS[model]
+        names = list(dict.fromkeys(name.strip() for name in names if name and name.strip()))
+        found = {}
+        now = time.monotonic()
+        with self.lock:
+            for name in names:
+                entry = self.entries.get((model, name))
+                if entry and entry[1] > now:
+                    found[name] = entry[0]
+
+        missing = [name for name in names if name not in found]
+        # Nama kembar di database: pakai id terkecil
+        for chunk in chunked(missing):
+            rows = model.objects.filter(**{field + '__in': chunk}).order_by('-pk').values_list('pk', field)
+            found.update({name: pk for pk, name in rows})
+
+        created = [model(**{field: name}) for name in missing if name not in found]
+        if created:
+            model.objects.bulk_create(created, batch_size = 500)
+            if any(instance.pk is None for instance in created):
+                # backend tanpa RETURNING pada bulk insert
+                for chunk in chunked([getattr(instance, field) for instance in created]):
+                    rows = model.objects.filter(**{field + '__in': chunk}).order_by('-pk').values_list('pk', field)
+                    found.update({name: pk for pk, name in rows})
+            else:
+                found.update({getattr(instance, field): instance.pk for instance in created})
+
+        # Nama yang baru dibuat baru disimpan ke peta setelah commit, supaya rollback
+        # tidak meninggalkan id yang tidak pernah ada
+        new_names = {getattr(instance, field) for instance in created}
+        self.store(model, {name: pk for name, pk in found.items() if name not in new_names})
+        if new_names:
+            fresh = {name: found[name] for name in new_names}
+            transaction.on_commit(lambda: self.store(model, fresh))
+        return found
+
+    def store(self, model, mapping):
+        expires = time.monotonic() + self.ttl
+        with self.lock:
+            if len(self.entries) + len(mapping) > self.max_entries:
+                self.entries.clear()
+            for name, pk in mapping.items():
+                self.entries[(model, name)] = (pk, expires)
+
+    # Ganti nama pada daftar nilai (campuran id dan nama) dengan id-nya
+    def resolve_values(self, model, value_lists):
+        names = {value for values in value_lists for value in values if isinstance(value, str)}
+        mapping = self.resolve(model, names) if names else {}
+        return [
+            [mapping[value] if isinstance(value, str) else value for value in values]
+            for values in value_lists
+        ]
+
+    def clear(self, model = None):
+        with self.lock:
+            if model is None:
+                self.entries.clear()
+            else:
+                for key in [key for key in self.entries if key[0] is model]:
+                    del self.entries[key]
+
+
+name_resolver = NameResolver()
@@ -0,0 +1,362 @@
+import hashlib
+import http.client
+import json
+import os
+import queue
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+
+
+# Pengunduh poster film dari halaman (mis. thetvdb.com) yang berisi <img class="img-responsive">.
+# Hanya memakai standard library supaya bisa dipakai dari script di other/tools maupun
+# dari management command tanpa dependency tambahan.
+USER_AGENT = 'movie-api-scraper/1.0'
+RETRY_STATUS = (429, 500, 502, 503, 504)
+REDIRECT_STATUS = (301, 302, 303, 307, 308)
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif')
+
+
+class FetchError(Exception):
+    pass
+
+
+class PosterParser(HTMLParser):
+    def __init__(self, css_class = 'img-responsive'):
+        super().__init__()
+        self.css_class = css_class
+        self.src = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag != 'img' or self.src is not None:
+            return
+        attrs = dict(attrs)
+        if self.css_class in (attrs.get('class') or '').split() and attrs.get('src'):
+            self.src = attrs['src']
+
+
+def find_poster_url(html, base_url):
+    parser = PosterParser()
+    parser.feed(html)
+    return urljoin(base_url, parser.src) if parser.src else None
+
+
+# Koneksi keep-alive dipakai ulang per (scheme, host, port), jadi ratusan gambar dari host
+# yang sama tidak membuka koneksi TCP/TLS baru satu per satu
+class ConnectionPool:
+    def __init__(self, timeout = 15, max_idle = 8):
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.lock = threading.Lock()
+        self.idle = {}
+
+    def acquire(self, scheme, netloc):
+        with self.lock:
+            idle = self.idle.setdefault((scheme, netloc), queue.LifoQueue())
+        try:
+            return idle.get_nowait()
+        except queue.Empty:
+            connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            return connection_class(netloc, timeout = self.timeout)
+
+    def release(self, scheme, netloc, connection):
+        idle = self.idle[(scheme, netloc)]
+        if idle.qsize() < self.max_idle:
+            idle.put(connection)
+        else:
+            connection.close()
+
+    def close(self):
+        with self.lock:
+            for idle in self.idle.values():
+                while not idle.empty():
+                    idle.get_nowait().close()
+            self.idle.clear()
+
+
+class Fetcher:
+    def __init__(self, per_host = 4, timeout = 15, retries = 3, backoff = 0.5, max_redirects = 5):
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.max_redirects = max_redirects
+        self.pool = ConnectionPool(timeout = timeout, max_idle = per_host)
+        self.lock = threading.Lock()
+        self.host_limits = {}
+
+    # Batas request paralel per host, supaya satu situs tidak dibanjiri request
+    def host_limit(self, netloc):
+        with self.lock:
+            if netloc not in self.host_limits:
+                self.host_limits[netloc] = threading.BoundedSemaphore(self.per_host)
+            return self.host_limits[netloc]
+
+    def get(self, url):
+        for _ in range(self.max_redirects + 1):
+            status, headers, body = self.get_once(url)
+            if status in REDIRECT_STATUS and headers.get('location'):
+                url = urljoin(url, headers['location'])
+                continue
+            if status >= 400:
+                raise FetchError('%s returned HTTP %s' % (url, status))
+            return url, headers, body
+        raise FetchError('%s: too many redirects' % url)
+
+    def get_once(self, url):
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            with self.host_limit(parts.netloc):
+                connection = self.pool.acquire(parts.scheme, parts.netloc)
+                try:
+                    connection.request('GET', path, headers = {'User-Agent': USER_AGENT, 'Connection': 'keep-alive'})
+                    response = connection.getresponse()
+                    body = response.read()
+                except (OSError, http.client.HTTPException) as e:
+                    # koneksi lama bisa sudah ditutup server; coba lagi dengan koneksi baru
+                    connection.close()
+                    error = e
+                    continue
+                if response.will_close:
+                    connection.close()
+                else:
+                    self.pool.release(parts.scheme, parts.netloc, connection)
+            headers = {key.lower(): value for key, value in response.getheaders()}
+            if response.status in RETRY_STATUS:
+                error = FetchError('%s returned HTTP %s' % (url, response.status))
+                continue
+            return response.status, headers, body
+        raise FetchError('%s: %s' % (url, error))
+
+    def close(self):
+        self.pool.close()
+
+
+# Checkpoint berupa file JSON lines, satu baris per URL yang sudah selesai, ditulis
+# (dan di-flush) begitu item selesai sehingga run yang terputus bisa dilanjutkan
+class Checkpoint:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.records = {}
+        if path and os.path.exists(path):
+            with open(path) as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # baris terakhir bisa terpotong kalau proses mati saat menulis
+                        continue
+                    self.records[record['url']] = record
+        self.file = open(path, 'a') if path else None
+
+    def get(self, url):
+        return self.records.get(url)
+
+    def add(self, record):
+        with self.lock:
+            self.records[record['url']] = record
+            if self.file:
+                self.file.write(json.dumps(record) + '\n')
+                self.file.flush()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+
+
+class ScrapeResult:
+    def __init__(self, index, url, status, image_url = None, path = None, sha256 = None, size = 0, error = None):
+        self.index = index
+        self.url = url
+        self.status = status
+        self.image_url = image_url
+        self.path = path
+        self.sha256 = sha256
+        self.size = size
+        self.error = error
+
+    def as_record(self):
+        return {
+            'index': self.index, 'url': self.url, 'status': self.status, 'image_url': self.image_url,
+            'path': self.path, 'sha256': self.sha256, 'size': self.size,
+        }
+
+    @classmethod
+    def from_record(cls, record):
+        return cls(
+            record['index'], record['url'], record['status'], record.get('image_url'),
+            record.get('path'), record.get('sha256'), record.get('size', 0),
+        )
+
+
+class ScrapeStats:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.finished = None
+        self.downloaded = 0
+        self.duplicates = 0
+        self.resumed = 0
+        self.missing = 0
+        self.failed = 0
+        self.bytes = 0
+
+    def count(self, result, resumed = False):
+        if resumed:
+            self.resumed += 1
+        elif result.status == 'downloaded':
+            self.downloaded += 1
+            self.bytes += result.size
+        elif result.status == 'duplicate':
+            self.duplicates += 1
+            self.bytes += result.size
+        elif result.status == 'missing':
+            self.missing += 1
+        else:
+            self.failed += 1
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.monotonic()) - self.started
+
+    def summary(self):
+        fetched = self.downloaded + self.duplicates + self.missing + self.failed
+        elapsed = max(self.elapsed, 1e-6)
+        return (
+            '%d downloaded, %d duplicate, %d resumed, %d missing, %d failed in %.1fs '
+            '(%.1f pages/s, %.2f MB/s)' % (
+                self.downloaded, self.duplicates, self.resumed, self.missing, self.failed, elapsed,
+                fetched / elapsed, self.bytes / elapsed / 1048576,
+            )
+        )
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def image_extension(image_url, content_type):
+    extension = os.path.splitext(urlsplit(image_url).path)[1].lower()
+    if extension in IMAGE_EXTENSIONS:
+        return '.jpg' if extension == '.jpeg' else extension
+    subtype = (content_type or '').split(';')[0].split('/')[-1].strip()
+    return {'png': '.png', 'webp': '.webp', 'gif': '.gif'}.get(subtype, '.jpg')
+
+
+class Scraper:
+    def __init__(self, output_dir, checkpoint = None, workers = 8, per_host = 4, fetcher = None, known_dirs = ()):
+        self.output_dir = output_dir
+        self.known_dirs = list(known_dirs)
+        os.makedirs(output_dir, exist_ok = True)
+        self.workers = workers
+        self.fetcher = fetcher or Fetcher(per_host = per_host)
+        self.checkpoint = Checkpoint(checkpoint)
+        self.stats = ScrapeStats()
+        self.lock = threading.Lock()
+        # sha256 -> path, hanya untuk file yang sudah selesai ditulis
+        self.hashes = {}
+        # sha256 -> Event untuk gambar yang sedang ditulis thread lain
+        self.writing = {}
+
+    # Hash gambar yang sudah ada di known_dirs, output_dir dan checkpoint; gambar yang
+    # isinya sama tidak ditulis ulang
+    def load_hashes(self):
+        for record in self.checkpoint.records.values():
+            if record.get('sha256') and record.get('path') and os.path.exists(record['path']):
+                self.hashes[record['sha256']] = record['path']
+        known = set(self.hashes.values())
+        for directory in self.known_dirs + [self.output_dir]:
+            if not os.path.isdir(directory):
+                continue
+            for name in sorted(os.listdir(directory)):
+                path = os.path.join(directory, name)
+                if path not in known and name.lower().endswith(IMAGE_EXTENSIONS) and os.path.isfile(path):
+                    self.hashes.setdefault(file_sha256(path), path)
+
+    # Menghasilkan ScrapeResult untuk setiap URL begitu selesai (urutan tidak dijamin);
+    # index mengikuti posisi URL, sama seperti penomoran 0001.jpg pada script lama
+    def run(self, urls, start = 1):
+        self.load_hashes()
+        pending = []
+        for index, url in enumerate(urls, start):
+            record = self.checkpoint.get(url)
+            if record and record['status'] != 'failed':
+                result = ScrapeResult.from_record(record)
+                self.stats.count(result, resumed = True)
+                yield result
+            else:
+                pending.append((index, url))
+
+        try:
+            with ThreadPoolExecutor(max_workers = self.workers) as executor:
+                futures = [executor.submit(self.scrape_one, index, url) for index, url in pending]
+                for future in as_completed(futures):
+                    result = future.result()
+                    self.checkpoint.add(result.as_record())
+                    self.stats.count(result)
+                    yield result
+        finally:
+            self.stats.finished = time.monotonic()
+
+    def scrape_one(self, index, url):
+        try:
+            page_url, _, body = self.fetcher.get(url)
+            image_url = find_poster_url(body.decode('utf-8', 'replace'), page_url)
+            if not image_url:
+                return ScrapeResult(index, url, 'missing')
+            image_url, headers, content = self.fetcher.get(image_url)
+        except FetchError as e:
+            return ScrapeResult(index, url, 'failed', error = str(e))
+
+        sha256 = hashlib.sha256(content).hexdigest()
+        # Isi yang sama diunduh bersamaan: thread lain menunggu penulis pertama selesai,
+        # jadi hasil 'duplicate' selalu menunjuk file yang benar-benar ada
+        while True:
+            with self.lock:
+                existing = self.hashes.get(sha256)
+                writing = self.writing.get(sha256) if existing is None else None
+                if existing is None and writing is None:
+                    done = self.writing[sha256] = threading.Event()
+                    break
+            if existing:
+                return ScrapeResult(index, url, 'duplicate', image_url, existing, sha256, len(content))
+            writing.wait()
+
+        path = os.path.join(self.output_dir, '%04d%s' % (index, image_extension(image_url, headers.get('content-type'))))
+        try:
+            # tulis ke file sementara lalu rename, supaya tidak ada gambar setengah jadi
+            partial = path + '.part'
+            with open(partial, 'wb') as file:
+                file.write(content)
+            os.replace(partial, path)
+        except OSError as e:
+            return ScrapeResult(index, url, 'failed', image_url, error = str(e))
+        else:
+            with self.lock:
+                self.hashes[sha256] = path
+            return ScrapeResult(index, url, 'downloaded', image_url, path, sha256, len(content))
+        finally:
+            with self.lock:
+                del self.writing[sha256]
+            done.set()
+
+    def close(self):
+        self.fetcher.close()
+        self.checkpoint.close()
+
+
+def read_lines(path):
+    with open(path) as file:
+        return [line.strip() for line in file if line.strip()]
@@ -0,0 +1,90 @@
+import re
+
+from django.db import connection
+from movie_app.utils import chunked
+
+
+# Tabel virtual FTS5 berisi teks film yang bisa dicari (rowid = Film.id).
+# Hanya tersedia di SQLite; di database lain pencarian jatuh ke LIKE biasa.
+FTS_TABLE = 'movie_app_film_fts'
+
+# Bobot bm25 per kolom: judul paling penting, lalu nama orang, genre, deskripsi
+FTS_WEIGHTS = (10.0, 1.0, 3.0, 3.0, 2.0)
+
+CREATE_FTS_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS %s USING fts5("
+    "judul, deskripsi, aktor, sutradara, genre, tokenize = 'unicode61 remove_diacritics 2')" % FTS_TABLE
+)
+
+# Satu INSERT ... SELECT untuk banyak film sekaligus; nama relasi digabung dengan group_concat
+INDEX_FILMS_SQL = """
+    INSERT INTO {fts} (rowid, judul, deskripsi, aktor, sutradara, genre)
+    SELECT f.id, f.judul, f.deskripsi,
+        (SELECT group_concat(a.nama_aktor, ' ') FROM movie_app_film_aktor fa
+            JOIN movie_app_aktor a ON a.id = fa.aktor_id WHERE fa.film_id = f.id),
+        (SELECT group_concat(s.nama_sutradara, ' ') FROM movie_app_film_sutradara fs
+            JOIN movie_app_sutradara s ON s.id = fs.sutradara_id WHERE fs.film_id = f.id),
+        (SELECT group_concat(g.genre, ' ') FROM movie_app_film_genre fg
+            JOIN movie_app_genre g ON g.id = fg.genre_id WHERE fg.film_id = f.id)
+    FROM movie_app_film f
+""".format(fts = FTS_TABLE)
+
+SEARCH_SQL = """
+    SELECT rowid, bm25({fts}, {weights}) AS rank,
+        highlight({fts}, 0, '<b>', '</b>'),
+        snippet({fts}, 1, '<b>', '</b>', '...', 16)
+    FROM {fts} WHERE {fts} MATCH %s
+    ORDER BY rank LIMIT %s
+""".format(fts = FTS_TABLE, weights = ', '.join(str(weight) for weight in FTS_WEIGHTS))
+
+_fts_ready = False
+
+
+def fts_enabled():
+    global _fts_ready
+    if not _fts_ready and connection.vendor == 'sqlite':
+        _fts_ready = FTS_TABLE in connection.introspection.table_names()
+    return _fts_ready
+
+
+def index_films(film_ids):
+    film_ids = list(film_ids)
+    if not film_ids or not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        for chunk in chunked(film_ids):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute('DELETE FROM %s WHERE rowid IN (%s)' % (FTS_TABLE, placeholders), chunk)
+            cursor.execute(INDEX_FILMS_SQL + ' WHERE f.id IN (%s)' % placeholders, chunk)
+
+
+def remove_films(film_ids):
+    film_ids = list(film_ids)
+    if not film_ids or not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        for chunk in chunked(film_ids):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute('DELETE FROM %s WHERE rowid IN (%s)' % (FTS_TABLE, placeholders), chunk)
+
+
+def rebuild_index():
+    with connection.cursor() as cursor:
+        cursor.execute('DELETE FROM %s' % FTS_TABLE)
+        cursor.execute(INDEX_FILMS_SQL)
+
+
+# Input user dijadikan token ber-kutip (aman dari sintaks MATCH) dan dicocokkan sebagai prefix
+def build_match_query(query):
+    tokens = re.findall(r'\w+', query)
+    return ' '.join('"%s"*' % token for token in tokens)
+
+
+# Hasil: list of (film_id, rank, judul_highlight, deskripsi_snippet), terurut dari yang paling relevan
+def search_films(query, limit):
+    match = build_match_query(query)
+    if not match:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(SEARCH_SQL, [match, limit])
+        return cursor.fetchall()
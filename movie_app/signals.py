@@ -0,0 +1,116 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from movie_app.models import Aktor, Sutradara, Genre, Negara, Bahasa, Film, Profile, Rating
+from movie_app import search
+from movie_app.images import schedule_derivatives
+from movie_app.storage import release_after_commit
+from movie_app.utils import chunked
+from movie_app.names import name_resolver
+
+
+# post_delete juga terpanggil saat rating ikut terhapus karena cascade (mis. user dihapus),
+# dan dijalankan di dalam transaksi delete milik Django.
+@receiver(post_delete, sender = Rating)
+def rating_deleted(sender, instance, **kwargs):
+    Film.update_rating_aggregate(instance.film_id, -1, -instance.rating)
+
+
+# Relasi M2M Film: model -> nama field di Film
+FILM_RELATIONS = {Sutradara: 'sutradara', Aktor: 'aktor', Genre: 'genre', Negara: 'negara', Bahasa: 'bahasa'}
+
+# Relasi yang namanya ikut diindex pencarian full-text
+SEARCH_RELATIONS = ('aktor', 'sutradara', 'genre')
+
+
+# Id film yang terhubung ke aktor/sutradara/genre/negara/bahasa (daftar pk) lewat through table
+def related_film_ids(field, pks):
+    through = getattr(Film, field).through
+    film_ids = set()
+    for chunk in chunked(list(pks)):
+        film_ids.update(through.objects.filter(**{field + '_id__in': chunk}).values_list('film_id', flat = True))
+    return list(film_ids)
+
+
+# Representasi film berubah karena relasinya: perbarui last_modified dan index pencarian
+def films_changed(field, film_ids):
+    film_ids = list(film_ids)
+    if not film_ids:
+        return
+    for chunk in chunked(film_ids):
+        Film.objects.filter(pk__in = chunk).touch()
+    if field in SEARCH_RELATIONS:
+        search.index_films(film_ids)
+
+
+# Thumbnail berganti: buat turunannya dan lepas file lama (dihapus bila tidak dipakai film lain)
+@receiver(post_save, sender = Film)
+def film_saved(sender, instance, **kwargs):
+    search.index_films([instance.pk])
+    previous = getattr(instance, '_loaded_thumbnail', None)
+    if instance.thumbnail.name != previous:
+        if instance.thumbnail:
+            schedule_derivatives([instance.thumbnail.name], instance.thumbnail.storage)
+        release_after_commit([previous])
+        instance._loaded_thumbnail = instance.thumbnail.name
+
+
+@receiver(post_delete, sender = Film)
+def film_deleted(sender, instance, **kwargs):
+    search.remove_films([instance.pk])
+    release_after_commit([instance.thumbnail.name])
+
+
+@receiver(post_delete, sender = Profile)
+def profile_deleted(sender, instance, **kwargs):
+    release_after_commit([instance.avatar.name])
+
+
+def film_relation_changed(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            films_changed(FILM_RELATIONS[model], [instance.pk])
+        return
+    # Dari sisi relasi (mis. aktor.aktor_film.add(film)), pk_set berisi id film
+    field = FILM_RELATIONS[type(instance)]
+    if action == 'pre_clear':
+        instance._changed_film_ids = related_film_ids(field, [instance.pk])
+    elif action == 'post_clear':
+        films_changed(field, getattr(instance, '_changed_film_ids', []))
+    elif action in ('post_add', 'post_remove'):
+        films_changed(field, pk_set)
+
+
+for field in FILM_RELATIONS.values():
+    m2m_changed.connect(film_relation_changed, sender = getattr(Film, field).through)
+
+
+# Nama relasi berubah atau dihapus -> film yang memakainya ikut berubah
+@receiver(post_save, sender = Aktor)
+@receiver(post_save, sender = Sutradara)
+@receiver(post_save, sender = Genre)
+@receiver(post_save, sender = Negara)
+@receiver(post_save, sender = Bahasa)
+def relation_saved(sender, instance, created, **kwargs):
+    if not created:
+        name_resolver.clear(sender)
+        field = FILM_RELATIONS[sender]
+        films_changed(field, related_film_ids(field, [instance.pk]))
+
+
+@receiver(pre_delete, sender = Aktor)
+@receiver(pre_delete, sender = Sutradara)
+@receiver(pre_delete, sender = Genre)
+@receiver(pre_delete, sender = Negara)
+@receiver(pre_delete, sender = Bahasa)
+def relation_deleting(sender, instance, **kwargs):
+    instance._changed_film_ids = related_film_ids(FILM_RELATIONS[sender], [instance.pk])
+
+
+@receiver(post_delete, sender = Aktor)
+@receiver(post_delete, sender = Sutradara)
+@receiver(post_delete, sender = Genre)
+@receiver(post_delete, sender = Negara)
+@receiver(post_delete, sender = Bahasa)
+def relation_deleted(sender, instance, **kwargs):
+    name_resolver.clear(sender)
+    films_changed(FILM_RELATIONS[sender], getattr(instance, '_changed_film_ids', []))
@@ -0,0 +1,141 @@
+import hashlib
+import os
+import posixpath
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from movie_app.images import derivative_names, run_after_commit, run_safely
+
+try:
+    import fcntl
+except ImportError:  # Windows: hanya dikunci antar thread dalam satu proses
+    fcntl = None
+
+
+_thread_lock = threading.Lock()
+
+
+# Kunci per file (flock pada <MEDIA_LOCK_DIR>/<sha256 path>.lock), berlaku antar thread dan
+# antar proses di host yang sama. Dipakai save() dan release() supaya "file sudah ada,
+# pakai ulang" dan "tidak dirujuk, hapus" tidak bisa saling menyalip.
+@contextmanager
+def file_lock(path):
+    if fcntl is None:
+        with _thread_lock:
+            yield
+        return
+    lock_dir = getattr(settings, 'MEDIA_LOCK_DIR', None) or os.path.join(tempfile.gettempdir(), 'movie-media-locks')
+    os.makedirs(lock_dir, exist_ok = True)
+    lock_path = os.path.join(lock_dir, hashlib.sha256(os.path.abspath(path).encode('utf-8')).hexdigest() + '.lock')
+    with open(lock_path, 'a') as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+
+# Storage untuk Film.thumbnail dan Profile.avatar: nama file = sha256 isinya, jadi upload
+# dengan isi yang sama memakai satu file (film_images/<sha256>.jpg). File yang sudah ada tidak
+# ditulis ulang. Karena satu file bisa dipakai banyak baris, file hanya dihapus lewat
+# release() setelah tidak ada baris yang merujuk lagi.
+class ContentAddressedStorage(FileSystemStorage):
+    def content_hash(self, content):
+        digest = hashlib.sha256()
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        return digest.hexdigest()
+
+    def hashed_name(self, name, content):
+        directory, filename = posixpath.split(name.replace('\\', '/'))
+        extension = posixpath.splitext(filename)[1].lower()
+        return posixpath.join(directory, self.content_hash(content) + extension)
+
+    def lock(self, name):
+        return file_lock(self.path(name))
+
+    # File yang dipakai ulang disentuh (mtime baru): baris yang merujuknya belum di-commit,
+    # jadi release() yang berjalan bersamaan melihat file ini baru dipakai dan tidak menghapusnya
+    def save(self, name, content, max_length = None):
+        if name is None:
+            name = content.name
+        name = self.hashed_name(name, content)
+        with self.lock(name):
+            if self.exists(name):
+                os.utime(self.path(name))
+                return name
+            return super().save(name, content, max_length)
+
+    # Untuk file turunan yang namanya sudah ditentukan (mis. film_images/derivatives/...-small.jpg)
+    def save_exact(self, name, content, max_length = None):
+        return super().save(name, content, max_length)
+
+
+media_storage = ContentAddressedStorage()
+
+# Field yang memakai media_storage; dipakai untuk menghitung referensi sebuah file
+MEDIA_REFERENCES = (('movie_app', 'Film', 'thumbnail'), ('movie_app', 'Profile', 'avatar'))
+
+
+def media_fields():
+    for app_label, model_name, field_name in MEDIA_REFERENCES:
+        model = apps.get_model(app_label, model_name)
+        yield model, model._meta.get_field(field_name)
+
+
+def reference_count(name):
+    return sum(model.objects.filter(**{field.name: name}).count() for model, field in media_fields())
+
+
+# Hapus file (beserta turunannya) yang sudah tidak dirujuk baris mana pun.
+# Gambar default field (film-default.png, person.png) tidak pernah dihapus. Jumlah
+# referensi dicek ulang di bawah kunci file; file yang disentuh save() dalam
+# MEDIA_RELEASE_GRACE detik terakhir (upload dengan isi sama yang barisnya belum di-commit)
+# tidak dihapus sekarang: namanya dicatat di PendingMediaRelease dan dicek lagi setelah
+# masa itu lewat (timer di proses ini, atau command release_pending_media).
+def release(names, storage = media_storage):
+    pending = apps.get_model('movie_app', 'PendingMediaRelease')
+    protected = {field.default for _, field in media_fields()}
+    grace = getattr(settings, 'MEDIA_RELEASE_GRACE', 300)
+    deleted, recent, settled = [], [], []
+    for name in dict.fromkeys(names):
+        if not name or name in protected:
+            continue
+        if reference_count(name):
+            settled.append(name)
+            continue
+        with storage.lock(name):
+            if reference_count(name):
+                settled.append(name)
+                continue
+            if grace > 0 and storage.exists(name) and os.path.getmtime(storage.path(name)) > time.time() - grace:
+                recent.append(name)
+                continue
+            for path in [name] + derivative_names(name):
+                if storage.exists(path):
+                    storage.delete(path)
+        deleted.append(name)
+    if deleted or settled:
+        pending.objects.filter(name__in = deleted + settled).delete()
+    if recent:
+        pending.objects.bulk_create([pending(name = name) for name in recent], ignore_conflicts = True)
+        timer = threading.Timer(grace, run_safely, (release, recent, storage))
+        timer.daemon = True
+        timer.start()
+    return deleted
+
+
+# Dicek setelah commit (di thread pool gambar), saat baris lama sudah benar-benar hilang
+def release_after_commit(names, storage = media_storage):
+    names = [name for name in names if name]
+    if names:
+        run_after_commit(release, names, storage)
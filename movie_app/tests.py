@@ -1,3 +1,479 @@
-from django.test import TestCase
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
 
-# Create your tests here.
+from io import BytesIO, StringIO
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase, override_settings
+from PIL import Image
+from movie_app import images
+from movie_app.images import derivative_name, derivative_names, process_avatar, validate_image
+from movie_app.models import Film, PendingMediaRelease, Profile, User
+from movie_app.storage import media_storage, release
+from movie_app.scraper import Scraper, find_poster_url
+
+
+POSTERS = {'/img/a.jpg': b'poster-a', '/img/b.png': b'poster-b'}
+PAGES = {
+    '/movies/a': '<html><img class="img-responsive" src="/img/a.jpg"></html>',
+    '/movies/b': '<html><img class="poster img-responsive" src="/img/b.png"></html>',
+    '/movies/a-copy': '<html><img class="img-responsive" src="/img/a.jpg"></html>',
+    '/movies/a-copy2': '<html><img class="img-responsive" src="/img/a.jpg"></html>',
+    '/movies/b-copy': '<html><img class="img-responsive" src="/img/b.png"></html>',
+    '/movies/none': '<html><p>no poster</p></html>',
+}
+
+
+# Server HTTP lokal pengganti situs sumber poster
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        if self.path in PAGES:
+            body, content_type = PAGES[self.path].encode(), 'text/html'
+        elif self.path in POSTERS:
+            body, content_type = POSTERS[self.path], 'image/jpeg'
+        else:
+            body, content_type = b'', 'text/plain'
+        self.send_response(200 if body else 404)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServerMixin:
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        threading.Thread(target = cls.server.serve_forever, daemon = True).start()
+        cls.base = 'http://127.0.0.1:%s' % cls.server.server_port
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+
+real_replace = os.replace
+
+
+# Memperlambat rename supaya unduhan lain dengan isi sama datang saat file belum ada
+def slow_replace(source, target):
+    time.sleep(0.05)
+    return real_replace(source, target)
+
+
+class ScraperTest(StandInServerMixin, SimpleTestCase):
+    def setUp(self):
+        StandInHandler.requests = []
+        self.output = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output)
+        self.checkpoint = os.path.join(self.output, 'progress.checkpoint')
+
+    def scrape(self, paths, workers = 4):
+        scraper = Scraper(self.output, checkpoint = self.checkpoint, workers = workers, per_host = 2)
+        try:
+            results = sorted(scraper.run([self.base + path for path in paths]), key = lambda result: result.index)
+        finally:
+            scraper.close()
+        return scraper, results
+
+    def test_find_poster_url(self):
+        html = '<img src="/logo.png"><img class="img-responsive" src="poster.jpg">'
+        self.assertEqual(find_poster_url(html, 'https://example.com/movies/x'), 'https://example.com/movies/poster.jpg')
+        self.assertIsNone(find_poster_url('<img src="/logo.png">', 'https://example.com/'))
+
+    def test_downloads_and_skips_duplicate_content(self):
+        # satu worker: urutan selesai = urutan URL, jadi URL pertama yang mengunduh
+        scraper, results = self.scrape(['/movies/a', '/movies/b', '/movies/a-copy', '/movies/none', '/movies/gone'], workers = 1)
+        self.assertEqual([result.status for result in results], ['downloaded', 'downloaded', 'duplicate', 'missing', 'failed'])
+        self.assertEqual(results[0].path, os.path.join(self.output, '0001.jpg'))
+        self.assertEqual(results[1].path, os.path.join(self.output, '0002.png'))
+        self.assertEqual(results[2].path, results[0].path)
+        with open(results[0].path, 'rb') as file:
+            self.assertEqual(file.read(), b'poster-a')
+        self.assertFalse(os.path.exists(os.path.join(self.output, '0003.jpg')))
+        self.assertIn('2 downloaded, 1 duplicate', scraper.stats.summary())
+
+    def test_concurrent_duplicates_point_to_written_file(self):
+        urls = [self.base + path for path in ['/movies/a', '/movies/a-copy'] * 6]
+        for attempt in range(3):
+            shutil.rmtree(self.output)
+            scraper = Scraper(self.output, checkpoint = self.checkpoint, workers = 8, per_host = 8)
+            statuses = []
+            try:
+                with mock.patch('movie_app.scraper.os.replace', side_effect = slow_replace):
+                    for result in scraper.run(urls):
+                        # file harus sudah ada saat hasil (termasuk 'duplicate') dilaporkan
+                        self.assertTrue(os.path.exists(result.path), result.status)
+                        statuses.append(result.status)
+            finally:
+                scraper.close()
+            self.assertEqual(statuses.count('downloaded'), 1)
+            self.assertEqual(statuses.count('duplicate'), 11)
+
+    def test_resume_from_checkpoint(self):
+        self.scrape(['/movies/a', '/movies/gone'])
+        StandInHandler.requests = []
+        scraper, results = self.scrape(['/movies/a', '/movies/gone', '/movies/b'])
+        # hanya URL yang gagal dan yang baru yang diambil lagi
+        self.assertNotIn('/movies/a', StandInHandler.requests)
+        self.assertIn('/movies/gone', StandInHandler.requests)
+        self.assertEqual([result.status for result in results], ['downloaded', 'failed', 'downloaded'])
+        self.assertEqual(scraper.stats.resumed, 1)
+
+    def test_existing_files_are_not_downloaded_again(self):
+        with open(os.path.join(self.output, 'old.jpg'), 'wb') as file:
+            file.write(b'poster-b')
+        _, results = self.scrape(['/movies/b'])
+        self.assertEqual(results[0].status, 'duplicate')
+        self.assertEqual(results[0].path, os.path.join(self.output, 'old.jpg'))
+
+
+class ImportFilmPostersTest(StandInServerMixin, TestCase):
+    def setUp(self):
+        StandInHandler.requests = []
+        self.workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workdir)
+        self.media = os.path.join(self.workdir, 'media')
+        os.makedirs(os.path.join(self.media, 'film_images'))
+        override = override_settings(MEDIA_ROOT = self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def write_lines(self, name, lines):
+        path = os.path.join(self.workdir, name)
+        with open(path, 'w') as file:
+            file.write('\n'.join(lines) + '\n')
+        return path
+
+    def run_import(self, pairs, *args):
+        titles = self.write_lines('file_titles.txt', [title for title, _ in pairs])
+        urls = self.write_lines('file_urls.txt', [self.base + path for _, path in pairs])
+        call_command('import_film_posters', '--titles', titles, '--urls', urls, '--batch-size', '2', *args, stdout = StringIO(), stderr = StringIO())
+
+    def test_matches_titles_and_creates_missing(self):
+        kept = Film.objects.create(judul = 'Kept', thumbnail = 'film_images/custom.jpg', tahun = 2000, deskripsi = '-', durasi = 90)
+        film = Film.objects.create(judul = 'Alpha', tahun = 2000, deskripsi = '-', durasi = 90)
+        metadata = self.write_lines('metadata.csv', [
+            'judul,tahun,durasi,deskripsi,status',
+            'beta,2021,100,Film tentang Beta,Released',
+            'Gamma,2021,,,',
+        ])
+        pairs = [('alpha', '/movies/a'), ('Beta', '/movies/b'), ('Kept', '/movies/a-copy'), ('Gamma', '/movies/b-copy'), ('Delta', '/movies/a-copy2')]
+        self.run_import(pairs, '--create-missing', metadata)
+
+        film.refresh_from_db()
+        self.assertEqual(film.thumbnail.name, 'film_images/%s.jpg' % hashlib.sha256(b'poster-a').hexdigest())
+        with open(os.path.join(self.media, film.thumbnail.name), 'rb') as file:
+            self.assertEqual(file.read(), b'poster-a')
+        beta = Film.objects.get(judul = 'beta')
+        self.assertEqual(beta.thumbnail.name, 'film_images/%s.png' % hashlib.sha256(b'poster-b').hexdigest())
+        self.assertEqual((beta.tahun, beta.durasi, beta.deskripsi), (2021, 100, 'Film tentang Beta'))
+        # tanpa metadata lengkap tidak ada film placeholder
+        self.assertFalse(Film.objects.filter(judul__in = ['Gamma', 'Delta']).exists())
+        kept.refresh_from_db()
+        self.assertEqual(kept.thumbnail.name, 'film_images/custom.jpg')
+
+    def test_reuses_poster_already_in_media(self):
+        with open(os.path.join(self.media, 'film_images', '0001.jpg'), 'wb') as file:
+            file.write(b'poster-a')
+        film = Film.objects.create(judul = 'Alpha', tahun = 2000, deskripsi = '-', durasi = 90)
+        self.run_import([('Alpha', '/movies/a')])
+        film.refresh_from_db()
+        self.assertEqual(film.thumbnail.name, 'film_images/0001.jpg')
+        self.assertEqual(sorted(os.listdir(os.path.join(self.media, 'film_images'))), ['0001.jpg'])
+
+
+def make_image(size = (800, 1200), image_format = 'JPEG'):
+    buffer = BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(buffer, image_format)
+    return buffer.getvalue()
+
+
+class MediaRootMixin:
+    def setUp(self):
+        super().setUp()
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        override = override_settings(MEDIA_ROOT = self.media, IMAGE_DERIVATIVES_ASYNC = False, MEDIA_RELEASE_GRACE = 0, MEDIA_LOCK_DIR = os.path.join(self.media, '.locks'))
+        override.enable()
+        self.addCleanup(override.disable)
+
+
+class ThumbnailDerivativeTest(MediaRootMixin, TestCase):
+    def create_film(self, content, name = 'poster.jpg'):
+        with self.captureOnCommitCallbacks(execute = True):
+            return Film.objects.create(
+                judul = 'Poster', tahun = 2020, deskripsi = '-', durasi = 100,
+                thumbnail = SimpleUploadedFile(name, content, content_type = 'image/jpeg'),
+            )
+
+    def test_upload_generates_all_sizes(self):
+        film = self.create_film(make_image())
+        for name in derivative_names(film.thumbnail.name):
+            self.assertTrue(os.path.exists(os.path.join(self.media, name)), name)
+        with Image.open(os.path.join(self.media, derivative_name(film.thumbnail.name, 'small', 'webp'))) as image:
+            self.assertEqual(image.format, 'WEBP')
+            self.assertEqual(image.size, (160, 240))
+
+    def test_serializer_exposes_size_urls(self):
+        from api.serializers import FilmSerializer
+        film = self.create_film(make_image(), name = 'x.jpg')
+        thumbnails = FilmSerializer(film).data['thumbnails']
+        self.assertEqual(set(thumbnails), {'small', 'medium', 'large'})
+        stem = film.thumbnail.name.split('/')[-1].split('.')[0]
+        self.assertEqual(thumbnails['small']['jpg'], '/media/film_images/derivatives/%s-small.jpg' % stem)
+
+    def test_backfill_command(self):
+        os.makedirs(os.path.join(self.media, 'film_images'))
+        with open(os.path.join(self.media, 'film_images', 'old.png'), 'wb') as file:
+            file.write(make_image((300, 300), 'PNG'))
+        Film.objects.create(judul = 'Old', tahun = 2000, deskripsi = '-', durasi = 90, thumbnail = 'film_images/old.png')
+        Film.objects.create(judul = 'Gone', tahun = 2000, deskripsi = '-', durasi = 90, thumbnail = 'film_images/gone.png')
+        out = StringIO()
+        call_command('generate_thumbnails', stdout = out)
+        self.assertIn('1 images processed, 0 already up to date, 0 failed, 1 missing files.', out.getvalue())
+        self.assertTrue(os.path.exists(os.path.join(self.media, 'film_images', 'derivatives', 'old-large.webp')))
+        out = StringIO()
+        call_command('generate_thumbnails', stdout = out)
+        self.assertIn('0 images processed, 1 already up to date', out.getvalue())
+
+
+class AvatarProcessingTest(MediaRootMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create(username = 'budi')
+
+    def test_avatar_resized_after_commit(self):
+        with self.captureOnCommitCallbacks(execute = True):
+            profile = Profile.objects.create(user = self.user, avatar = SimpleUploadedFile('budi.jpg', make_image((900, 600))))
+        profile.refresh_from_db()
+        with Image.open(os.path.join(self.media, profile.avatar.name)) as image:
+            self.assertEqual(image.size, (200, 133))
+        self.assertEqual(len(profile.avatar_hash), 64)
+        # file tidak berubah: tidak didekode ulang
+        self.assertFalse(process_avatar(profile.pk))
+
+    def test_save_without_new_avatar_schedules_nothing(self):
+        profile = Profile.objects.create(user = self.user, avatar = SimpleUploadedFile('budi.jpg', make_image((100, 100))))
+        profile = Profile.objects.get(pk = profile.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            profile.bio = 'Halo'
+            profile.save()
+        self.assertEqual(callbacks, [])
+
+
+class ImageValidationTest(SimpleTestCase):
+    def test_valid_image(self):
+        self.assertEqual(validate_image(SimpleUploadedFile('a.png', make_image((30, 20), 'PNG'))), ('PNG', (30, 20)))
+
+    def test_oversize_rejected_before_opening(self):
+        upload = SimpleUploadedFile('big.jpg', b'x' * (images.MAX_IMAGE_BYTES + 1))
+        with self.assertRaisesMessage(ValidationError, 'terlalu besar'):
+            validate_image(upload)
+
+    def test_not_an_image(self):
+        with self.assertRaisesMessage(ValidationError, 'bukan gambar'):
+            validate_image(SimpleUploadedFile('a.jpg', b'not an image'))
+
+    def test_unsupported_format(self):
+        with self.assertRaisesMessage(ValidationError, 'BMP'):
+            validate_image(SimpleUploadedFile('a.bmp', make_image((10, 10), 'BMP')))
+
+    def test_pixel_limit_checked_from_header(self):
+        upload = SimpleUploadedFile('wide.png', make_image((300, 200), 'PNG'))
+        with mock.patch.object(images, 'MAX_IMAGE_PIXELS', 300 * 200 - 1):
+            with self.assertRaisesMessage(ValidationError, 'Dimensi'):
+                validate_image(upload)
+
+    def test_serializer_rejects_invalid_upload(self):
+        from api.serializers import FilmSerializer
+        serializer = FilmSerializer(data = {
+            'judul': 'x', 'tahun': 2000, 'deskripsi': '-', 'durasi': 1, 'status': 'Released',
+            'thumbnail': SimpleUploadedFile('a.jpg', b'not an image'),
+        })
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('thumbnail', serializer.errors)
+
+    def test_film_clean_skips_stored_file(self):
+        film = Film(judul = 'x', tahun = 2000, deskripsi = '-', durasi = 1, thumbnail = 'film_images/missing.png')
+        film.clean()
+
+
+class ContentAddressedStorageTest(MediaRootMixin, TestCase):
+    def upload(self, content, name = 'poster.jpg'):
+        return SimpleUploadedFile(name, content, content_type = 'image/jpeg')
+
+    def create_film(self, content, name = 'poster.jpg'):
+        with self.captureOnCommitCallbacks(execute = True):
+            return Film.objects.create(judul = 'Film', tahun = 2020, deskripsi = '-', durasi = 90, thumbnail = self.upload(content, name))
+
+    def test_identical_uploads_share_one_file(self):
+        content = make_image((40, 60))
+        first = self.create_film(content, 'a.jpg')
+        second = self.create_film(content, 'b.JPG')
+        self.assertEqual(first.thumbnail.name, 'film_images/%s.jpg' % hashlib.sha256(content).hexdigest())
+        self.assertEqual(first.thumbnail.name, second.thumbnail.name)
+        self.assertEqual([name for name in os.listdir(os.path.join(self.media, 'film_images')) if name != 'derivatives'], [first.thumbnail.name.split('/')[1]])
+
+    def test_shared_file_deleted_with_last_reference(self):
+        content = make_image((40, 60))
+        first = self.create_film(content)
+        second = self.create_film(content)
+        path = os.path.join(self.media, first.thumbnail.name)
+        small = os.path.join(self.media, derivative_name(first.thumbnail.name, 'small', 'jpg'))
+        self.assertTrue(os.path.exists(small))
+        with self.captureOnCommitCallbacks(execute = True):
+            first.delete()
+        self.assertTrue(os.path.exists(path))
+        with self.captureOnCommitCallbacks(execute = True):
+            second.delete()
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(os.path.exists(small))
+
+    def test_replaced_thumbnail_released(self):
+        film = self.create_film(make_image((40, 60)))
+        old_path = os.path.join(self.media, film.thumbnail.name)
+        film = Film.objects.get(pk = film.pk)
+        with self.captureOnCommitCallbacks(execute = True):
+            film.thumbnail = self.upload(make_image((50, 50)))
+            film.save()
+        self.assertFalse(os.path.exists(old_path))
+        self.assertTrue(os.path.exists(os.path.join(self.media, film.thumbnail.name)))
+
+    # Upload dengan isi sama saat release() berjalan: barisnya belum terlihat, tetapi file
+    # yang baru disentuh save() tidak boleh dihapus
+    def test_release_keeps_recently_reused_file(self):
+        content = make_image((40, 60))
+        film = self.create_film(content)
+        name = film.thumbnail.name
+        path = os.path.join(self.media, name)
+        os.utime(path, (time.time() - 600, time.time() - 600))
+        Film.objects.filter(pk = film.pk).delete()
+        self.assertEqual(media_storage.save('film_images/poster.jpg', ContentFile(content)), name)
+        with override_settings(MEDIA_RELEASE_GRACE = 60), mock.patch('movie_app.storage.threading.Timer') as timer:
+            self.assertEqual(release([name]), [])
+        self.assertTrue(os.path.exists(path))
+        timer.assert_called_once()
+        self.assertEqual(timer.call_args.args[2][1], [name])
+        # penundaan dicatat di database: tetap ada walau timer hilang (proses restart)
+        self.assertEqual(list(PendingMediaRelease.objects.values_list('name', flat = True)), [name])
+
+        out = StringIO()
+        with override_settings(MEDIA_RELEASE_GRACE = 60), mock.patch('movie_app.storage.threading.Timer'):
+            call_command('release_pending_media', stdout = out)
+        self.assertIn('0 file(s) deleted, 1 still pending.', out.getvalue())
+        os.utime(path, (time.time() - 600, time.time() - 600))
+        with override_settings(MEDIA_RELEASE_GRACE = 60):
+            call_command('release_pending_media', stdout = out)
+        self.assertIn('1 file(s) deleted, 0 still pending.', out.getvalue())
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(PendingMediaRelease.objects.exists())
+
+    def test_pending_release_dropped_when_referenced_again(self):
+        content = make_image((40, 60))
+        film = self.create_film(content)
+        PendingMediaRelease.objects.create(name = film.thumbnail.name)
+        call_command('release_pending_media', stdout = StringIO())
+        self.assertTrue(os.path.exists(os.path.join(self.media, film.thumbnail.name)))
+        self.assertFalse(PendingMediaRelease.objects.exists())
+
+    def test_default_image_never_deleted(self):
+        os.makedirs(os.path.join(self.media, 'film_images'))
+        default = os.path.join(self.media, 'film_images', 'film-default.png')
+        with open(default, 'wb') as file:
+            file.write(make_image((10, 10), 'PNG'))
+        with self.captureOnCommitCallbacks(execute = True):
+            film = Film.objects.create(judul = 'Film', tahun = 2020, deskripsi = '-', durasi = 90)
+        with self.captureOnCommitCallbacks(execute = True):
+            film.delete()
+        self.assertTrue(os.path.exists(default))
+
+    def test_dedupe_command(self):
+        content = make_image((40, 60))
+        os.makedirs(os.path.join(self.media, 'film_images'))
+        for name in ('0001.jpg', '0002.jpg'):
+            with open(os.path.join(self.media, 'film_images', name), 'wb') as file:
+                file.write(content)
+        for name in ('0001.jpg', '0002.jpg', '0002.jpg'):
+            Film.objects.create(judul = name, tahun = 2000, deskripsi = '-', durasi = 90, thumbnail = 'film_images/' + name)
+        out = StringIO()
+        call_command('dedupe_media', stdout = out)
+        self.assertIn('2 files renamed to content hashes, 2 old files deleted, 0 missing files.', out.getvalue())
+        target = 'film_images/%s.jpg' % hashlib.sha256(content).hexdigest()
+        self.assertEqual(set(Film.objects.values_list('thumbnail', flat = True)), {target})
+        self.assertTrue(media_storage.exists(target))
+        self.assertFalse(media_storage.exists('film_images/0001.jpg'))
+
+
+class MediaServingTest(MediaRootMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        os.makedirs(os.path.join(self.media, 'film_images'))
+        self.content = bytes(range(256)) * 4
+        self.hashed = 'film_images/%s.jpg' % hashlib.sha256(self.content).hexdigest()
+        for name in (self.hashed, 'film_images/legacy.jpg'):
+            with open(os.path.join(self.media, name), 'wb') as file:
+                file.write(self.content)
+
+    def test_full_response_with_cache_headers(self):
+        response = self.client.get('/media/' + self.hashed)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertEqual(response['Content-Length'], '1024')
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(response['ETag'], '"%s"' % hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+    def test_legacy_name_short_cache(self):
+        response = self.client.get('/media/film_images/legacy.jpg')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=3600')
+
+    def test_if_none_match(self):
+        etag = self.client.get('/media/' + self.hashed)['ETag']
+        response = self.client.get('/media/' + self.hashed, HTTP_IF_NONE_MATCH = etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+
+    def test_range_requests(self):
+        response = self.client.get('/media/' + self.hashed, HTTP_RANGE = 'bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/1024')
+        self.assertEqual(b''.join(response.streaming_content), self.content[10:20])
+        response = self.client.get('/media/' + self.hashed, HTTP_RANGE = 'bytes=-4')
+        self.assertEqual(b''.join(response.streaming_content), self.content[-4:])
+        response = self.client.get('/media/' + self.hashed, HTTP_RANGE = 'bytes=5000-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+
+    def test_stale_if_range_returns_full_file(self):
+        response = self.client.get('/media/' + self.hashed, HTTP_RANGE = 'bytes=0-9', HTTP_IF_RANGE = '"other"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_path_traversal_and_missing(self):
+        self.assertEqual(self.client.get('/media/../manage.py').status_code, 404)
+        self.assertEqual(self.client.get('/media/film_images/nope.jpg').status_code, 404)
+
+    def test_accel_redirect(self):
+        with self.settings(MEDIA_ACCEL_REDIRECT = '/protected-media/'):
+            response = self.client.get('/media/' + self.hashed)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/' + self.hashed)
+        self.assertEqual(response.content, b'')
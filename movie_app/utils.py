@@ -0,0 +1,7 @@
+# SQLite membatasi jumlah parameter per query (999), jadi daftar id dipecah per 500
+CHUNK_SIZE = 500
+
+
+def chunked(items, size = CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
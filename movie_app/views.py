@@ -1,3 +1,131 @@
-from django.shortcuts import render
+import mimetypes
+import os
+import re
 
-# Create your views here.
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+
+# Nama file berbasis hash isi (movie_app/storage.py), termasuk turunan thumbnail
+# (<sha256>-small.jpg): isinya tidak pernah berubah, jadi boleh di-cache selamanya
+HASHED_NAME = re.compile(r'^(?P<hash>[0-9a-f]{64})(-[a-z]+)?\.[a-z0-9]+$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+RANGE_HEADER = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+# Membaca maksimal length byte dari posisi file saat ini. fileno() tetap diteruskan,
+# jadi server WSGI dengan wsgi.file_wrapper (mis. gunicorn) tetap bisa memakai sendfile.
+class RangeFile:
+    def __init__(self, file, start, length):
+        self.file = file
+        self.name = file.name
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size = -1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def media_etag(name, stat):
+    match = HASHED_NAME.match(name)
+    if match:
+        return '"%s%s"' % (match.group('hash'), match.group(2) or '')
+    return '"%x-%x"' % (int(stat.st_mtime), stat.st_size)
+
+
+# Range tunggal "bytes=a-b", "bytes=a-" atau "bytes=-n"; None bila header tidak dipakai,
+# ValueError bila range di luar ukuran file (416)
+def parse_range(header, size):
+    match = RANGE_HEADER.match(header.strip())
+    if not match or not (match.group(1) or match.group(2)):
+        return None
+    start, end = match.groups()
+    if not start:
+        length = int(end)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+# Pengganti django.conf.urls.static untuk MEDIA_URL: FileResponse (sendfile lewat
+# wsgi.file_wrapper), Range, ETag/Last-Modified dan Cache-Control. Bila
+# MEDIA_ACCEL_REDIRECT diisi (mis. '/protected-media/'), file dikirim oleh nginx lewat
+# X-Accel-Redirect dan worker aplikasi hanya mengirim header.
+@require_safe
+def serve_media(request, path):
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('Invalid path')
+    try:
+        stat = os.stat(fullpath)
+    except OSError:
+        raise Http404('File not found')
+    if not os.path.isfile(fullpath):
+        raise Http404('File not found')
+
+    name = os.path.basename(fullpath)
+    etag = media_etag(name, stat)
+    last_modified = int(stat.st_mtime)
+    cache_control = IMMUTABLE_CACHE_CONTROL if HASHED_NAME.match(name) else 'public, max-age=%d' % getattr(settings, 'MEDIA_CACHE_MAX_AGE', 3600)
+
+    not_modified = get_conditional_response(request, etag = etag, last_modified = last_modified)
+    if not_modified is not None:
+        not_modified.headers['Cache-Control'] = cache_control
+        return not_modified
+
+    accel = getattr(settings, 'MEDIA_ACCEL_REDIRECT', None)
+    if accel:
+        response = HttpResponse(content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream')
+        response.headers['X-Accel-Redirect'] = accel.rstrip('/') + '/' + path.lstrip('/')
+    else:
+        response = ranged_file_response(request, fullpath, stat.st_size, etag, last_modified)
+    response.headers.setdefault('ETag', etag)
+    response.headers.setdefault('Last-Modified', http_date(last_modified))
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+
+def ranged_file_response(request, fullpath, size, etag, last_modified):
+    byte_range = None
+    header = request.META.get('HTTP_RANGE')
+    if_range = request.META.get('HTTP_IF_RANGE', '').strip()
+    # If-Range: range hanya dipakai bila file masih sama dengan yang dimiliki client
+    if header and (not if_range or if_range == etag or parse_http_date_safe(if_range) == last_modified):
+        try:
+            byte_range = parse_range(header, size)
+        except ValueError:
+            response = HttpResponse(status = 416)
+            response.headers['Content-Range'] = 'bytes */%d' % size
+            return response
+
+    file = open(fullpath, 'rb')
+    if byte_range is None:
+        response = FileResponse(file)
+    else:
+        start, end = byte_range
+        response = FileResponse(RangeFile(file, start, end - start + 1), status = 206)
+        response.headers['Content-Length'] = str(end - start + 1)
+        response.headers['Content-Range'] = 'bytes %d-%d/%d' % (start, end, size)
+    response.headers['Accept-Ranges'] = 'bytes'
+    return response
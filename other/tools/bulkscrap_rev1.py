@@ -1,44 +1,33 @@
-import requests
-from bs4 import BeautifulSoup
-import urllib.request
+import argparse
+import os
+import sys
 
-# Fungsi untuk mendapatkan URL gambar dari URL halaman
-def get_image_url(url):
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, 'html.parser')
-    image_element = soup.find('img', {'class': 'img-responsive'})
-    if image_element:
-        return image_element['src']
-    else:
-        return None
+# Fetcher ada di movie_app/scraper.py (hanya standard library, tidak perlu setup Django)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
-# Baca file .txt yang berisi URL gambar (satu URL per baris)
-with open('file_urls.txt', 'r') as file:
-    urls = file.readlines()
+from movie_app.scraper import Scraper, read_lines
 
-# Menghapus karakter newline (\n) dari setiap URL
-urls = [url.strip() for url in urls]
 
-# Mengatur nomor awal untuk nama file gambar
-start_number = 1
+parser = argparse.ArgumentParser(description = 'Unduh poster film dari daftar URL halaman (satu URL per baris).')
+parser.add_argument('--urls', default = 'file_urls.txt')
+parser.add_argument('--output', default = '.')
+parser.add_argument('--checkpoint', default = 'bulkscrap.checkpoint', help = 'file progress, run yang terputus dilanjutkan dari sini')
+parser.add_argument('--workers', type = int, default = 8)
+parser.add_argument('--per-host', type = int, default = 4, help = 'maksimal request paralel per host')
+args = parser.parse_args()
 
-# Iterasi melalui setiap URL dan mengunduh gambar dengan urutan berurutan
-for url in urls:
-    image_url = get_image_url(url)
-    if image_url:
-        # Membentuk nama file gambar dengan urutan berurutan
-        file_name = f"{start_number:04}.jpg"
-        
-        try:
-            # Mengunduh gambar menggunakan urllib.request
-            urllib.request.urlretrieve(image_url, file_name)
-            print(f"Gambar {file_name} berhasil diunduh.")
-        except Exception as e:
-            # Jika terjadi kesalahan saat mengunduh gambar, tetap menyimpan file dengan nama dummy
-            file_name = f"{start_number:04}_dummy.jpg"
-            print(f"Terjadi kesalahan saat mengunduh gambar. Gambar {file_name} tidak dapat diunduh.")
-        
-        # Menambahkan nomor untuk nama file berikutnya
-        start_number += 1
-    else:
-        print(f"URL Gambar tidak ditemukan untuk URL: {url.strip()}")
+scraper = Scraper(args.output, checkpoint = args.checkpoint, workers = args.workers, per_host = args.per_host)
+try:
+    for result in scraper.run(read_lines(args.urls)):
+        if result.status == 'failed':
+            print(f"Terjadi kesalahan untuk URL {result.url}: {result.error}")
+        elif result.status == 'missing':
+            print(f"URL Gambar tidak ditemukan untuk URL: {result.url}")
+        elif result.status == 'duplicate':
+            print(f"Gambar untuk {result.url} sama dengan {result.path}, tidak diunduh ulang.")
+        else:
+            print(f"Gambar {result.path} berhasil diunduh.")
+finally:
+    scraper.close()
+
+print(scraper.stats.summary())